@@ -6,10 +6,10 @@ Fully simulates the real app flow:
   Router (router_prompt.txt) → Specialist (tool_prompts.py) → Summarizer (summary_prompt.txt)
 
 Optimized for Apple Silicon (M1 Pro, 8 GB RAM):
-  - Incremental CSV checkpoint after every rep (crash-safe)
+  - Incremental CSV checkpoint, flushed by a background thread (crash-safe)
   - Explicit model unloading between models to reclaim memory
   - gc.collect() + mx.metal.clear_cache() after each model run
-  - All heavy imports (matplotlib, openpyxl) deferred until after inference
+  - All heavy imports (numpy, mlx.core, matplotlib, openpyxl) deferred until first use
 
 Run from your project root (javascript_app/backend/) or repo root.
 
@@ -27,16 +27,18 @@ import csv
 import gc
 import json
 import logging
+import multiprocessing
 import os
+import queue
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from statistics import mean, median
-from typing import Any, Optional
-
-import numpy as np
+from typing import Any, NamedTuple, Optional
 
 # ── Logging: configure root first, then silence mlx_lm ───────────────────────
 logging.basicConfig(level=logging.ERROR)
@@ -56,8 +58,8 @@ for _root in _CANDIDATE_ROOTS:
             sys.path.insert(0, _root)
         break
 
-from utils.mlx_utils import mlx_model
-from utils.tool_prompts import get_tool_prompt
+from utils.mlx_utils import available_memory_bytes, mlx_model
+from utils.tool_prompts import TOOL_PROMPTS, get_tool_prompt
 
 # ──────────────────────────────────────────────────────────────────────────────
 # CONFIG
@@ -75,7 +77,30 @@ MLX_MODELS: list[str] = [
 ]
 
 REPETITIONS_PER_Q: int = 3
-WARMUP_REPS: int = 1
+# Warm up each model with one-token calls per stage (see warmup_model)
+WARMUP: bool = True
+
+# Run the router stage for all test cases as one batched generate per rep
+BATCH_ROUTER: bool = False
+
+# Route unambiguous questions with keyword regexes instead of the LLM router
+# (skews router accuracy/latency – off by default, see fast_route)
+FAST_ROUTER: bool = False
+
+# Prefill each fixed system prompt once per model and reuse its KV cache
+PREFIX_CACHE: bool = False
+
+# Wrap the token sampler in mx.compile (mlx_model.compile_sampler)
+COMPILE: bool = False
+
+# Convert non-4-bit models to 4-bit before benchmarking them:
+#   FORCE_4BIT always, AUTO_4BIT only when free RAM is below AUTO_4BIT_MIN_FREE
+FORCE_4BIT: bool = False
+AUTO_4BIT: bool = False
+AUTO_4BIT_MIN_FREE: float = 4e9
+
+# Number of models benchmarked concurrently in separate processes (1 = serial)
+PARALLEL: int = 1
 
 # Accuracy grade weights (must sum to 1.0)
 GRADE_WEIGHTS: dict[str, float] = {
@@ -94,19 +119,25 @@ _PROMPT_SEARCH_ROOTS: list[str] = [
 ]
 
 
+# Resolved once: the first search root that actually holds the prompt files
+PROMPT_DIR: Optional[Path] = next(
+    (Path(p) for p in _PROMPT_SEARCH_ROOTS if (Path(p) / "router_prompt.txt").is_file()),
+    None,
+)
+
+
 def load_prompt_template(filename: str) -> str:
-    for base in _PROMPT_SEARCH_ROOTS:
-        path = os.path.join(base, filename)
-        if os.path.exists(path):
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                print(f"  [prompt] Loaded '{filename}' <- {path}")
-                return content
-            except OSError as e:
-                print(f"  [prompt] Error reading {path}: {e}")
-    print(f"  [prompt] WARNING: '{filename}' not found in {_PROMPT_SEARCH_ROOTS}")
-    return ""
+    path = PROMPT_DIR / filename if PROMPT_DIR is not None else None
+    if path is None or not path.is_file():
+        print(f"  [prompt] WARNING: '{filename}' not found in {_PROMPT_SEARCH_ROOTS}")
+        return ""
+    try:
+        content = path.read_text(encoding="utf-8")
+    except OSError as e:
+        print(f"  [prompt] Error reading {path}: {e}")
+        return ""
+    print(f"  [prompt] Loaded '{filename}' <- {path}")
+    return content
 
 
 ROUTER_PROMPT  = load_prompt_template("router_prompt.txt")
@@ -115,24 +146,24 @@ SUMMARY_PROMPT = load_prompt_template("summary_prompt.txt")
 # ──────────────────────────────────────────────────────────────────────────────
 # METADATA
 # ──────────────────────────────────────────────────────────────────────────────
-def _load_metadata():
+_CATEGORIES_PATH = Path(_BACKEND_ROOT).parent / "src" / "utils" / "categories.json"
+_METADATA_HEADER = "\n\n### CATEGORIES (available options for 'category' argument):\n"
+
+
+def _load_category_names() -> tuple[str, ...]:
+    """Sorted major + sub category names from categories.json (empty on error)."""
     try:
-        categories_path = os.path.join(_BACKEND_ROOT, "..", "src", "utils", "categories.json")
-        with open(categories_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            major_cats = list(data.get("CATEGORY_COLORS", {}).keys())
-            sub_cats = list(data.get("CATEGORY_MAPPING", {}).keys())
-            
-            all_cats = sorted(set(major_cats + sub_cats))
-            md = "\n\n### CATEGORIES (available options for 'category' argument):\n"
-            for c in all_cats:
-                md += f"- {c}\n"
-            return md
+        data = json.loads(_CATEGORIES_PATH.read_text(encoding="utf-8"))
     except Exception as e:
         print(f"Error loading categories for benchmark: {e}")
-        return "\n\n### CATEGORIES (available options for 'category' argument):\n- None\n"
+        return ()
+    return tuple(sorted({*data.get("CATEGORY_COLORS", {}), *data.get("CATEGORY_MAPPING", {})}))
 
-METADATA = _load_metadata()
+
+CATEGORY_NAMES: tuple[str, ...] = _load_category_names()
+METADATA = _METADATA_HEADER + (
+    "".join(f"- {c}\n" for c in CATEGORY_NAMES) if CATEGORY_NAMES else "- None\n"
+)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # TEST SUITE  (20 questions)
@@ -286,6 +317,18 @@ TEST_CASES: list[dict[str, Any]] = [
     },
 ]
 
+# Pre-compile grading patterns and lowercase the expected values once
+for _tc in TEST_CASES:
+    _tc["fn_re"]        = re.compile(_tc["fn_pattern"], re.IGNORECASE | re.DOTALL)
+    _tc["tool_lower"]   = _tc["tool"].lower()
+    _tc["params_lower"] = frozenset(p.lower() for p in _tc["params"])
+    # One pass finds every param marker; the lookahead lets overlapping
+    # markers (e.g. 'year=' inside 'start_year=') all be reported.
+    _tc["param_re"] = (
+        re.compile("(?=(" + "|".join(map(re.escape, _tc["params_lower"])) + "))", re.IGNORECASE)
+        if _tc["params"] else None
+    )
+
 # Tools that trigger the summarizer stage (exact set, not substring match)
 _SUMMARY_TOOLS: frozenset[str] = frozenset({"calculate_statistics", "get_top_expenses"})
 
@@ -296,14 +339,61 @@ _SUMMARY_TOOLS: frozenset[str] = frozenset({"calculate_statistics", "get_top_exp
 def generate_mlx(
     model_id: str,
     messages: list[dict[str, str]],
-) -> tuple[str, float, Optional[str]]:
-    """Call the MLX model and return (response, elapsed_s, error_or_None)."""
+    prompt_cache: Any = None,
+) -> tuple[str, int, Optional[str]]:
+    """
+    Call the MLX model and return (response, elapsed_ns, error_or_None).
+    `prompt_cache` is an optional prefilled system-prompt prefix from
+    mlx_model.make_prefix_cache().
+    """
     try:
-        t0 = time.perf_counter()
-        response = mlx_model.chat(model_id, messages, temperature=0.0)
-        return response.strip(), time.perf_counter() - t0, None
+        t0 = time.perf_counter_ns()
+        response = mlx_model.chat(model_id, messages, temperature=0.0, prefix_cache=prompt_cache)
+        return response.strip(), time.perf_counter_ns() - t0, None
     except Exception as exc:
-        return "", 0.0, str(exc)
+        return "", 0, str(exc)
+
+
+def generate_mlx_batch(
+    model_id: str,
+    messages_list: list[list[dict[str, str]]],
+) -> list[tuple[str, int, Optional[str]]]:
+    """
+    Batched variant of generate_mlx(): one forward pass over every conversation.
+    Per-row elapsed (ns) is the batch wall time split evenly across rows.
+    """
+    try:
+        t0 = time.perf_counter_ns()
+        responses = mlx_model.chat_batch(model_id, messages_list, temperature=0.0)
+        per_row = (time.perf_counter_ns() - t0) // max(len(messages_list), 1)
+        return [(r.strip(), per_row, None) for r in responses]
+    except Exception as exc:
+        return [("", 0, str(exc))] * len(messages_list)
+
+
+# Keyword routes mirroring router_prompt.txt. A question is fast-routed only
+# when exactly one tool's keywords match; anything else goes to the LLM.
+_FAST_ROUTES: list[tuple[re.Pattern[str], str]] = [
+    (re.compile(r"\b(?:compare|vs\.?|versus)\b", re.I),                               "plot_comparison_bars"),
+    (re.compile(r"\b(?:average|mean|median|standard deviation|significant(?:ly)?|statistics?)\b", re.I),
+                                                                                       "calculate_statistics"),
+    (re.compile(r"\b(?:pie|breakdown|distribution|split|proportions?)\b", re.I),        "plot_distribution"),
+    (re.compile(r"\b(?:biggest|largest|top|most expensive|highest)\b", re.I),           "get_top_expenses"),
+    (re.compile(r"\b(?:trend|over time|(?:past|last) \d+ months?|since)\b", re.I),     "plot_time_series"),
+    (re.compile(r"\b(?:how much|total|sum)\b", re.I),                                  "calculate_total"),
+]
+
+
+def fast_route(question: str) -> Optional[tuple[str, int, Optional[str]]]:
+    """
+    Keyword router: returns (tool_name, elapsed_ns, None) in the same shape
+    as generate_mlx() when exactly one tool matches, otherwise None.
+    """
+    t0 = time.perf_counter_ns()
+    hits = {tool for pattern, tool in _FAST_ROUTES if pattern.search(question)}
+    if len(hits) != 1:
+        return None
+    return hits.pop(), time.perf_counter_ns() - t0, None
 
 
 def extract_tool_name(raw_output: str) -> str:
@@ -332,13 +422,18 @@ def grade(tc: dict[str, Any], router_tool: str, spec_out: str) -> dict[str, Any]
     Param acc   (20%) : all required params present as 'name=' substrings
     Composite        : weighted sum of the three components
     """
-    router_ok = int(router_tool.strip().lower() == tc["tool"].lower())
-    fn_ok     = int(bool(re.search(tc["fn_pattern"], spec_out or "", re.IGNORECASE | re.DOTALL)))
+    spec_out  = spec_out or ""
+    router_ok = int(router_tool.strip().lower() == tc["tool_lower"])
+    fn_ok     = int(bool(tc["fn_re"].search(spec_out)))
 
     # Each entry in tc["params"] is already 'name=' so we check substring presence.
     # We do this case-insensitively because `llm_input_validation.py` already
     # fuzzy-matches and corrects case on the backend.
-    param_ok = int(all(p.lower() in (spec_out or "").lower() for p in tc["params"])) if tc["params"] else 1
+    if tc["param_re"] is None:
+        param_ok = 1
+    else:
+        found    = {m.lower() for m in tc["param_re"].findall(spec_out)}
+        param_ok = int(found >= tc["params_lower"])
 
     composite = round(
         GRADE_WEIGHTS["router"] * router_ok
@@ -367,40 +462,199 @@ _CSV_FIELDNAMES = [
 ]
 
 
-def open_checkpoint(path: str) -> tuple[csv.DictWriter, Any]:
+class CheckpointWriter:
     """
-    Open (or create) the incremental CSV checkpoint file.
-    Returns (writer, file_handle).  Caller must close the handle.
+    Incremental CSV checkpoint written from a background thread.
+
+    put() only enqueues the row; the writer thread appends queued rows in
+    batches and flushes every `flush_every` rows or `flush_interval_s`
+    seconds, whichever comes first – so a crash loses at most ~1 s of reps.
+    close() drains the queue, flushes and closes the file.
     """
-    exists = os.path.exists(path)
-    fh = open(path, "a", newline="", encoding="utf-8")
-    writer = csv.DictWriter(fh, fieldnames=_CSV_FIELDNAMES)
-    if not exists:
-        writer.writeheader()
-        fh.flush()
-    return writer, fh
 
+    _CLOSE = object()
+
+    def __init__(self, path: str, flush_every: int = 20, flush_interval_s: float = 1.0) -> None:
+        exists = os.path.exists(path)
+        self._fh     = open(path, "a", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._fh, fieldnames=_CSV_FIELDNAMES)
+        if not exists:
+            self._writer.writeheader()
+            self._fh.flush()
+
+        self._flush_every      = flush_every
+        self._flush_interval_s = flush_interval_s
+        self._q: queue.SimpleQueue = queue.SimpleQueue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="ckpt-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, row: dict[str, Any]) -> None:
+        self._q.put(row)
+
+    def _write(self, rows: list[dict[str, Any]]) -> None:
+        self._writer.writerows(rows)
+        self._fh.flush()
+        rows.clear()
+
+    def _run(self) -> None:
+        pending: list[dict[str, Any]] = []
+        deadline: Optional[float] = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    row = self._q.get(timeout=timeout)
+                except queue.Empty:
+                    self._write(pending)        # interval elapsed
+                    deadline = None
+                    continue
+                if row is self._CLOSE:
+                    break
+                pending.append(row)
+                if deadline is None:
+                    deadline = time.monotonic() + self._flush_interval_s
+                if len(pending) >= self._flush_every:
+                    self._write(pending)
+                    deadline = None
+            if pending:
+                self._write(pending)
+        except BaseException as exc:
+            self._error = exc
+
+    def close(self) -> None:
+        self._q.put(self._CLOSE)
+        self._thread.join()
+        self._fh.close()
+        if self._error is not None:
+            raise self._error
+
+
+# Text columns are read as-is (an empty Summary_Output stays ""); every other
+# column is numeric and parsed by the C reader. The low-cardinality grouping
+# keys are categoricals so every groupby hashes small integer codes.
+_CSV_DTYPES = {
+    "Run_Timestamp": "string", "Model": "category", "Model_Full": "string",
+    "TC_ID": "category", "TC_Category": "category", "Question": "string",
+    "Expected_Tool": "string", "Detected_Tool": "string",
+    "Router_Output": "string", "Specialist_Output": "string", "Summary_Output": "string",
+    "Repetition": "int64",
+    "Router_Correct": "int8", "Fn_Correct": "int8", "Param_Correct": "int8",
+    "Router_Time_s": "float64", "Specialist_Time_s": "float64", "Summary_Time_s": "float64",
+    "Composite_Acc": "float64", "Total_Time_s": "float64",
+}
 
-def append_checkpoint(writer: csv.DictWriter, fh: Any, row: dict[str, Any]) -> None:
-    writer.writerow(row)
-    fh.flush()
+
+def read_checkpoint(path: str):
+    """Load a checkpoint CSV into a typed DataFrame for the report stage."""
+    import pandas as pd
+    return pd.read_csv(path, dtype=_CSV_DTYPES, keep_default_na=False, engine="c")
+
+
+# Above this many raw rows the groupby mean/std kernels run under numba (when
+# it is installed); below it the JIT compile would cost more than it saves.
+NUMBA_MIN_ROWS = 50_000
+
+
+def _agg_engine(n_rows: int) -> dict[str, Any]:
+    """engine kwargs for GroupBy.mean/std – numba for large frames, else cython."""
+    if n_rows < NUMBA_MIN_ROWS:
+        return {}
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        return {}
+    return {"engine": "numba", "engine_kwargs": {"nopython": True, "nogil": True, "parallel": True}}
+
+
+def _group_means(grouped, cols: dict[str, str], engine: dict[str, Any]):
+    """Group means of cols (output name -> source column) in one kernel call."""
+    return grouped[list(cols.values())].mean(**engine).set_axis(list(cols), axis=1)
+
+
+def model_stats(df):
+    """
+    Per-model aggregates shared by the Excel sheets, the plots and the
+    leaderboard – one groupby pass instead of one per consumer.
+    Indexed by Model, in row order – main() sorts the rows by Model up front.
+    """
+    engine  = _agg_engine(len(df))
+    grouped = df.groupby("Model", observed=True, sort=False)
+    total   = grouped["Total_Time_s"]
+    mg = _group_means(grouped, {
+        "avg_total_s":    "Total_Time_s",
+        "avg_router_s":   "Router_Time_s",
+        "avg_spec_s":     "Specialist_Time_s",
+        "avg_sum_s":      "Summary_Time_s",
+        "avg_composite":  "Composite_Acc",
+        "avg_router_acc": "Router_Correct",
+        "avg_fn_acc":     "Fn_Correct",
+        "avg_param_acc":  "Param_Correct",
+    }, engine)
+    mg.insert(1, "median_total_s", total.median())
+    mg.insert(2, "p95_total_s",    total.quantile(0.95))
+    mg.insert(3, "std_total_s",    total.std(**engine))
+    mg["total_obs"] = grouped["Repetition"].count()
+    return mg
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # BENCHMARK LOOP
 # ──────────────────────────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=None)
+def _specialist_system(tool_name: str, current_date: str) -> Optional[str]:
+    """
+    Stage-2 system prompt for tool_name, formatted once per (tool, date).
+    Returns None for tools without a specialist prompt.  The test questions
+    are all English, so lang is fixed to 'en' (main.py detects it per request).
+    """
+    tool_prompt = get_tool_prompt(tool_name)
+    if not tool_prompt:
+        return None
+    return tool_prompt.format(
+        metadata=METADATA,
+        current_date=current_date,
+        function_definition=tool_prompt,
+        lang="en",
+    )
+
+
+def warmup_model(model_id: str, current_date: str) -> float:
+    """
+    Warm the model with one one-token generation per pipeline stage, using
+    the real system prompts so the prefill kernels for each prompt length
+    are JIT-compiled before the timed reps.  Returns elapsed seconds.
+    """
+    user_msg = {"role": "user", "content": TEST_CASES[0]["q"]}
+    t0 = time.perf_counter()
+    for system_prompt in (
+        ROUTER_PROMPT,
+        _specialist_system("calculate_total", current_date),
+        SUMMARY_PROMPT,
+    ):
+        if system_prompt:
+            mlx_model.chat(model_id, [{"role": "system", "content": system_prompt}, user_msg],
+                           max_tokens=1, temperature=0.0)
+    return time.perf_counter() - t0
+
+
 def run_benchmark(
     model_id: str,
     reps: int,
-    ckpt_writer: csv.DictWriter,
-    ckpt_fh: Any,
-) -> list[dict[str, Any]]:
+    ckpt: CheckpointWriter,
+) -> dict[str, Any]:
     """
     Run the full pipeline benchmark for one model.
-    Writes each non-warmup rep to the CSV checkpoint immediately.
-    Returns per-question aggregated stats for console printing.
+    MLX calls run on the calling thread; grading, console output and the
+    CSV checkpoint are handled by a consumer thread fed through a queue.
+    Queues each rep to the CSV checkpoint as soon as it is graded.
+    Returns per-rep stats for console printing: question info plus
+    'times' (n_q, 4, reps) int64 ns, 'oks' (n_q, 3, reps) and
+    'composite' (n_q, reps).
     """
+    import numpy as np
+
     short_name   = model_id.split("/")[-1]
     current_date = datetime.now().strftime("%Y-%m-%d")
     run_ts       = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -411,136 +665,212 @@ def run_benchmark(
     print(f"  Reps  : {reps}  ×  {len(TEST_CASES)} questions  =  {reps * len(TEST_CASES)} calls")
     print(f"{'='*70}")
 
-    per_q_stats: list[dict[str, Any]] = []
-
-    for tc in TEST_CASES:
-        print(f"\n  [{tc['id']}] {tc['q']}")
-
-        q_stats: dict[str, Any] = {
-            "tc_id":            tc["id"],
-            "tc_category":      tc["category"],
-            "question":         tc["q"],
-            "expected_tool":    tc["tool"],
-            "router_times":     [],
-            "specialist_times": [],
-            "summary_times":    [],
-            "total_times":      [],
-            "router_ok_sum":    0,
-            "fn_ok_sum":        0,
-            "param_ok_sum":     0,
-            "composite_sum":    0.0,
-            "reps":             reps,
-        }
-
-        for rep in range(reps + WARMUP_REPS):
-            is_warmup = rep < WARMUP_REPS
-            # FIX 1: single, unambiguous label — warmups shown as W1, W2…;
-            # real reps as 1/N, 2/N, … with no duplicate print line.
-            rep_label = f"W{rep + 1}" if is_warmup else f"{rep - WARMUP_REPS + 1}/{reps}"
-
-            # ── Stage 1: Router ───────────────────────────────────────────
-            router_out, r_time, r_err = generate_mlx(model_id, [
+    if WARMUP:
+        print(f"  [warmup] 3 one-token calls: {warmup_model(model_id, current_date):.2f}s")
+
+    # ── Tokenize every fixed system prompt once, outside the timed calls ──
+    mlx_model.pretokenize(model_id, [
+        [{"role": "system", "content": system_prompt}, {"role": "user", "content": TEST_CASES[0]["q"]}]
+        for system_prompt in (
+            ROUTER_PROMPT,
+            SUMMARY_PROMPT,
+            *(_specialist_system(tool, current_date) for tool in TOOL_PROMPTS),
+        )
+        if system_prompt
+    ])
+
+    # ── Prefix KV caches: system prompts are prefilled once per model ─────
+    router_cache:  Any = None
+    summary_cache: Any = None
+    spec_caches:   dict[str, Any] = {}
+    if PREFIX_CACHE:
+        router_cache = mlx_model.make_prefix_cache(
+            model_id, [{"role": "system", "content": ROUTER_PROMPT}])
+        if SUMMARY_PROMPT:
+            summary_cache = mlx_model.make_prefix_cache(
+                model_id, [{"role": "system", "content": SUMMARY_PROMPT}])
+
+    # ── Stage 1 (batched): one router pass per rep over all questions ─────
+    batched_router: list[list[tuple[str, int, Optional[str]]]] = []
+    if BATCH_ROUTER:
+        router_msgs = [
+            [
                 {"role": "system", "content": ROUTER_PROMPT},
                 {"role": "user",   "content": tc["q"]},
-            ])
-            tool_name = "ERROR" if r_err else extract_tool_name(router_out)
-
-            # ── Stage 2: Specialist ───────────────────────────────────────
-            tool_prompt = get_tool_prompt(tool_name)
-            if not tool_prompt:
-                tool_name   = "calculate_total"
-                tool_prompt = get_tool_prompt("calculate_total")
-
-            system_prompt = tool_prompt.format(
-                metadata=METADATA,
-                current_date=current_date,
-                function_definition=tool_prompt,
-            )
-
-            spec_out, s_time, s_err = generate_mlx(model_id, [
-                {"role": "system", "content": system_prompt},
-                {"role": "user",   "content": tc["q"]},
-            ])
-
-            # ── Stage 3: Summarizer (only for qualifying tools) ───────────
-            sum_time = 0.0
-            sum_out  = ""
-            if tool_name in _SUMMARY_TOOLS and not s_err and SUMMARY_PROMPT:
-                mock_result = "¥42,000 (n=10, avg ¥4,200)"
-                sum_out, sum_time, _ = generate_mlx(model_id, [
-                    {"role": "system", "content": SUMMARY_PROMPT},
-                    {"role": "user",   "content": (
-                        f"User Question: {tc['q']}\n"
-                        f"Analysis Result: {mock_result}"
-                    )},
-                ])
-
-            # ── Grade ─────────────────────────────────────────────────────
-            grades     = grade(tc, tool_name, spec_out)
-            total_time = r_time + s_time + sum_time
-
-            status = (
-                "✓" if grades["composite"] == 1.0
-                else ("~" if grades["composite"] > 0 else "✗")
-            )
-
-            # FIX 1: single print per rep, warmup clearly labelled
-            warmup_tag = "[WARMUP] " if is_warmup else ""
-            print(
-                f"    Rep {rep_label}  [{status}]  {warmup_tag}"
-                f"total={total_time:.2f}s  "
-                f"(R={r_time:.2f}s  S={s_time:.2f}s  Sum={sum_time:.2f}s)  "
-                f"acc={grades['composite']:.2f}  "
-                f"router={'OK' if grades['router_ok'] else 'FAIL'}({tool_name})  "
-                f"fn={'OK' if grades['fn_ok'] else 'FAIL'}  "
-                f"params={'OK' if grades['param_ok'] else 'FAIL'}"
-            )
-
-            # ── Accumulate + checkpoint (warmup excluded from both) ───────
-            if not is_warmup:
-                q_stats["router_times"].append(r_time)
-                q_stats["specialist_times"].append(s_time)
-                q_stats["summary_times"].append(sum_time)
-                q_stats["total_times"].append(total_time)
-                q_stats["router_ok_sum"]  += grades["router_ok"]
-                q_stats["fn_ok_sum"]      += grades["fn_ok"]
-                q_stats["param_ok_sum"]   += grades["param_ok"]
-                q_stats["composite_sum"]  += grades["composite"]
-
-                # FIX 2: checkpoint only written for real reps, never warmup,
-                # so the CSV is clean and needs no post-hoc filtering.
-                append_checkpoint(ckpt_writer, ckpt_fh, {
-                    "Run_Timestamp":     run_ts,
-                    "Model":             short_name,
-                    "Model_Full":        model_id,
-                    "TC_ID":             tc["id"],
-                    "TC_Category":       tc["category"],
-                    "Repetition":        rep - WARMUP_REPS + 1,
-                    "Question":          tc["q"],
-                    "Expected_Tool":     tc["tool"],
-                    "Detected_Tool":     tool_name,
-                    "Router_Correct":    grades["router_ok"],
-                    "Router_Time_s":     round(r_time, 3),
-                    "Router_Output":     (router_out or "")[:300],
-                    "Fn_Correct":        grades["fn_ok"],
-                    "Specialist_Time_s": round(s_time, 3),
-                    "Specialist_Output": (spec_out or "")[:500],
-                    "Param_Correct":     grades["param_ok"],
-                    "Summary_Time_s":    round(sum_time, 3),
-                    "Summary_Output":    (sum_out or "")[:300],
-                    "Composite_Acc":     grades["composite"],
-                    "Total_Time_s":      round(total_time, 3),
-                })
-
-        per_q_stats.append(q_stats)
-
-    return per_q_stats
+            ]
+            for tc in TEST_CASES
+        ]
+        for _ in range(reps):
+            batched_router.append(generate_mlx_batch(model_id, router_msgs))
+
+    # ── Per-rep measurements, filled in place by the consumer thread ──────
+    n_q       = len(TEST_CASES)
+    times     = np.zeros((n_q, 4, reps), dtype=np.int64)    # router / spec / summary / total (ns)
+    oks       = np.zeros((n_q, 3, reps), dtype=np.int8)     # router / fn / param correct
+    composite = np.zeros((n_q, reps),    dtype=np.float64)
+
+    def _record(tc_idx: int, rep: int, tool_name: str,
+                router_out: str, r_ns: int,
+                spec_out: str, s_ns: int,
+                sum_out: str, sum_ns: int) -> None:
+        """Grade, print, accumulate and checkpoint one finished rep."""
+        tc        = TEST_CASES[tc_idx]
+        rep_label = f"{rep + 1}/{reps}"
+
+        if rep == 0:
+            print(f"\n  [{tc['id']}] {tc['q']}")
+
+        # ── Grade ─────────────────────────────────────────────────────────
+        grades     = grade(tc, tool_name, spec_out)
+        total_ns = r_ns + s_ns + sum_ns
+        r_time, s_time, sum_time, total_time = (
+            r_ns / 1e9, s_ns / 1e9, sum_ns / 1e9, total_ns / 1e9
+        )
+
+        status = (
+            "✓" if grades["composite"] == 1.0
+            else ("~" if grades["composite"] > 0 else "✗")
+        )
+
+        print(
+            f"    Rep {rep_label}  [{status}]  "
+            f"total={total_time:.2f}s  "
+            f"(R={r_time:.2f}s  S={s_time:.2f}s  Sum={sum_time:.2f}s)  "
+            f"acc={grades['composite']:.2f}  "
+            f"router={'OK' if grades['router_ok'] else 'FAIL'}({tool_name})  "
+            f"fn={'OK' if grades['fn_ok'] else 'FAIL'}  "
+            f"params={'OK' if grades['param_ok'] else 'FAIL'}"
+        )
+
+        # ── Accumulate + checkpoint ───────────────────────────────────────
+        times[tc_idx, :, rep]  = (r_ns, s_ns, sum_ns, total_ns)
+        oks[tc_idx, :, rep]    = (grades["router_ok"], grades["fn_ok"], grades["param_ok"])
+        composite[tc_idx, rep] = grades["composite"]
+
+        ckpt.put({
+            "Run_Timestamp":     run_ts,
+            "Model":             short_name,
+            "Model_Full":        model_id,
+            "TC_ID":             tc["id"],
+            "TC_Category":       tc["category"],
+            "Repetition":        rep + 1,
+            "Question":          tc["q"],
+            "Expected_Tool":     tc["tool"],
+            "Detected_Tool":     tool_name,
+            "Router_Correct":    grades["router_ok"],
+            "Router_Time_s":     round(r_time, 3),
+            "Router_Output":     (router_out or "")[:300],
+            "Fn_Correct":        grades["fn_ok"],
+            "Specialist_Time_s": round(s_time, 3),
+            "Specialist_Output": (spec_out or "")[:500],
+            "Param_Correct":     grades["param_ok"],
+            "Summary_Time_s":    round(sum_time, 3),
+            "Summary_Output":    (sum_out or "")[:300],
+            "Composite_Acc":     grades["composite"],
+            "Total_Time_s":      round(total_time, 3),
+        })
+
+    # ── Consumer thread: grading / console / CSV overlap the next MLX call.
+    # Inference itself stays on this thread – Metal runs a single stream.
+    done_q: queue.Queue = queue.Queue(maxsize=2 * len(TEST_CASES))
+    consumer_errors: list[BaseException] = []
+
+    def _consume() -> None:
+        while (item := done_q.get()) is not None:
+            if consumer_errors:
+                continue  # keep draining so the producer never blocks
+            try:
+                _record(*item)
+            except BaseException as exc:
+                consumer_errors.append(exc)
+
+    consumer = threading.Thread(target=_consume, name="bench-consumer", daemon=True)
+    consumer.start()
+
+    try:
+        for tc_idx, tc in enumerate(TEST_CASES):
+            for rep in range(reps):
+                # ── Stage 1: Router ───────────────────────────────────────
+                if FAST_ROUTER and (routed := fast_route(tc["q"])) is not None:
+                    router_out, r_ns, r_err = routed
+                elif BATCH_ROUTER:
+                    router_out, r_ns, r_err = batched_router[rep][tc_idx]
+                else:
+                    router_out, r_ns, r_err = generate_mlx(model_id, [
+                        {"role": "system", "content": ROUTER_PROMPT},
+                        {"role": "user",   "content": tc["q"]},
+                    ], prompt_cache=router_cache)
+                tool_name = "ERROR" if r_err else extract_tool_name(router_out)
+
+                # ── Stage 2: Specialist ───────────────────────────────────
+                system_prompt = _specialist_system(tool_name, current_date)
+                if system_prompt is None:
+                    tool_name     = "calculate_total"
+                    system_prompt = _specialist_system(tool_name, current_date)
+
+                spec_cache = None
+                if PREFIX_CACHE:
+                    # Specialist prompts are fixed per tool; prefill lazily on first use
+                    if tool_name not in spec_caches:
+                        spec_caches[tool_name] = mlx_model.make_prefix_cache(
+                            model_id, [{"role": "system", "content": system_prompt}])
+                    spec_cache = spec_caches[tool_name]
+
+                spec_out, s_ns, s_err = generate_mlx(model_id, [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user",   "content": tc["q"]},
+                ], prompt_cache=spec_cache)
+
+                # ── Stage 3: Summarizer (only for qualifying tools) ───────
+                sum_ns   = 0
+                sum_out  = ""
+                if tool_name in _SUMMARY_TOOLS and not s_err and SUMMARY_PROMPT:
+                    mock_result = "¥42,000 (n=10, avg ¥4,200)"
+                    sum_out, sum_ns, _ = generate_mlx(model_id, [
+                        {"role": "system", "content": SUMMARY_PROMPT},
+                        {"role": "user",   "content": (
+                            f"User Question: {tc['q']}\n"
+                            f"Analysis Result: {mock_result}"
+                        )},
+                    ], prompt_cache=summary_cache)
+
+                done_q.put((tc_idx, rep, tool_name,
+                            router_out, r_ns, spec_out, s_ns, sum_out, sum_ns))
+    finally:
+        done_q.put(None)
+        consumer.join()
+
+    if consumer_errors:
+        raise consumer_errors[0]
+
+    return {
+        "questions": [
+            {
+                "tc_id":         tc["id"],
+                "tc_category":   tc["category"],
+                "question":      tc["q"],
+                "expected_tool": tc["tool"],
+            }
+            for tc in TEST_CASES
+        ],
+        "times":     times,
+        "oks":       oks,
+        "composite": composite,
+        "reps":      reps,
+    }
 
 
 # ──────────────────────────────────────────────────────────────────────────────
 # MEMORY MANAGEMENT  (critical on 8 GB M1 Pro)
 # ──────────────────────────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=1)
+def _mx():
+    """mlx.core, imported on first use (not needed for --help or report-only paths)."""
+    import mlx.core
+    return mlx.core
+
+
 def free_model_memory() -> None:
     """
     Best-effort memory reclamation between models.
@@ -558,17 +888,94 @@ def free_model_memory() -> None:
     gc.collect()
 
     try:
-        import mlx.core as mx
-        mx.metal.clear_cache()
+        _mx().metal.clear_cache()
     except Exception:
         pass
 
 
+def _maybe_quantize(model_id: str) -> str:
+    """
+    Swap model_id for its cached 4-bit conversion when --force-4bit is set, or
+    --auto-4bit is set and free RAM is low.  The returned path's basename ends
+    in '-4bit', so results are reported under a distinct model name.
+    """
+    if not FORCE_4BIT:
+        free = available_memory_bytes()
+        if free is None:
+            print("  [4bit] psutil not installed – cannot check free RAM, keeping original weights")
+            return model_id
+        if free >= AUTO_4BIT_MIN_FREE:
+            return model_id
+        print(f"  [4bit] Free RAM {free / 1e9:.1f} GB < {AUTO_4BIT_MIN_FREE / 1e9:.0f} GB")
+
+    try:
+        quantized = mlx_model.quantize_4bit(model_id)
+    except Exception as exc:
+        print(f"  [4bit] Conversion of '{model_id}' failed ({exc}) – using original weights")
+        return model_id
+    if quantized != model_id:
+        print(f"  [4bit] {model_id} -> {quantized}")
+    return quantized
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# PARALLEL MODELS  (--parallel N: one worker process per model)
+# ──────────────────────────────────────────────────────────────────────────────
+
+class _RowCollector:
+    """Stands in for CheckpointWriter inside workers; the parent writes the rows."""
+
+    def __init__(self) -> None:
+        self.rows: list[dict[str, Any]] = []
+
+    def put(self, row: dict[str, Any]) -> None:
+        self.rows.append(row)
+
+
+def _worker_init(options: dict[str, Any]) -> None:
+    """Pool initializer: re-apply the CLI options in the freshly spawned worker."""
+    logging.getLogger("mlx_lm").setLevel(logging.ERROR)
+    globals().update(options)
+    mlx_model.compile_sampler = COMPILE
+
+
+def _run_model_worker(model_id: str, reps: int) -> tuple[str, dict[str, Any], list[dict[str, Any]]]:
+    """Benchmark one model end-to-end; returns (model_id, per-question stats, CSV rows)."""
+    rows  = _RowCollector()
+    per_q = run_benchmark(model_id, reps, rows)
+    free_model_memory()
+    return model_id, per_q, rows.rows
+
+
+def run_parallel(model_ids: list[str], reps: int, ckpt: CheckpointWriter) -> None:
+    """
+    Benchmark models in PARALLEL worker processes.  Each model's rows reach
+    the checkpoint when that model finishes, so a crash loses the models
+    still in flight.  Console lines from concurrent models interleave.
+    """
+    options = {"WARMUP": WARMUP, "FAST_ROUTER": FAST_ROUTER, "BATCH_ROUTER": BATCH_ROUTER, "PREFIX_CACHE": PREFIX_CACHE, "COMPILE": COMPILE}
+    # spawn, not fork: a forked child must not inherit the parent's Metal state
+    with ProcessPoolExecutor(
+        max_workers=PARALLEL,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_worker_init,
+        initargs=(options,),
+    ) as pool:
+        futures = [pool.submit(_run_model_worker, m, reps) for m in model_ids]
+        for fut in as_completed(futures):
+            model_id, per_q, rows = fut.result()
+            for row in rows:
+                ckpt.put(row)
+            print_results(model_id, per_q)
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # CONSOLE PRINT
 # ──────────────────────────────────────────────────────────────────────────────
 
-def print_results(model_id: str, results: list[dict[str, Any]]) -> None:
+def print_results(model_id: str, results: dict[str, Any]) -> None:
+    import numpy as np
+
     short = model_id.split("/")[-1]
     W = 155
     print(f"\n{'='*W}")
@@ -581,25 +988,17 @@ def print_results(model_id: str, results: list[dict[str, Any]]) -> None:
     )
     print("-" * W)
 
-    all_times:     list[float] = []
-    all_composite: list[float] = []
-
-    for res in results:
-        reps    = res["reps"]
-        avg_r   = mean(res["router_times"])
-        avg_s   = mean(res["specialist_times"])
-        avg_sum = mean(res["summary_times"])
-        avg_t   = mean(res["total_times"])
-        r_pct   = res["router_ok_sum"]  / reps * 100
-        fn_pct  = res["fn_ok_sum"]      / reps * 100
-        p_pct   = res["param_ok_sum"]   / reps * 100
-        c_pct   = res["composite_sum"]  / reps * 100
-        q_disp  = res["question"][:47] + "..." if len(res["question"]) > 50 else res["question"]
+    times   = results["times"]                                     # int64 ns
+    q_means = times.mean(axis=2) / 1e9                             # (n_q, 4) seconds
+    q_pcts  = np.column_stack([
+        results["oks"].mean(axis=2),                               # router / fn / param
+        results["composite"].mean(axis=1),
+    ]) * 100                                                       # (n_q, 4)
 
-        all_times.extend(res["total_times"])
-        all_composite.extend(
-            [res["composite_sum"] / reps] * len(res["total_times"])
-        )
+    for res, (avg_r, avg_s, avg_sum, avg_t), (r_pct, fn_pct, p_pct, c_pct) in zip(
+        results["questions"], q_means.tolist(), q_pcts.tolist()
+    ):
+        q_disp  = res["question"][:47] + "..." if len(res["question"]) > 50 else res["question"]
 
         print(
             f"{res['tc_id']:<6} {res['tc_category']:<15} {q_disp:<50} | "
@@ -608,11 +1007,8 @@ def print_results(model_id: str, results: list[dict[str, Any]]) -> None:
         )
 
     print("-" * W)
-    overall_r   = mean([t for r in results for t in r["router_times"]])
-    overall_s   = mean([t for r in results for t in r["specialist_times"]])
-    overall_sum = mean([t for r in results for t in r["summary_times"]])
-    overall_t   = mean(all_times)
-    overall_c   = mean(all_composite) * 100
+    overall_r, overall_s, overall_sum, overall_t = (times.mean(axis=(0, 2)) / 1e9).tolist()
+    overall_c   = float(q_pcts[:, 3].mean())
     print(
         f"{'':6} {'OVERALL':15} {'':50} | "
         f"{overall_r:>6.2f}s {overall_s:>7.2f}s {overall_sum:>6.2f}s {overall_t:>6.2f}s | "
@@ -625,56 +1021,115 @@ def print_results(model_id: str, results: list[dict[str, Any]]) -> None:
 # EXCEL BUILDER  (imported lazily – saves ~200 MB peak RSS during inference)
 # ──────────────────────────────────────────────────────────────────────────────
 
-def _acc_fill(val: float):
+# Style objects are built once (lazily – openpyxl is only imported here) and
+# shared by every cell; the workbook is write-only, so rows stream to disk.
+
+@lru_cache(maxsize=None)
+def _fill(color: Optional[str] = None):
     from openpyxl.styles import PatternFill
-    if val >= 0.9:
-        return PatternFill("solid", start_color="A6E3A1", end_color="A6E3A1")
-    if val >= 0.5:
-        return PatternFill("solid", start_color="FAB387", end_color="FAB387")
-    return PatternFill("solid", start_color="F38BA8", end_color="F38BA8")
-
-
-def _write_header_cell(ws, row: int, col: int, value: str) -> None:
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    cell = ws.cell(row=row, column=col, value=value)
-    cell.font      = Font(name="Arial", bold=True, color="CDD6F4", size=11)
-    cell.fill      = PatternFill("solid", start_color="1E1E2E", end_color="1E1E2E")
-    cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    cell.border    = Border(
+    return PatternFill("solid", start_color=color, end_color=color) if color else PatternFill()
+
+
+@lru_cache(maxsize=None)
+def _border():
+    from openpyxl.styles import Border, Side
+    return Border(
         left=Side(style="thin", color="45475A"), right=Side(style="thin", color="45475A"),
         top=Side(style="thin", color="45475A"),  bottom=Side(style="thin", color="45475A"),
     )
 
 
-def _write_body_cell(ws, row: int, col: int, value: Any,
-                     fill=None, fmt: Optional[str] = None,
-                     align: str = "left") -> None:
-    from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-    cell = ws.cell(row=row, column=col, value=value)
-    cell.font      = Font(name="Arial", color="CDD6F4", size=10)
-    cell.fill      = fill or PatternFill()
-    cell.alignment = Alignment(horizontal=align, vertical="center")
-    cell.border    = Border(
-        left=Side(style="thin", color="45475A"), right=Side(style="thin", color="45475A"),
-        top=Side(style="thin", color="45475A"),  bottom=Side(style="thin", color="45475A"),
+@lru_cache(maxsize=None)
+def _header_styles():
+    from openpyxl.styles import Font, Alignment
+    return (
+        Font(name="Arial", bold=True, color="CDD6F4", size=11),
+        _fill("1E1E2E"),
+        Alignment(horizontal="center", vertical="center", wrap_text=True),
     )
+
+
+@lru_cache(maxsize=None)
+def _body_styles(align: str):
+    from openpyxl.styles import Font, Alignment
+    return Font(name="Arial", color="CDD6F4", size=10), Alignment(horizontal=align, vertical="center")
+
+
+# Composite-accuracy buckets: < 0.5 red, < 0.9 amber, otherwise green.
+_ACC_BUCKET_EDGES  = (0.5, 0.9)
+_ACC_BUCKET_COLORS = ("F38BA8", "FAB387", "A6E3A1")
+
+
+def _acc_fills(values) -> list:
+    """Bucket fill for every accuracy in values – one np.digitize pass, shared fill objects."""
+    import numpy as np
+    fills = [_fill(c) for c in _ACC_BUCKET_COLORS]
+    idx   = np.digitize(np.asarray(values, dtype=float), _ACC_BUCKET_EDGES)
+    return [fills[i] for i in idx.tolist()]
+
+
+def _header_cell(ws, value: str):
+    from openpyxl.cell import WriteOnlyCell
+    font, fill, alignment = _header_styles()
+    cell = WriteOnlyCell(ws, value=value)
+    cell.font      = font
+    cell.fill      = fill
+    cell.alignment = alignment
+    cell.border    = _border()
+    return cell
+
+
+def _body_cell(ws, value: Any, fill=None, fmt: Optional[str] = None, align: str = "left"):
+    from openpyxl.cell import WriteOnlyCell
+    font, alignment = _body_styles(align)
+    cell = WriteOnlyCell(ws, value=value)
+    cell.font      = font
+    cell.fill      = fill or _fill()
+    cell.alignment = alignment
+    cell.border    = _border()
     if fmt:
         cell.number_format = fmt
+    return cell
+
 
+# Sheet column letters A … AF – every sheet here is narrower than that.
+_COLUMN_LETTERS = [chr(65 + i) for i in range(26)] + [f"A{chr(65 + i)}" for i in range(6)]
 
-def _setup_sheet(ws, headers: list[tuple[str, int]]) -> None:
-    from openpyxl.utils import get_column_letter
+
+def _body_style(wb, fmt: str, align: str) -> str:
+    """Name of the workbook's body NamedStyle for (fmt, align), registered on first use."""
+    from openpyxl.styles import NamedStyle
+    name = f"body {align} {fmt}"
+    if name not in wb.named_styles:
+        font, alignment = _body_styles(align)
+        wb.add_named_style(NamedStyle(name=name, font=font, alignment=alignment,
+                                      border=_border(), number_format=fmt))
+    return name
+
+
+def _named_cell(ws, value: Any, style: str, fill=None):
+    from openpyxl.cell import WriteOnlyCell
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    if fill is not None:
+        cell.fill = fill
+    return cell
+
+
+def _setup_sheet(ws, headers: list[tuple[str, int]], freeze: bool = True) -> None:
+    """Sheet view, column widths and the header row – must run before any other append."""
     ws.sheet_view.showGridLines = False
-    ws.freeze_panes = "A2"
-    for ci, (hdr, width) in enumerate(headers, 1):
-        _write_header_cell(ws, 1, ci, hdr)
-        ws.column_dimensions[get_column_letter(ci)].width = width
-    ws.row_dimensions[1].height = 30
+    if freeze:
+        ws.freeze_panes = "A2"
+        ws.row_dimensions[1].height = 30
+    dims = ws.column_dimensions
+    for letter, (_, width) in zip(_COLUMN_LETTERS, headers):
+        dims[letter].width = width
+    ws.append([_header_cell(ws, hdr) for hdr, _ in headers])
 
 
-def _write_raw_sheet(wb, all_raw: list[dict[str, Any]]) -> None:
-    ws = wb.active
-    ws.title = "Raw Observations"
+def _write_raw_sheet(wb, df) -> None:
+    ws = wb.create_sheet("Raw Observations")
 
     headers = [
         ("Model", 22), ("TC ID", 7), ("Category", 14), ("Rep", 5),
@@ -686,57 +1141,47 @@ def _write_raw_sheet(wb, all_raw: list[dict[str, Any]]) -> None:
     ]
     _setup_sheet(ws, headers)
 
-    from openpyxl.styles import PatternFill
-    BEST = PatternFill("solid", start_color="A6E3A1", end_color="A6E3A1")
-    FAIL = PatternFill("solid", start_color="F38BA8", end_color="F38BA8")
-
-    bool_keys   = {"Router_Correct", "Fn_Correct", "Param_Correct"}
-    time_keys   = {"Router_Time_s", "Specialist_Time_s", "Summary_Time_s", "Total_Time_s"}
-    raw_keys    = [
-        "Model", "TC_ID", "TC_Category", "Repetition",
-        "Question", "Expected_Tool", "Detected_Tool",
-        "Router_Correct", "Router_Time_s", "Router_Output",
-        "Fn_Correct", "Specialist_Time_s", "Specialist_Output",
-        "Param_Correct", "Summary_Time_s", "Summary_Output",
-        "Composite_Acc", "Total_Time_s",
+    BEST = _fill("A6E3A1")
+    FAIL = _fill("F38BA8")
+
+    def _text(val):
+        cell = _body_cell(ws, str(val) if val else "")
+        cell.data_type = "s"    # model output starting with "=" is text, not a formula
+        return cell
+
+    def _ok(val):
+        return _body_cell(ws, "OK" if val else "FAIL", fill=BEST if val else FAIL, align="center")
+
+    def _secs(val):
+        return _body_cell(ws, val, fmt="0.000", align="right")
+
+    def _rep(val):
+        return _body_cell(ws, val, align="center")
+
+    acc_fills = iter(_acc_fills(df["Composite_Acc"]))     # consumed in row order
+
+    def _composite(val):
+        return _body_cell(ws, val, fill=next(acc_fills), fmt="0.00", align="center")
+
+    # (column, cell builder) in sheet order – rows stream straight from the frame.
+    columns = [
+        ("Model",         _text), ("TC_ID",             _text), ("TC_Category",       _text),
+        ("Repetition",    _rep),  ("Question",          _text), ("Expected_Tool",     _text),
+        ("Detected_Tool", _text), ("Router_Correct",    _ok),   ("Router_Time_s",     _secs),
+        ("Router_Output", _text), ("Fn_Correct",        _ok),   ("Specialist_Time_s", _secs),
+        ("Specialist_Output", _text), ("Param_Correct", _ok),   ("Summary_Time_s",    _secs),
+        ("Summary_Output", _text), ("Composite_Acc",    _composite), ("Total_Time_s", _secs),
     ]
+    builders = [build for _, build in columns]
 
-    for ri, row in enumerate(all_raw, 2):
-        for ci, key in enumerate(raw_keys, 1):
-            val = row.get(key, "")
-            if key == "Composite_Acc":
-                _write_body_cell(ws, ri, ci, val, fill=_acc_fill(float(val)),
-                                 fmt="0.00", align="center")
-            elif key in bool_keys:
-                _write_body_cell(ws, ri, ci, "OK" if val else "FAIL",
-                                 fill=BEST if val else FAIL, align="center")
-            elif key in time_keys:
-                _write_body_cell(ws, ri, ci, val, fmt="0.000", align="right")
-            elif key == "Repetition":
-                _write_body_cell(ws, ri, ci, val, align="center")
-            else:
-                _write_body_cell(ws, ri, ci, str(val) if val else "")
-
-
-def _write_model_summary_sheet(wb, df) -> None:
-    import numpy as np
+    for row in df[[key for key, _ in columns]].itertuples(index=False, name=None):
+        ws.append([build(val) for build, val in zip(builders, row)])
+
+
+def _write_model_summary_sheet(wb, stats) -> None:
     ws = wb.create_sheet("Model Summary")
-    ws.sheet_view.showGridLines = False
 
-    mg = df.groupby("Model").agg(
-        avg_total_s    = ("Total_Time_s",      "mean"),
-        median_total_s = ("Total_Time_s",      "median"),
-        p95_total_s    = ("Total_Time_s",      lambda x: float(np.percentile(x, 95))),
-        std_total_s    = ("Total_Time_s",      "std"),
-        avg_router_s   = ("Router_Time_s",     "mean"),
-        avg_spec_s     = ("Specialist_Time_s", "mean"),
-        avg_sum_s      = ("Summary_Time_s",    "mean"),
-        avg_composite  = ("Composite_Acc",     "mean"),
-        avg_router_acc = ("Router_Correct",    "mean"),
-        avg_fn_acc     = ("Fn_Correct",        "mean"),
-        avg_param_acc  = ("Param_Correct",     "mean"),
-        total_obs      = ("Repetition",        "count"),
-    ).reset_index()
+    mg = stats.reset_index()
 
     mg["rank_lat"] = mg["avg_total_s"].rank()
     mg["rank_acc"] = mg["avg_composite"].rank(ascending=False)
@@ -761,35 +1206,41 @@ def _write_model_summary_sheet(wb, df) -> None:
         "0.00%", "0.00%", "0.00%", "0.00%", "0",
     ]
 
-    from openpyxl.styles import PatternFill
-    BEST = PatternFill("solid", start_color="A6E3A1", end_color="A6E3A1")
-    best_acc = mg["avg_composite"].max()
-    best_lat = mg["avg_total_s"].min()
-
-    for ri, (_, row) in enumerate(mg.iterrows(), 2):
-        for ci, (key, fmt) in enumerate(zip(keys, fmts), 1):
-            val  = row[key]
-            fill = None
-            al   = "left" if key == "Model" else "center"
-            if key == "avg_composite":
-                fill = BEST if val == best_acc else _acc_fill(val)
-            elif key == "avg_total_s" and val == best_lat:
-                fill = BEST
-            _write_body_cell(ws, ri, ci, val, fill=fill, fmt=fmt, align=al)
+    aligns = ["left" if key == "Model" else "center" for key in keys]
+    acc_ci = keys.index("avg_composite")
+    lat_ci = keys.index("avg_total_s")
+
+    BEST = _fill("A6E3A1")
+    arr  = mg[keys].to_numpy()
+    best_acc_mask = arr[:, acc_ci] == mg["avg_composite"].max()
+    best_lat_mask = arr[:, lat_ci] == mg["avg_total_s"].min()
+
+    # Fills are resolved column-wise up front; the cell loop only zips.
+    fill_cols = [[None] * len(arr) for _ in keys]
+    fill_cols[acc_ci] = [BEST if best else acc_fill
+                         for best, acc_fill in zip(best_acc_mask, _acc_fills(arr[:, acc_ci]))]
+    fill_cols[lat_ci] = [BEST if best else None for best in best_lat_mask]
+
+    for row_vals, row_fills in zip(arr, zip(*fill_cols)):
+        ws.append([
+            _body_cell(ws, val, fill=fill, fmt=fmt, align=al)
+            for val, fill, fmt, al in zip(row_vals, row_fills, fmts, aligns)
+        ])
 
 
 def _write_per_tc_sheet(wb, df) -> None:
     ws = wb.create_sheet("Per-TC Breakdown")
-    ws.sheet_view.showGridLines = False
 
-    grp = df.groupby(["Model", "TC_ID", "TC_Category"]).agg(
-        avg_total_s   = ("Total_Time_s",   "mean"),
-        avg_composite = ("Composite_Acc",  "mean"),
-        avg_router    = ("Router_Correct", "mean"),
-        avg_fn        = ("Fn_Correct",     "mean"),
-        avg_param     = ("Param_Correct",  "mean"),
-        reps          = ("Repetition",     "count"),
-    ).reset_index().sort_values(["Model", "TC_ID"])
+    grouped = df.groupby(["Model", "TC_ID", "TC_Category"], observed=True, sort=False)
+    grp = _group_means(grouped, {
+        "avg_total_s":   "Total_Time_s",
+        "avg_composite": "Composite_Acc",
+        "avg_router":    "Router_Correct",
+        "avg_fn":        "Fn_Correct",
+        "avg_param":     "Param_Correct",
+    }, _agg_engine(len(df)))
+    grp["reps"] = grouped["Repetition"].count()
+    grp = grp.reset_index().sort_values(["Model", "TC_ID"])
 
     headers = [
         ("Model", 22), ("TC ID", 7), ("Category", 14), ("Avg Total(s)", 13),
@@ -803,25 +1254,30 @@ def _write_per_tc_sheet(wb, df) -> None:
     ]
     fmts = ["@", "@", "@", "0.000", "0.00%", "0.00%", "0.00%", "0.00%", "0"]
 
-    for ri, (_, row) in enumerate(grp.iterrows(), 2):
-        for ci, (key, fmt) in enumerate(zip(keys, fmts), 1):
-            val  = row[key]
-            fill = _acc_fill(val) if key == "avg_composite" else None
-            al   = "left" if key in ("Model", "TC_Category") else "center"
-            _write_body_cell(ws, ri, ci, val, fill=fill, fmt=fmt, align=al)
+    aligns = ["left" if key in ("Model", "TC_Category") else "center" for key in keys]
+    acc_ci = keys.index("avg_composite")
+
+    styles = [_body_style(wb, fmt, al) for fmt, al in zip(fmts, aligns)]
+
+    for row_vals, acc_fill in zip(grp[keys].to_numpy(), _acc_fills(grp["avg_composite"])):
+        ws.append([
+            _named_cell(ws, val, style, fill=acc_fill if ci == acc_ci else None)
+            for ci, (val, style) in enumerate(zip(row_vals, styles))
+        ])
 
 
 def _write_per_category_sheet(wb, df) -> None:
     ws = wb.create_sheet("Per-Category")
-    ws.sheet_view.showGridLines = False
 
-    grp = df.groupby(["Model", "TC_Category"]).agg(
-        avg_total_s   = ("Total_Time_s",   "mean"),
-        avg_composite = ("Composite_Acc",  "mean"),
-        avg_router    = ("Router_Correct", "mean"),
-        avg_fn        = ("Fn_Correct",     "mean"),
-        count         = ("Repetition",     "count"),
-    ).reset_index().sort_values(["TC_Category", "Model"])
+    grouped = df.groupby(["Model", "TC_Category"], observed=True, sort=False)
+    grp = _group_means(grouped, {
+        "avg_total_s":   "Total_Time_s",
+        "avg_composite": "Composite_Acc",
+        "avg_router":    "Router_Correct",
+        "avg_fn":        "Fn_Correct",
+    }, _agg_engine(len(df)))
+    grp["count"] = grouped["Repetition"].count()
+    grp = grp.reset_index().sort_values(["TC_Category", "Model"])
 
     headers = [
         ("Category", 14), ("Model", 26), ("Avg Total(s)", 13),
@@ -832,41 +1288,45 @@ def _write_per_category_sheet(wb, df) -> None:
     keys = ["TC_Category", "Model", "avg_total_s", "avg_composite", "avg_router", "avg_fn", "count"]
     fmts = ["@", "@", "0.000", "0.00%", "0.00%", "0.00%", "0"]
 
-    for ri, (_, row) in enumerate(grp.iterrows(), 2):
-        for ci, (key, fmt) in enumerate(zip(keys, fmts), 1):
-            val  = row[key]
-            fill = _acc_fill(val) if key == "avg_composite" else None
-            al   = "left" if key in ("TC_Category", "Model") else "center"
-            _write_body_cell(ws, ri, ci, val, fill=fill, fmt=fmt, align=al)
+    aligns = ["left" if key in ("TC_Category", "Model") else "center" for key in keys]
+    acc_ci = keys.index("avg_composite")
 
+    styles = [_body_style(wb, fmt, al) for fmt, al in zip(fmts, aligns)]
 
-def _write_scatter_sheet(wb, df) -> None:
-    from openpyxl.utils import get_column_letter
+    for row_vals, acc_fill in zip(grp[keys].to_numpy(), _acc_fills(grp["avg_composite"])):
+        ws.append([
+            _named_cell(ws, val, style, fill=acc_fill if ci == acc_ci else None)
+            for ci, (val, style) in enumerate(zip(row_vals, styles))
+        ])
+
+
+def _write_scatter_sheet(wb, stats) -> None:
     from openpyxl.chart import ScatterChart, Reference, Series
+    from openpyxl.chart.marker import DataPoint, Marker
     from openpyxl.chart.series import SeriesLabel
-    import numpy as np
+    from openpyxl.chart.shapes import GraphicalProperties
 
     ws = wb.create_sheet("Acc vs Latency")
-    ws.sheet_view.showGridLines = False
-
-    mg = df.groupby("Model").agg(
-        avg_total_s   = ("Total_Time_s",  "mean"),
-        avg_composite = ("Composite_Acc", "mean"),
-    ).reset_index()
-
-    for ci, h in enumerate(["Model", "Avg Total (s)", "Composite Acc (%)"], 1):
-        _write_header_cell(ws, 1, ci, h)
-        ws.column_dimensions[get_column_letter(ci)].width = 26
 
-    for ri, (_, row) in enumerate(mg.iterrows(), 2):
-        _write_body_cell(ws, ri, 1, row["Model"])
-        _write_body_cell(ws, ri, 2, row["avg_total_s"],         fmt="0.000", align="center")
-        _write_body_cell(ws, ri, 3, row["avg_composite"] * 100, fmt="0.00",  align="center")
+    mg = stats[["avg_total_s", "avg_composite"]].reset_index()
 
     COLORS = [
         "818CF8", "C084FC", "34D399", "FB923C", "F472B6",
         "60A5FA", "FBBF24", "2DD4BF", "F87171", "4ADE80",
     ]
+    colors_for_model = [COLORS[i % len(COLORS)] for i in range(len(mg))]
+
+    _setup_sheet(ws, [("Model", 26), ("Avg Total (s)", 26), ("Composite Acc (%)", 26)], freeze=False)
+
+    # The Model cell carries its point's colour – the table doubles as the legend.
+    for (model, avg_total_s, avg_composite), col in zip(
+            mg.itertuples(index=False, name=None), colors_for_model):
+        ws.append([
+            _body_cell(ws, model, fill=_fill(col)),
+            _body_cell(ws, avg_total_s,         fmt="0.000", align="center"),
+            _body_cell(ws, avg_composite * 100, fmt="0.00",  align="center"),
+        ])
+
     scatter = ScatterChart()
     scatter.title        = "Accuracy vs Latency  (top-left = best)"
     scatter.style        = 10
@@ -876,37 +1336,38 @@ def _write_scatter_sheet(wb, df) -> None:
     scatter.y_axis.numFmt = "0"
     scatter.width  = 26
     scatter.height = 18
-
-    for i, (_, row) in enumerate(mg.iterrows()):
-        dr  = i + 2
-        xv  = Reference(ws, min_col=2, min_row=dr, max_row=dr)
-        yv  = Reference(ws, min_col=3, min_row=dr, max_row=dr)
-        s   = Series(yv, xv)
-        s.title = SeriesLabel(v=ws.cell(row=dr, column=1).value or f"Model {i+1}")
-        col = COLORS[i % len(COLORS)]
-        s.marker.symbol = "circle"
-        s.marker.size   = 14
-        s.marker.graphicalProperties.solidFill          = col
-        s.marker.graphicalProperties.line.solidFill     = col
-        s.graphicalProperties.line.noFill               = True
-        scatter.series.append(s)
+    scatter.legend = None
+
+    # One series over all models; per-model colours are data-point overrides.
+    last = len(mg) + 1
+    s = Series(Reference(ws, min_col=3, min_row=2, max_row=last),
+               Reference(ws, min_col=2, min_row=2, max_row=last))
+    s.title = SeriesLabel(v="Models")
+    s.marker.symbol = "circle"
+    s.marker.size   = 14
+    s.graphicalProperties.line.noFill = True
+    for i, col in enumerate(colors_for_model):
+        gp = GraphicalProperties(solidFill=col)
+        gp.line.solidFill = col
+        s.dPt.append(DataPoint(idx=i, marker=Marker(symbol="circle", size=14, spPr=gp)))
+    scatter.series.append(s)
 
     ws.add_chart(scatter, "E2")
 
 
-def build_excel(all_raw: list[dict[str, Any]], output_path: str) -> None:
-    """Build the results Excel workbook from the flat list of raw observations."""
-    import pandas as pd
+def build_excel(df, output_path: str, stats=None) -> None:
+    """Build the results Excel workbook from the raw-observation DataFrame."""
     import openpyxl
 
-    df = pd.DataFrame(all_raw)
-    wb = openpyxl.Workbook()
+    if stats is None:
+        stats = model_stats(df)
+    wb = openpyxl.Workbook(write_only=True)
 
-    _write_raw_sheet(wb, all_raw)
-    _write_model_summary_sheet(wb, df)
+    _write_raw_sheet(wb, df)
+    _write_model_summary_sheet(wb, stats)
     _write_per_tc_sheet(wb, df)
     _write_per_category_sheet(wb, df)
-    _write_scatter_sheet(wb, df)
+    _write_scatter_sheet(wb, stats)
 
     wb.save(output_path)
     print(f"\n  Excel saved -> {output_path}")
@@ -935,12 +1396,28 @@ _METRIC_STYLES = [
 ]
 
 
+# matplotlib stays an optional, lazily loaded dependency: these names are bound
+# by _ensure_mpl() (Agg backend selected before pyplot is first imported).
+plt = MultipleLocator = GridSpec = None
+
+
+def _ensure_mpl() -> None:
+    global plt, MultipleLocator, GridSpec
+    if plt is not None:
+        return
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as _plt
+    from matplotlib.gridspec import GridSpec as _GridSpec
+    from matplotlib.ticker import MultipleLocator as _MultipleLocator
+    plt, MultipleLocator, GridSpec = _plt, _MultipleLocator, _GridSpec
+
+
 def _short(model_id: str) -> str:
     return model_id.split("/")[-1]
 
 
 def _pub_style() -> None:
-    import matplotlib.pyplot as plt
     plt.rcParams.update({
         "font.family":       "sans-serif",
         "font.sans-serif":   ["Arial", "Helvetica", "DejaVu Sans"],
@@ -977,33 +1454,67 @@ def _pub_style() -> None:
     })
 
 
+# The single-axes figures are drawn one after another on one Figure that is
+# cleared and resized in between, rather than built and torn down each time.
+_shared_fig = None
+
+
+def _subplots(figsize: tuple[float, float]):
+    global _shared_fig
+    if _shared_fig is None:
+        _shared_fig = plt.figure(figsize=figsize)
+    else:
+        _shared_fig.clear()
+        _shared_fig.set_size_inches(figsize)
+    return _shared_fig, _shared_fig.add_subplot()
+
+
+def _release_shared_fig() -> None:
+    global _shared_fig
+    if _shared_fig is not None:
+        plt.close(_shared_fig)
+        _shared_fig = None
+
+
 def _savefig(fig, out_dir: str, name: str, fmt: str) -> None:
-    import matplotlib.pyplot as plt
     path = os.path.join(out_dir, f"{name}.{fmt}")
     fig.savefig(path)
-    plt.close(fig)
+    if fig is not _shared_fig:
+        plt.close(fig)
     print(f"  [plot] {path}")
 
 
-def _fig_acc_vs_latency(mg, color_map: dict, out_dir: str, fmt: str) -> None:
-    import matplotlib.pyplot as plt
-    from matplotlib.ticker import MultipleLocator
+def _errorbar_points(ax, mg, color_map: dict, markersize: float, capsize: float, lw: float):
+    """
+    Latency-vs-accuracy points with horizontal std error bars for all models at
+    once: one errorbar call plus two scatter collections (caps, markers)
+    instead of one errorbar container per model. Returns (xs, ys, colors).
+    """
+    import numpy as np
+    xs     = mg["avg_total_s"].to_numpy()
+    ys     = mg["avg_composite"].to_numpy() * 100
+    xerr   = mg["std_total_s"].to_numpy()
+    colors = [color_map[m] for m in mg.index]
+
+    # errorbar() cannot colour caps per point, so caps are drawn as "|" markers.
+    ax.errorbar(xs, ys, xerr=xerr, fmt="none", ecolor=colors, elinewidth=lw, capsize=0, zorder=3)
+    ax.scatter(np.concatenate([xs - xerr, xs + xerr]), np.concatenate([ys, ys]),
+               s=(2 * capsize) ** 2, marker="|", c=colors * 2, linewidths=lw, zorder=3)
+    ax.scatter(xs, ys, s=markersize ** 2, c=colors, zorder=3)
+    return xs, ys, colors
+
 
-    fig, ax = plt.subplots(figsize=(4.5, 3.5))
+def _fig_acc_vs_latency(mg, color_map: dict, short_map: dict,
+                        out_dir: str, fmt: str) -> None:
 
-    for model, row in mg.iterrows():
-        col = color_map[model]
-        ax.errorbar(
-            row["avg_total_s"], row["avg_composite"] * 100,
-            xerr=row["std_total_s"],
-            fmt="o", color=col, markersize=7,
-            capsize=3, capthick=0.8, elinewidth=0.8,
-            label=_short(model), zorder=3,
-        )
+    fig, ax = _subplots((4.5, 3.5))
+
+    xs, ys, colors = _errorbar_points(ax, mg, color_map, markersize=7, capsize=3, lw=0.8)
+    offset = (5, 3)
+    for model, x, y, col in zip(mg.index, xs, ys, colors):
         ax.annotate(
-            _short(model),
-            xy=(row["avg_total_s"], row["avg_composite"] * 100),
-            xytext=(5, 3), textcoords="offset points",
+            short_map[model], xy=(x, y),
+            xytext=offset, textcoords="offset points",
             fontsize=7, color=col,
         )
 
@@ -1020,9 +1531,9 @@ def _fig_acc_vs_latency(mg, color_map: dict, out_dir: str, fmt: str) -> None:
 
 
 def _fig_latency_breakdown(mg, labels: list[str], out_dir: str, fmt: str) -> None:
-    import matplotlib.pyplot as plt
+    import numpy as np
 
-    fig, ax = plt.subplots(figsize=(max(3.5, len(labels) * 0.9 + 1.5), 3.5))
+    fig, ax = _subplots((max(3.5, len(labels) * 0.9 + 1.5), 3.5))
     x      = np.arange(len(labels))
     bottom = np.zeros(len(labels))
 
@@ -1049,10 +1560,9 @@ def _fig_latency_breakdown(mg, labels: list[str], out_dir: str, fmt: str) -> Non
 
 
 def _fig_accuracy_breakdown(mg, labels: list[str], out_dir: str, fmt: str) -> None:
-    import matplotlib.pyplot as plt
-    from matplotlib.ticker import MultipleLocator
+    import numpy as np
 
-    fig, ax = plt.subplots(figsize=(max(3.5, len(labels) * 1.2 + 1.5), 3.5))
+    fig, ax = _subplots((max(3.5, len(labels) * 1.2 + 1.5), 3.5))
     x      = np.arange(len(labels))
     w      = 0.22
     offs   = np.array([-w, 0, w])
@@ -1078,13 +1588,32 @@ def _fig_accuracy_breakdown(mg, labels: list[str], out_dir: str, fmt: str) -> No
     _savefig(fig, out_dir, "accuracy_breakdown", fmt)
 
 
-def _fig_category_heatmap(cat_pivot, labels: list[str], out_dir: str, fmt: str):
-    import matplotlib.pyplot as plt
+class _Heatmap(NamedTuple):
+    """Model × category accuracy grid, prepared once for both heatmap figures."""
+    values:     Any                              # ndarray, NaN = no observations
+    categories: list[str]
+    cells:      list[tuple[int, int, str, str]]  # (row, col, label, text colour)
+
+
+def _heatmap(cat_pivot) -> _Heatmap:
+    """Annotations for every non-NaN cell are computed in bulk with numpy masks."""
+    import numpy as np
+    values = cat_pivot.to_numpy()
+    ii, jj = np.nonzero(~np.isnan(values))
+    v      = values[ii, jj]
+    colors = np.where((v < 40) | (v > 80), "white", "black")
+    texts  = np.char.mod("%.0f", v)
+    cells  = list(zip(ii.tolist(), jj.tolist(), texts.tolist(), colors.tolist()))
+    return _Heatmap(values, cat_pivot.columns.tolist(), cells)
+
+
+def _fig_category_heatmap(heat: _Heatmap, labels: list[str], out_dir: str, fmt: str):
+    import numpy as np
 
-    categories = cat_pivot.columns.tolist()
-    fig, ax = plt.subplots(figsize=(max(4, len(categories) * 0.9 + 1.5),
-                                    max(2.5, len(labels) * 0.6 + 1.0)))
-    im = ax.imshow(cat_pivot.values, aspect="auto", cmap="RdYlGn", vmin=0, vmax=100)
+    categories = heat.categories
+    fig, ax = _subplots((max(4, len(categories) * 0.9 + 1.5),
+                         max(2.5, len(labels) * 0.6 + 1.0)))
+    im = ax.imshow(heat.values, aspect="auto", cmap="RdYlGn", vmin=0, vmax=100)
 
     ax.set_xticks(np.arange(len(categories)))
     ax.set_yticks(np.arange(len(labels)))
@@ -1093,13 +1622,9 @@ def _fig_category_heatmap(cat_pivot, labels: list[str], out_dir: str, fmt: str):
     ax.tick_params(length=0)
     ax.spines[:].set_visible(False)
 
-    for i in range(len(labels)):
-        for j in range(len(categories)):
-            v = cat_pivot.values[i, j]
-            if not np.isnan(v):
-                tc = "white" if v < 40 or v > 80 else "black"
-                ax.text(j, i, f"{v:.0f}", ha="center", va="center",
-                        fontsize=7.5, color=tc, fontweight="bold")
+    for i, j, txt, tc in heat.cells:
+        ax.text(j, i, txt, ha="center", va="center",
+                fontsize=7.5, color=tc, fontweight="bold")
 
     cbar = fig.colorbar(im, ax=ax, fraction=0.03, pad=0.02)
     cbar.set_label("Composite Accuracy (%)", fontsize=8)
@@ -1111,13 +1636,12 @@ def _fig_category_heatmap(cat_pivot, labels: list[str], out_dir: str, fmt: str):
 
 def _fig_per_tc_strip(tc_avg, model_col: list[str], labels: list[str],
                       color_map: dict, rng, out_dir: str, fmt: str):
-    import matplotlib.pyplot as plt
-    from matplotlib.ticker import MultipleLocator
+    import numpy as np
 
     bp_data = [tc_avg[tc_avg["Model"] == m]["Composite_Acc"].values * 100 for m in model_col]
     jitter_w = 0.12
 
-    fig, ax = plt.subplots(figsize=(max(4, len(labels) * 1.1 + 1), 3.5))
+    fig, ax = _subplots((max(4, len(labels) * 1.1 + 1), 3.5))
     bp = ax.boxplot(bp_data, positions=np.arange(len(model_col)), widths=0.3,
                     patch_artist=True, showfliers=False,
                     medianprops=dict(color="black", linewidth=1.5),
@@ -1149,10 +1673,10 @@ def _fig_per_tc_strip(tc_avg, model_col: list[str], labels: list[str],
 
 def _fig_latency_box(df, model_col: list[str], labels: list[str],
                      color_map: dict, out_dir: str, fmt: str) -> None:
-    import matplotlib.pyplot as plt
+    import numpy as np
 
     lat_data = [df[df["Model"] == m]["Total_Time_s"].values for m in model_col]
-    fig, ax  = plt.subplots(figsize=(max(4, len(labels) * 1.1 + 1), 3.5))
+    fig, ax  = _subplots((max(4, len(labels) * 1.1 + 1), 3.5))
     bp2 = ax.boxplot(lat_data, positions=np.arange(len(model_col)), widths=0.4,
                      patch_artist=True, showfliers=True,
                      flierprops=dict(marker=".", markersize=3, alpha=0.4),
@@ -1174,12 +1698,10 @@ def _fig_latency_box(df, model_col: list[str], labels: list[str],
     _savefig(fig, out_dir, "latency_box", fmt)
 
 
-def _fig_summary_panel(mg, cat_pivot, tc_avg, model_col: list[str],
-                       labels: list[str], color_map: dict,
+def _fig_summary_panel(mg, heat: _Heatmap, tc_avg, model_col: list[str],
+                       labels: list[str], color_map: dict, short_map: dict,
                        bp_data: list, rng, out_dir: str, fmt: str) -> None:
-    import matplotlib.pyplot as plt
-    from matplotlib.gridspec import GridSpec
-    from matplotlib.ticker import MultipleLocator
+    import numpy as np
 
     jitter_w = 0.12
     fig = plt.figure(figsize=(10, 6.5))
@@ -1190,20 +1712,13 @@ def _fig_summary_panel(mg, cat_pivot, tc_avg, model_col: list[str],
     ax_acc_brk = fig.add_subplot(gs[0, 2])
     ax_heatmap = fig.add_subplot(gs[1, 0:2])
     ax_strip   = fig.add_subplot(gs[1, 2])
-    categories = cat_pivot.columns.tolist()
-
-    for model, row in mg.iterrows():
-        col = color_map[model]
-        ax_scatter.errorbar(
-            row["avg_total_s"], row["avg_composite"] * 100,
-            xerr=row["std_total_s"],
-            fmt="o", color=col, markersize=6,
-            capsize=2.5, capthick=0.7, elinewidth=0.7,
-            label=_short(model), zorder=3,
-        )
-        ax_scatter.annotate(_short(model),
-                            xy=(row["avg_total_s"], row["avg_composite"] * 100),
-                            xytext=(4, 2), textcoords="offset points",
+    categories = heat.categories
+
+    xs, ys, colors = _errorbar_points(ax_scatter, mg, color_map, markersize=6, capsize=2.5, lw=0.7)
+    offset = (4, 2)
+    for model, x, y, col in zip(mg.index, xs, ys, colors):
+        ax_scatter.annotate(short_map[model], xy=(x, y),
+                            xytext=offset, textcoords="offset points",
                             fontsize=6, color=col)
     ax_scatter.set_xlabel("Avg Latency (s)")
     ax_scatter.set_ylabel("Composite Acc. (%)")
@@ -1243,7 +1758,7 @@ def _fig_summary_panel(mg, cat_pivot, tc_avg, model_col: list[str],
     ax_acc_brk.axhline(100, color="#cccccc", ls="--", lw=0.5)
     ax_acc_brk.yaxis.set_major_locator(MultipleLocator(25))
 
-    im2 = ax_heatmap.imshow(cat_pivot.values, aspect="auto",
+    im2 = ax_heatmap.imshow(heat.values, aspect="auto",
                              cmap="RdYlGn", vmin=0, vmax=100)
     ax_heatmap.set_xticks(np.arange(len(categories)))
     ax_heatmap.set_yticks(np.arange(len(labels)))
@@ -1251,13 +1766,9 @@ def _fig_summary_panel(mg, cat_pivot, tc_avg, model_col: list[str],
     ax_heatmap.set_yticklabels(labels, fontsize=7)
     ax_heatmap.tick_params(length=0)
     ax_heatmap.spines[:].set_visible(False)
-    for i in range(len(labels)):
-        for j in range(len(categories)):
-            v = cat_pivot.values[i, j]
-            if not np.isnan(v):
-                tc_c = "white" if v < 40 or v > 80 else "black"
-                ax_heatmap.text(j, i, f"{v:.0f}", ha="center", va="center",
-                                fontsize=6.5, color=tc_c, fontweight="bold")
+    for i, j, txt, tc_c in heat.cells:
+        ax_heatmap.text(j, i, txt, ha="center", va="center",
+                        fontsize=6.5, color=tc_c, fontweight="bold")
     cbar2 = fig.colorbar(im2, ax=ax_heatmap, fraction=0.025, pad=0.02)
     cbar2.set_label("Acc. (%)", fontsize=7)
     cbar2.ax.tick_params(labelsize=6)
@@ -1293,56 +1804,51 @@ def _fig_summary_panel(mg, cat_pivot, tc_avg, model_col: list[str],
     _savefig(fig, out_dir, "summary_panel", fmt)
 
 
-def plot_results(all_raw: list[dict[str, Any]], model_ids: list[str],
-                 out_dir: str = ".", fmt: str = "pdf") -> None:
-    import pandas as pd
-    import matplotlib
-    matplotlib.use("Agg")
+def plot_results(df, model_ids: list[str],
+                 out_dir: str = ".", fmt: str = "pdf", stats=None) -> None:
+    import numpy as np
 
+    _ensure_mpl()
     os.makedirs(out_dir, exist_ok=True)
     _pub_style()
 
-    df        = pd.DataFrame(all_raw)
     model_col = df["Model"].unique().tolist()
     color_map = {m: _PALETTE[i % len(_PALETTE)] for i, m in enumerate(model_col)}
-    labels    = [_short(m) for m in model_col]
-
-    mg = df.groupby("Model").agg(
-        avg_total_s    = ("Total_Time_s",      "mean"),
-        std_total_s    = ("Total_Time_s",      "std"),
-        avg_router_s   = ("Router_Time_s",     "mean"),
-        avg_spec_s     = ("Specialist_Time_s", "mean"),
-        avg_sum_s      = ("Summary_Time_s",    "mean"),
-        avg_composite  = ("Composite_Acc",     "mean"),
-        avg_router_acc = ("Router_Correct",    "mean"),
-        avg_fn_acc     = ("Fn_Correct",        "mean"),
-        avg_param_acc  = ("Param_Correct",     "mean"),
-    ).reindex(model_col)
+    short_map = {m: _short(m) for m in model_col}
+    labels    = [short_map[m] for m in model_col]
+
+    mg = (model_stats(df) if stats is None else stats).reindex(model_col)
+
+    engine = _agg_engine(len(df))
 
     cat_pivot = (
-        df.groupby(["Model", "TC_Category"])["Composite_Acc"]
-        .mean()
+        df.groupby(["Model", "TC_Category"], observed=True, sort=False)["Composite_Acc"]
+        .mean(**engine)
         .unstack("TC_Category")
         .reindex(model_col)
         * 100
     )
 
     tc_avg = (
-        df.groupby(["Model", "TC_ID"])["Composite_Acc"]
-        .mean()
+        df.groupby(["Model", "TC_ID"], observed=True, sort=False)["Composite_Acc"]
+        .mean(**engine)
         .reset_index()
     )
 
-    rng = np.random.default_rng(42)
+    heat = _heatmap(cat_pivot)
+    rng  = np.random.default_rng(42)
 
-    _fig_acc_vs_latency(mg, color_map, out_dir, fmt)
-    _fig_latency_breakdown(mg, labels, out_dir, fmt)
-    _fig_accuracy_breakdown(mg, labels, out_dir, fmt)
-    _fig_category_heatmap(cat_pivot, labels, out_dir, fmt)
-    bp_data = _fig_per_tc_strip(tc_avg, model_col, labels, color_map, rng, out_dir, fmt)
-    _fig_latency_box(df, model_col, labels, color_map, out_dir, fmt)
-    _fig_summary_panel(mg, cat_pivot, tc_avg, model_col, labels,
-                       color_map, bp_data, rng, out_dir, fmt)
+    try:
+        _fig_acc_vs_latency(mg, color_map, short_map, out_dir, fmt)
+        _fig_latency_breakdown(mg, labels, out_dir, fmt)
+        _fig_accuracy_breakdown(mg, labels, out_dir, fmt)
+        _fig_category_heatmap(heat, labels, out_dir, fmt)
+        bp_data = _fig_per_tc_strip(tc_avg, model_col, labels, color_map, rng, out_dir, fmt)
+        _fig_latency_box(df, model_col, labels, color_map, out_dir, fmt)
+    finally:
+        _release_shared_fig()
+    _fig_summary_panel(mg, heat, tc_avg, model_col, labels,
+                       color_map, short_map, bp_data, rng, out_dir, fmt)
 
     print(f"\n  [plots] All figures written to: {out_dir}/")
 
@@ -1352,7 +1858,7 @@ def plot_results(all_raw: list[dict[str, Any]], model_ids: list[str],
 # ──────────────────────────────────────────────────────────────────────────────
 
 def main() -> None:
-    global REPETITIONS_PER_Q
+    global REPETITIONS_PER_Q, WARMUP, FAST_ROUTER, BATCH_ROUTER, PREFIX_CACHE, COMPILE, FORCE_4BIT, AUTO_4BIT, PARALLEL
 
     parser = argparse.ArgumentParser(description="MLX multi-model pipeline benchmark")
     parser.add_argument("mode",     nargs="?",  default="",
@@ -1365,12 +1871,41 @@ def main() -> None:
                         help="Write publication plots into DIR (e.g. --plots figures/)")
     parser.add_argument("--fmt",    default="pdf", choices=["pdf", "svg", "png"],
                         help="Plot file format (default: pdf)")
+    parser.add_argument("--no-warmup", action="store_true",
+                        help="Skip the per-model one-token warmup calls")
+    parser.add_argument("--fast-router", action="store_true",
+                        help="Route unambiguous questions by keyword regex, skipping the LLM router "
+                             "(router accuracy then measures the regexes, not the model)")
+    parser.add_argument("--batch-router", action="store_true",
+                        help="Batch the router stage across all test cases "
+                             "(per-question router time becomes batch time / N)")
+    parser.add_argument("--prefix-cache", action="store_true",
+                        help="Prefill each system prompt once per model and reuse its KV cache")
+    parser.add_argument("--compile", action="store_true",
+                        help="Compile the per-token sampler with mx.compile")
+    parser.add_argument("--force-4bit", action="store_true",
+                        help="Convert every non-4-bit model to 4-bit (cached on disk) before running it")
+    parser.add_argument("--auto-4bit", action="store_true",
+                        help=f"Like --force-4bit, but only when free RAM < {AUTO_4BIT_MIN_FREE / 1e9:.0f} GB "
+                             "(requires psutil)")
+    parser.add_argument("--parallel", type=int, default=PARALLEL, metavar="N",
+                        help="Benchmark N models at once in separate processes "
+                             f"(default: {PARALLEL}; each process holds its own model in RAM)")
     args = parser.parse_args()
 
     if args.mode == "quick":
         REPETITIONS_PER_Q = 1
     elif args.reps:
         REPETITIONS_PER_Q = args.reps
+    WARMUP       = not args.no_warmup
+    FAST_ROUTER  = args.fast_router
+    BATCH_ROUTER = args.batch_router
+    PREFIX_CACHE = args.prefix_cache
+    COMPILE = args.compile
+    mlx_model.compile_sampler = COMPILE
+    FORCE_4BIT = args.force_4bit
+    AUTO_4BIT  = args.auto_4bit
+    PARALLEL   = max(1, args.parallel)
 
     timestamp   = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_path = args.output or f"benchmark_mlx_{timestamp}.xlsx"
@@ -1384,65 +1919,59 @@ def main() -> None:
     print(f"  Test cases   : {len(TEST_CASES)}")
     print(f"  Reps/Q       : {REPETITIONS_PER_Q}")
     print(f"  Total calls  : {total_calls}")
+    print(f"  Warmup       : {'3 one-token calls/model' if WARMUP else 'off'}")
+    print(f"  Fast router  : {'on' if FAST_ROUTER else 'off'}")
+    print(f"  Router batch : {'on' if BATCH_ROUTER else 'off'}")
+    print(f"  Prefix cache : {'on' if PREFIX_CACHE else 'off'}")
+    print(f"  mx.compile   : {'on' if COMPILE else 'off'}")
+    print(f"  4-bit        : {'force' if FORCE_4BIT else ('auto' if AUTO_4BIT else 'off')}")
+    print(f"  Parallel     : {PARALLEL} process(es)")
     print(f"  Output Excel : {output_path}")
-    print(f"  Checkpoint   : {ckpt_path}  (flushed after every rep)")
+    print(f"  Checkpoint   : {ckpt_path}  (flushed in the background, <=1 s behind)")
 
     if not ROUTER_PROMPT:
         print("\n  WARNING: router_prompt.txt empty/missing – router stage has blank system prompt.")
     if not SUMMARY_PROMPT:
         print("  WARNING: summary_prompt.txt empty/missing – summarizer stage will be skipped.\n")
 
-    ckpt_writer, ckpt_fh = open_checkpoint(ckpt_path)
+    ckpt = CheckpointWriter(ckpt_path)
 
     try:
         # FIX 3: removed the stale single-model branch with the misleading comment.
         # run_benchmark always writes to checkpoint; main() always reads back from
         # CSV after the loop, so there is one consistent code path for all cases.
-        for model_id in MLX_MODELS:
-            per_q = run_benchmark(model_id, REPETITIONS_PER_Q, ckpt_writer, ckpt_fh)
-            print_results(model_id, per_q)
-
-            if len(MLX_MODELS) > 1:
-                print(f"\n  [memory] Freeing model '{model_id.split('/')[-1]}' before next load …")
-                free_model_memory()
+        if PARALLEL > 1 and len(MLX_MODELS) > 1:
+            model_ids = [_maybe_quantize(m) if (FORCE_4BIT or AUTO_4BIT) else m for m in MLX_MODELS]
+            run_parallel(model_ids, REPETITIONS_PER_Q, ckpt)
+        else:
+            for model_id in MLX_MODELS:
+                if FORCE_4BIT or AUTO_4BIT:
+                    model_id = _maybe_quantize(model_id)
+                per_q = run_benchmark(model_id, REPETITIONS_PER_Q, ckpt)
+                print_results(model_id, per_q)
+
+                if len(MLX_MODELS) > 1:
+                    print(f"\n  [memory] Freeing model '{model_id.split('/')[-1]}' before next load …")
+                    free_model_memory()
 
     finally:
-        ckpt_fh.close()
+        ckpt.close()
 
     # Re-read checkpoint as single source of truth for Excel / plots.
-    # This avoids keeping a second copy of all_raw in RAM during inference.
-    import csv as _csv
-    all_raw: list[dict[str, Any]] = []
-    with open(ckpt_path, newline="", encoding="utf-8") as f:
-        reader = _csv.DictReader(f)
-        all_raw = list(reader)
-
-    # Cast numeric fields back from strings
-    _numeric_fields = {
-        "Router_Correct", "Fn_Correct", "Param_Correct",
-        "Router_Time_s", "Specialist_Time_s", "Summary_Time_s",
-        "Composite_Acc", "Total_Time_s", "Repetition",
-    }
-    for row in all_raw:
-        for field in _numeric_fields:
-            if field in row and row[field] != "":
-                try:
-                    row[field] = float(row[field])
-                except ValueError:
-                    pass
+    # This avoids keeping a second copy of the raw rows in RAM during inference.
+    # Sorted once so every later groupby(sort=False) scans contiguous Model blocks.
+    df    = read_checkpoint(ckpt_path).sort_values("Model", kind="stable", ignore_index=True)
+    stats = model_stats(df)
 
-    build_excel(all_raw, output_path)
+    build_excel(df, output_path, stats=stats)
 
     if args.plots is not None:
         print(f"\n  Generating publication plots -> {args.plots}/")
-        plot_results(all_raw, MLX_MODELS, out_dir=args.plots, fmt=args.fmt)
+        plot_results(df, MLX_MODELS, out_dir=args.plots, fmt=args.fmt, stats=stats)
 
-    import pandas as pd
-    df = pd.DataFrame(all_raw)
     lb = (
-        df.groupby("Model")
-        .agg(avg_latency_s=("Total_Time_s", "mean"),
-             composite_acc=("Composite_Acc", "mean"))
+        stats[["avg_total_s", "avg_composite"]]
+        .set_axis(["avg_latency_s", "composite_acc"], axis=1)
         .round(3)
         .sort_values("composite_acc", ascending=False)
     )
@@ -9,12 +9,12 @@ Usage:
 """
 
 import argparse
+import hashlib
 import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.ticker import MultipleLocator
-from matplotlib.gridspec import GridSpec
 
 # ──────────────────────────────────────────────────────────────────────────────
 # CONFIG & STYLING (Copied from benchmark_mlx.py)
@@ -37,6 +37,22 @@ _METRIC_STYLES = [
     ("Params",  "avg_param_acc",  "...",   "#009E73"),
 ]
 
+# matplotlib is imported on first use by _ensure_mpl() (Agg backend selected
+# before pyplot is imported), so a bad --input fails fast without paying for it.
+plt = MultipleLocator = GridSpec = Line2D = None
+
+def _ensure_mpl() -> None:
+    global plt, MultipleLocator, GridSpec, Line2D
+    if plt is not None:
+        return
+    import matplotlib
+    matplotlib.use("Agg")  # files only; never pay for a GUI backend (also in pool workers)
+    import matplotlib.pyplot as _plt
+    from matplotlib.gridspec import GridSpec as _GridSpec
+    from matplotlib.lines import Line2D as _Line2D
+    from matplotlib.ticker import MultipleLocator as _MultipleLocator
+    plt, MultipleLocator, GridSpec, Line2D = _plt, _MultipleLocator, _GridSpec, _Line2D
+
 def _pub_style() -> None:
     plt.rcParams.update({
         "font.family":       "sans-serif",
@@ -67,6 +83,11 @@ def _pub_style() -> None:
         "legend.framealpha": 0.9,
         "legend.edgecolor":  "#cccccc",
         "legend.handlelength": 1.5,
+        "text.usetex":       False,
+        "text.hinting":      "none",
+        "text.hinting_factor": 8,
+        "path.simplify":     True,
+        "path.simplify_threshold": 1.0,
     })
 
 def _short(model_id: str) -> str:
@@ -77,133 +98,290 @@ def _short(model_id: str) -> str:
         name = name.replace(suffix, "")
     return name
 
+# zlib level for PNG output; level 1 (--fast) encodes several times faster
+# for ~15% larger files while iterating on figures.
+_PNG_COMPRESS_LEVEL = 6
+
+def _init_render(compress_level: int) -> None:
+    """Per-process render setup: style and PNG compression (also a pool initializer)."""
+    global _PNG_COMPRESS_LEVEL
+    _PNG_COMPRESS_LEVEL = compress_level
+    _ensure_mpl()
+    _pub_style()
+
 def _savefig(fig, out_dir: str, name: str, fmt: str = "png") -> None:
     path = os.path.join(out_dir, f"{name}.{fmt}")
-    fig.savefig(path)
+    if fmt == "png":
+        fig.savefig(path, pil_kwargs={"compress_level": _PNG_COMPRESS_LEVEL, "optimize": False})
+    else:
+        fig.savefig(path)
     plt.close(fig)
     print(f"  [saved] {path}")
 
+def _figure_signature(name: str, args: tuple, compress_level: int) -> str:
+    """Hash of a figure's input arrays, PNG level, this module's source and the matplotlib version."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{name}:{compress_level}".encode())
+    h.update(pickle.dumps(args, protocol=4))
+    with open(__file__, "rb") as f:
+        h.update(f.read())
+    import matplotlib
+    h.update(matplotlib.__version__.encode())
+    return h.hexdigest()
+
+def _read_signature(out_dir: str, name: str, fmt: str = "png"):
+    path = os.path.join(out_dir, f"{name}.{fmt}")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(f"{path}.sig") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _write_signature(out_dir: str, name: str, sig: str, fmt: str = "png") -> None:
+    with open(os.path.join(out_dir, f"{name}.{fmt}.sig"), "w") as f:
+        f.write(sig)
+
 # ──────────────────────────────────────────────────────────────────────────────
 # DATA LOADING
 # ──────────────────────────────────────────────────────────────────────────────
 
+# python-calamine (Rust) reads xlsx an order of magnitude faster than openpyxl;
+# it is optional, so fall back to pandas' default engine when it is missing.
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = "calamine"
+except ImportError:
+    _EXCEL_ENGINE = "openpyxl"
+
+# With pyarrow, the OK/FAIL text columns are Arrow-backed so strip/upper/eq run
+# as Arrow compute kernels over the utf8 buffer instead of per-object Python str.
+try:
+    import pyarrow  # noqa: F401
+    _STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    _STRING_DTYPE = "string"
+
+# Map Excel headers (Human Readable) to Internal Variable Names
+# Based on _write_raw_sheet in benchmark_mlx.py
+_COLUMN_MAP = {
+    "Model":           "Model",
+    "TC ID":           "TC_ID",
+    "Category":        "TC_Category",
+    "Rep":             "Repetition",
+    "Total (s)":       "Total_Time_s",
+    "Router (s)":      "Router_Time_s",
+    "Spec (s)":        "Specialist_Time_s",
+    "Summary (s)":     "Summary_Time_s",
+    "Composite":       "Composite_Acc",
+    "Router OK":       "Router_Correct",
+    "Fn OK":           "Fn_Correct",
+    "Param OK":        "Param_Correct"
+}
+
+def _ok_fail_to_float(s: pd.Series) -> np.ndarray:
+    """"OK"/"FAIL" -> 1.0/0.0 (case/space-insensitive); numeric strings pass through, anything else -> 0.0."""
+    u   = s.astype(_STRING_DTYPE).str.strip().str.upper()
+    out = np.where(u.eq("OK").fillna(False), 1.0,
+                   np.where(u.eq("FAIL").fillna(False), 0.0,
+                            pd.to_numeric(s, errors="coerce").to_numpy(dtype=float, na_value=np.nan)))
+    return np.nan_to_num(out, nan=0.0).astype(np.float32)
+
 def load_and_clean_data(excel_path: str) -> pd.DataFrame:
     print(f"Reading '{excel_path}'...")
-    
+
+    # Only the mapped columns are parsed – the long model-output text columns are skipped
+    read_kwargs = dict(
+        engine=_EXCEL_ENGINE,
+        usecols=lambda c: c in _COLUMN_MAP,
+        dtype={c: _STRING_DTYPE for c in ("Router OK", "Fn OK", "Param OK")},
+    )
+
     # Load the Raw Observations sheet
     try:
-        df = pd.read_excel(excel_path, sheet_name="Raw Observations")
+        df = pd.read_excel(excel_path, sheet_name="Raw Observations", **read_kwargs)
     except ValueError:
         # Fallback if sheet name is different or default
-        df = pd.read_excel(excel_path, sheet_name=0)
-
-    # Map Excel headers (Human Readable) to Internal Variable Names
-    # Based on _write_raw_sheet in benchmark_mlx.py
-    column_map = {
-        "Model":           "Model",
-        "TC ID":           "TC_ID",
-        "Category":        "TC_Category",
-        "Rep":             "Repetition",
-        "Total (s)":       "Total_Time_s",
-        "Router (s)":      "Router_Time_s",
-        "Spec (s)":        "Specialist_Time_s",
-        "Summary (s)":     "Summary_Time_s",
-        "Composite":       "Composite_Acc",
-        "Router OK":       "Router_Correct",
-        "Fn OK":           "Fn_Correct",
-        "Param OK":        "Param_Correct"
-    }
-    
+        df = pd.read_excel(excel_path, sheet_name=0, **read_kwargs)
+
     # Rename columns
-    df = df.rename(columns=column_map)
+    df = df.rename(columns=_COLUMN_MAP)
     
     # Convert "OK"/"FAIL" text columns to 1.0/0.0
     bool_cols = ["Router_Correct", "Fn_Correct", "Param_Correct"]
     for col in bool_cols:
         if col in df.columns:
-            # Handle string "OK"/"FAIL" and potential existing numbers
-            df[col] = df[col].apply(lambda x: 1.0 if str(x).strip().upper() == "OK" else (0.0 if str(x).strip().upper() == "FAIL" else x))
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0)
+            df[col] = _ok_fail_to_float(df[col])
 
-    # Ensure numeric columns are floats
+    # Ensure numeric columns are floats (float32 halves the bytes every groupby walks)
     num_cols = ["Total_Time_s", "Router_Time_s", "Specialist_Time_s", "Summary_Time_s", "Composite_Acc"]
     for col in num_cols:
         if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0)
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0).astype(np.float32)
+
+    # Grouping keys as categoricals so groupby works on integer codes.
+    # Model keeps first-appearance order – that is the plotting order.
+    if "Model" in df.columns:
+        df["Model"] = pd.Categorical(df["Model"], categories=df["Model"].dropna().unique())
+    for col in ("TC_Category", "TC_ID"):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
 
     print(f"Loaded {len(df)} rows.")
     return df
 
+# Bump when load_and_clean_data() or _COLUMN_MAP change, so stale .feather caches are
+# ignored (--no-cache also bypasses the cache for a single run).
+DATA_CACHE_VERSION = "1"
+
+def load_data_cached(excel_path: str) -> pd.DataFrame:
+    """
+    load_and_clean_data() behind a '<input>.v<DATA_CACHE_VERSION>.feather' cache that is
+    reused while it is newer than the workbook, so replotting skips the xlsx parse.
+    Feather needs pyarrow; without it, or if the cache cannot be read or written
+    (corrupt file, read-only directory), the Excel file is simply re-read.
+    """
+    cache = f"{excel_path}.v{DATA_CACHE_VERSION}.feather"
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(excel_path):
+        try:
+            df = pd.read_feather(cache)
+            print(f"Loaded {len(df)} rows from cache '{cache}'.")
+            return df
+        except Exception as e:
+            print(f"Ignoring unreadable cache '{cache}': {e}")
+
+    df = load_and_clean_data(excel_path)
+    try:
+        df.reset_index(drop=True).to_feather(cache, compression="zstd")
+    except Exception as e:
+        print(f"Could not write cache '{cache}': {e}")
+    return df
+
 # ──────────────────────────────────────────────────────────────────────────────
-# PLOTTING FUNCTIONS
+# AGGREGATION
 # ──────────────────────────────────────────────────────────────────────────────
 
-def generate_plots(df: pd.DataFrame, out_dir: str):
-    _pub_style()
-    
-    # Prepare Aggregations
-    model_col = df["Model"].unique().tolist()
-    color_map = {m: _PALETTE[i % len(_PALETTE)] for i, m in enumerate(model_col)}
-    marker_map = {m: ["o", "s", "^", "D", "v", "p", "P", "*", "X"][i % 9] for i, m in enumerate(model_col)}
-    labels    = [_short(m) for m in model_col]
+_VALUE_COLS = {
+    "avg_total_s":    "Total_Time_s",
+    "avg_router_s":   "Router_Time_s",
+    "avg_spec_s":     "Specialist_Time_s",
+    "avg_sum_s":      "Summary_Time_s",
+    "avg_composite":  "Composite_Acc",
+    "avg_router_acc": "Router_Correct",
+    "avg_fn_acc":     "Fn_Correct",
+    "avg_param_acc":  "Param_Correct",
+}
 
-    # Main Grouping (Means & Stds)
-    mg = df.groupby("Model").agg(
-        avg_total_s    = ("Total_Time_s",      "mean"),
-        std_total_s    = ("Total_Time_s",      "std"),
-        avg_router_s   = ("Router_Time_s",     "mean"),
-        avg_spec_s     = ("Specialist_Time_s", "mean"),
-        avg_sum_s      = ("Summary_Time_s",    "mean"),
-        avg_composite  = ("Composite_Acc",     "mean"),
-        avg_router_acc = ("Router_Correct",    "mean"),
-        avg_fn_acc     = ("Fn_Correct",        "mean"),
-        avg_param_acc  = ("Param_Correct",     "mean"),
-    ).reindex(model_col)
-
-    # Category Pivot
-    cat_pivot = (
-        df.groupby(["Model", "TC_Category"])["Composite_Acc"]
-        .mean()
-        .unstack("TC_Category")
-        .reindex(model_col)
-        * 100
-    )
+def _category_pivot(df: pd.DataFrame, model_col: list) -> pd.DataFrame:
+    """
+    Model × TC_Category composite accuracy (%) from the categorical codes:
+    one bincount over the flattened (model, category) code instead of a
+    hash groupby plus unstack. model_col is the Model category order, so the
+    Model codes are the row numbers; unobserved categories are dropped, as
+    unstack would.
+    """
+    model_codes = df["Model"].cat.codes.to_numpy()
+    cat_codes   = df["TC_Category"].cat.codes.to_numpy()
+    categories  = df["TC_Category"].cat.categories
+    n_m, n_c    = len(model_col), len(categories)
+
+    valid = (model_codes >= 0) & (cat_codes >= 0)
+    flat  = model_codes[valid].astype(np.intp) * n_c + cat_codes[valid]
+    comp  = df["Composite_Acc"].to_numpy(np.float64)[valid]
+
+    sums   = np.bincount(flat, weights=comp, minlength=n_m * n_c).reshape(n_m, n_c)
+    counts = np.bincount(flat, minlength=n_m * n_c).reshape(n_m, n_c)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts * 100
+
+    seen = counts.any(axis=0)
+    return pd.DataFrame(means[:, seen], index=model_col, columns=categories[seen])
+
+def _aggregate(df: pd.DataFrame, model_col: list):
+    """
+    Per-model means & latency std, the category pivot and the per-TC averages,
+    all from np.bincount over the categorical codes (model_col is the Model
+    category order) instead of hash groupbys. As with groupby().sum(), missing
+    values add nothing to a sum but the row still counts.
+    """
+    codes = df["Model"].cat.codes.to_numpy()
+    valid = codes >= 0
+    codes = codes[valid].astype(np.intp)
+    n_m   = len(model_col)
+
+    def _col(name):
+        return np.nan_to_num(df[name].to_numpy(np.float64)[valid])
+
+    n = np.bincount(codes, minlength=n_m).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mg = pd.DataFrame(
+            {key: np.bincount(codes, weights=_col(src), minlength=n_m) / n
+             for key, src in _VALUE_COLS.items()},
+            index=model_col,
+        )
+        total = _col("Total_Time_s")
+        var   = (np.bincount(codes, weights=total * total, minlength=n_m)
+                 - n * mg["avg_total_s"].to_numpy() ** 2) / (n - 1)
+    mg.insert(1, "std_total_s", np.sqrt(np.clip(var, 0, None)))
+
+    cat_pivot = _category_pivot(df, model_col)
+
+    tc_codes = df["TC_ID"].cat.codes.to_numpy()[valid]
+    has_tc   = tc_codes >= 0
+    n_t      = len(df["TC_ID"].cat.categories)
+    flat     = codes[has_tc] * n_t + tc_codes[has_tc]
+    tc_n     = np.bincount(flat, minlength=n_m * n_t)
+    tc_sum   = np.bincount(flat, weights=_col("Composite_Acc")[has_tc], minlength=n_m * n_t)
+    seen     = np.flatnonzero(tc_n)
+    tc_avg   = pd.DataFrame({
+        "Model":         pd.Categorical.from_codes(seen // n_t, dtype=df["Model"].dtype),
+        "TC_ID":         pd.Categorical.from_codes(seen % n_t, dtype=df["TC_ID"].dtype),
+        "Composite_Acc": tc_sum[seen] / tc_n[seen],
+    })
 
-    # Per-TC Average
-    tc_avg = (
-        df.groupby(["Model", "TC_ID"])["Composite_Acc"]
-        .mean()
-        .reset_index()
-    )
+    return mg, cat_pivot, tc_avg
 
-    # RNG for jitter consistency
-    rng = np.random.default_rng(42)
+# ──────────────────────────────────────────────────────────────────────────────
+# PLOTTING FUNCTIONS
+# ──────────────────────────────────────────────────────────────────────────────
 
-    # 1. Accuracy vs Latency Scatter
-    fig, ax = plt.subplots(figsize=(4.5, 3.5))
-    for model, row in mg.iterrows():
-        col = color_map[model]
-        ax.errorbar(
-            row["avg_total_s"], row["avg_composite"] * 100,
-            xerr=row["std_total_s"],
-            fmt=marker_map[model], color=col, markersize=9, alpha=0.8,
-            capsize=3, capthick=1.0, elinewidth=1.0,
-            label=_short(model), zorder=3,
-        )
-    ax.axhline(mg["avg_composite"].max() * 100, color="#aaaaaa", ls=":", lw=0.8, zorder=1)
-    ax.axvline(mg["avg_total_s"].min(),          color="#aaaaaa", ls=":", lw=0.8, zorder=1)
-    ax.set_xlabel("Average Total Latency (s)")
-    ax.set_ylabel("Composite Accuracy (%)")
-    ax.set_title("Accuracy vs. Latency")
-    ax.yaxis.set_major_locator(MultipleLocator(10))
-    ax.legend(loc="lower right", fontsize=8, framealpha=0.9)
+def _draw_acc_vs_latency(ax, model_col, lat, acc_pct, color_map, marker_map, compact=False):
+    xs, ys, xerr = lat["avg_total_s"], acc_pct["avg_composite"], lat["std_total_s"]
+    colors  = np.array([color_map[m] for m in model_col])
+    markers = np.array([marker_map[m] for m in model_col])
+    ms, cap, lw = (8, 2.5, 0.8) if compact else (9, 3, 1.0)
+
+    # All models in one errorbar call; errorbar() cannot colour caps per point,
+    # so caps are drawn as "|" markers, and the points as one scatter per shape.
+    ax.errorbar(xs, ys, xerr=xerr, fmt="none", ecolor=colors, elinewidth=lw,
+                capsize=0, alpha=0.8, zorder=3)
+    ax.scatter(np.concatenate([xs - xerr, xs + xerr]), np.concatenate([ys, ys]),
+               s=(2 * cap) ** 2, marker="|", c=np.concatenate([colors, colors]),
+               linewidths=lw, alpha=0.8, zorder=3)
+    for marker in dict.fromkeys(markers):
+        sel = markers == marker
+        ax.scatter(xs[sel], ys[sel], s=ms ** 2, marker=marker, c=colors[sel], alpha=0.8, zorder=3)
+    handles = [Line2D([], [], ls="none", marker=marker_map[m], color=color_map[m],
+                      markersize=ms, alpha=0.8, label=_short(m)) for m in model_col]
+
+    if compact:
+        ax.set_xlabel("Avg Latency (s)")
+        ax.set_ylabel("Composite Acc. (%)")
+        ax.yaxis.set_major_locator(MultipleLocator(20))
+        ax.legend(handles=handles, loc="lower right", fontsize=6, framealpha=0.9)
+    else:
+        ax.axhline(np.nanmax(acc_pct["avg_composite"]), color="#aaaaaa", ls=":", lw=0.8, zorder=1)
+        ax.axvline(np.nanmin(lat["avg_total_s"]),       color="#aaaaaa", ls=":", lw=0.8, zorder=1)
+        ax.set_xlabel("Average Total Latency (s)")
+        ax.set_ylabel("Composite Accuracy (%)")
+        ax.set_title("Accuracy vs. Latency")
+        ax.yaxis.set_major_locator(MultipleLocator(10))
+        ax.legend(handles=handles, loc="lower right", fontsize=8, framealpha=0.9)
     ax.set_ylim(0, 105)
     ax.set_xlim(left=0)
-    fig.tight_layout()
-    _savefig(fig, out_dir, "acc_vs_latency")
 
-    # 2. Latency Breakdown
-    fig, ax = plt.subplots(figsize=(max(3.5, len(labels) * 0.9 + 1.5), 3.5))
+def _draw_latency_breakdown(ax, lat, labels, compact=False):
     x      = np.arange(len(labels))
     bottom = np.zeros(len(labels))
     for stage_label, col_key, color in [
@@ -211,101 +389,136 @@ def generate_plots(df: pd.DataFrame, out_dir: str):
         ("Specialist", "avg_spec_s",   _STAGE_COLORS["Specialist"]),
         ("Summarizer", "avg_sum_s",    _STAGE_COLORS["Summarizer"]),
     ]:
-        vals = mg[col_key].values
-        ax.bar(x, vals, 0.55, bottom=bottom, label=stage_label,
-               color=color, edgecolor="white", linewidth=0.5, zorder=3)
+        vals = lat[col_key]
+        ax.bar(x, vals, 0.5 if compact else 0.55, bottom=bottom, label=stage_label,
+               color=color, edgecolor="white", linewidth=0.4 if compact else 0.5, zorder=3)
         bottom += vals
-    ax.errorbar(x, mg["avg_total_s"].values, yerr=mg["std_total_s"].values,
-                fmt="none", color="#333333", capsize=3, capthick=0.8, elinewidth=0.8, zorder=4)
     ax.set_xticks(x)
-    ax.set_xticklabels(labels, rotation=20, ha="right")
-    ax.set_ylabel("Latency (s)")
-    ax.set_title("Pipeline Latency Breakdown\nper Stage")
-    ax.legend(loc="upper right")
+    if compact:
+        ax.set_xticklabels(labels, rotation=22, ha="right", fontsize=7)
+        ax.set_ylabel("Latency (s)")
+        ax.legend(fontsize=6, loc="upper right")
+    else:
+        ax.errorbar(x, lat["avg_total_s"], yerr=lat["std_total_s"],
+                    fmt="none", color="#333333", capsize=3, capthick=0.8, elinewidth=0.8, zorder=4)
+        ax.set_xticklabels(labels, rotation=20, ha="right")
+        ax.set_ylabel("Latency (s)")
+        ax.set_title("Pipeline Latency Breakdown\nper Stage")
+        ax.legend(loc="upper right")
     ax.set_ylim(bottom=0)
-    fig.tight_layout()
-    _savefig(fig, out_dir, "latency_breakdown")
 
-    # 3. Accuracy Breakdown
-    fig, ax = plt.subplots(figsize=(max(3.5, len(labels) * 1.2 + 1.5), 3.5))
+def _draw_accuracy_breakdown(ax, acc_pct, labels, compact=False):
     x      = np.arange(len(labels))
     w      = 0.22
     offs   = np.array([-w, 0, w])
     for (lbl, key, hatch, color), offset in zip(_METRIC_STYLES, offs):
-        vals = mg[key].values * 100
-        bars = ax.bar(x + offset, vals, w, label=lbl, color=color, alpha=0.85,
-                      hatch=hatch, edgecolor="white", linewidth=0.4, zorder=3)
-        for bar, v in zip(bars, vals):
-            if v > 5:
-                ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 1,
-                        f"{v:.0f}", ha="center", va="bottom", fontsize=6.5)
+        vals = acc_pct[key]
+        xs   = x + offset
+        ax.bar(xs, vals, w, label=lbl, color=color, alpha=0.85,
+               hatch=hatch, edgecolor="white", linewidth=0.3 if compact else 0.4, zorder=3)
+        if compact:
+            continue
+        # Labels straight from the bar centres / heights, not the bar patches.
+        shown = vals > 5
+        for xi, v in zip(xs[shown], vals[shown]):
+            ax.text(xi, v + 1, f"{v:.0f}", ha="center", va="bottom", fontsize=6.5)
     ax.set_xticks(x)
-    ax.set_xticklabels(labels, rotation=20, ha="right")
-    ax.set_ylabel("Accuracy (%)")
-    ax.set_title("Accuracy by Component")
-    ax.set_ylim(0, 130)
-    ax.legend(loc="upper left", bbox_to_anchor=(0.0, 1.0))
-    ax.yaxis.set_major_locator(MultipleLocator(20))
-    ax.axhline(100, color="#cccccc", ls="--", lw=0.6, zorder=1)
-    fig.tight_layout()
-    _savefig(fig, out_dir, "accuracy_breakdown")
-
-    # 4. Category Heatmap
-    categories = cat_pivot.columns.tolist()
-    fig, ax = plt.subplots(figsize=(max(4, len(categories) * 0.9 + 1.5),
-                                    max(2.5, len(labels) * 0.6 + 1.0)))
-    im = ax.imshow(cat_pivot.values, aspect="auto", cmap="RdYlGn", vmin=0, vmax=100)
+    if compact:
+        ax.set_xticklabels(labels, rotation=22, ha="right", fontsize=7)
+        ax.set_ylabel("Accuracy (%)")
+        ax.set_ylim(0, 135)
+        ax.legend(fontsize=6, loc="upper right", bbox_to_anchor=(1.05, 1.0))
+        ax.axhline(100, color="#cccccc", ls="--", lw=0.5)
+        ax.yaxis.set_major_locator(MultipleLocator(25))
+    else:
+        ax.set_xticklabels(labels, rotation=20, ha="right")
+        ax.set_ylabel("Accuracy (%)")
+        ax.set_title("Accuracy by Component")
+        ax.set_ylim(0, 130)
+        ax.legend(loc="upper left", bbox_to_anchor=(0.0, 1.0))
+        ax.yaxis.set_major_locator(MultipleLocator(20))
+        ax.axhline(100, color="#cccccc", ls="--", lw=0.6, zorder=1)
+
+def _draw_category_heatmap(ax, heat, categories, labels, compact=False):
+    im = ax.imshow(heat, aspect="auto", cmap="RdYlGn", vmin=0, vmax=100, rasterized=True)
     ax.set_xticks(np.arange(len(categories)))
     ax.set_yticks(np.arange(len(labels)))
-    ax.set_xticklabels(categories, rotation=35, ha="right", fontsize=8)
-    ax.set_yticklabels(labels, fontsize=8)
+    ax.set_xticklabels(categories, rotation=28 if compact else 35, ha="right",
+                       fontsize=7 if compact else 8)
+    ax.set_yticklabels(labels, fontsize=7 if compact else 8)
     ax.tick_params(length=0)
     ax.spines[:].set_visible(False)
     for i in range(len(labels)):
         for j in range(len(categories)):
-            v = cat_pivot.values[i, j]
+            v = heat[i, j]
             if not np.isnan(v):
                 tc = "white" if v < 40 or v > 80 else "black"
                 ax.text(j, i, f"{v:.0f}", ha="center", va="center",
-                        fontsize=7.5, color=tc, fontweight="bold")
-    cbar = fig.colorbar(im, ax=ax, fraction=0.03, pad=0.02)
-    cbar.set_label("Composite Accuracy (%)", fontsize=8)
-    cbar.ax.tick_params(labelsize=7)
-    ax.set_title("Composite Accuracy by Model × Task Category")
-    fig.tight_layout()
-    _savefig(fig, out_dir, "category_heatmap")
-
-    # 5. Per TC Strip Plot
-    bp_data = [tc_avg[tc_avg["Model"] == m]["Composite_Acc"].values * 100 for m in model_col]
-    jitter_w = 0.12
-    fig, ax = plt.subplots(figsize=(max(4, len(labels) * 1.1 + 1), 3.5))
+                        fontsize=6.5 if compact else 7.5, color=tc, fontweight="bold")
+    cbar = ax.figure.colorbar(im, ax=ax, fraction=0.025 if compact else 0.03, pad=0.02)
+    cbar.set_label("Acc. (%)" if compact else "Composite Accuracy (%)", fontsize=7 if compact else 8)
+    cbar.ax.tick_params(labelsize=6 if compact else 7)
+    if not compact:
+        ax.set_title("Composite Accuracy by Model × Task Category")
+
+def _draw_per_tc_strip(ax, bp_data, jitters, model_col, labels, color_map, compact=False):
+    lw = 0.7 if compact else 0.8
     bp = ax.boxplot(bp_data, positions=np.arange(len(model_col)), widths=0.3,
                     patch_artist=True, showfliers=False,
-                    medianprops=dict(color="black", linewidth=1.5),
-                    whiskerprops=dict(linewidth=0.8),
-                    capprops=dict(linewidth=0.8),
-                    boxprops=dict(linewidth=0.8))
+                    medianprops=dict(color="black", linewidth=1.2 if compact else 1.5),
+                    whiskerprops=dict(linewidth=lw),
+                    capprops=dict(linewidth=lw),
+                    boxprops=dict(linewidth=lw))
     for patch, model in zip(bp["boxes"], model_col):
         patch.set_facecolor(color_map[model])
         patch.set_alpha(0.25)
-    # Use fresh draw from rng
-    for pos, model in zip(np.arange(len(model_col)), model_col):
-        vals   = tc_avg[tc_avg["Model"] == model]["Composite_Acc"].values * 100
-        jitter = rng.uniform(-jitter_w, jitter_w, len(vals))
-        ax.scatter(pos + jitter, vals, s=18, color=color_map[model],
-                   alpha=0.75, zorder=4, linewidths=0)
+    for pos, model, vals, jitter in zip(np.arange(len(model_col)), model_col, bp_data, jitters):
+        ax.scatter(pos + jitter, vals, s=14 if compact else 18, color=color_map[model],
+                   alpha=0.75, zorder=4, linewidths=0, rasterized=True)
     ax.set_xticks(np.arange(len(labels)))
-    ax.set_xticklabels(labels, rotation=20, ha="right")
-    ax.set_ylabel("Composite Accuracy (%) — per TC")
-    ax.set_title("Per-Question Accuracy Distribution")
+    if compact:
+        ax.set_xticklabels(labels, rotation=22, ha="right", fontsize=7)
+        ax.set_ylabel("Acc. (%) per TC")
+    else:
+        ax.set_xticklabels(labels, rotation=20, ha="right")
+        ax.set_ylabel("Composite Accuracy (%) — per TC")
+        ax.set_title("Per-Question Accuracy Distribution")
     ax.set_ylim(-5, 108)
-    ax.axhline(100, color="#cccccc", ls="--", lw=0.6)
-    ax.yaxis.set_major_locator(MultipleLocator(20))
+    ax.axhline(100, color="#cccccc", ls="--", lw=0.5 if compact else 0.6)
+    ax.yaxis.set_major_locator(MultipleLocator(25 if compact else 20))
+
+def _plot_acc_vs_latency(model_col, lat, acc_pct, color_map, marker_map, out_dir):
+    fig, ax = plt.subplots(figsize=(4.5, 3.5))
+    _draw_acc_vs_latency(ax, model_col, lat, acc_pct, color_map, marker_map)
+    fig.tight_layout()
+    _savefig(fig, out_dir, "acc_vs_latency")
+
+def _plot_latency_breakdown(lat, labels, out_dir):
+    fig, ax = plt.subplots(figsize=(max(3.5, len(labels) * 0.9 + 1.5), 3.5))
+    _draw_latency_breakdown(ax, lat, labels)
+    fig.tight_layout()
+    _savefig(fig, out_dir, "latency_breakdown")
+
+def _plot_accuracy_breakdown(acc_pct, labels, out_dir):
+    fig, ax = plt.subplots(figsize=(max(3.5, len(labels) * 1.2 + 1.5), 3.5))
+    _draw_accuracy_breakdown(ax, acc_pct, labels)
+    fig.tight_layout()
+    _savefig(fig, out_dir, "accuracy_breakdown")
+
+def _plot_category_heatmap(heat, categories, labels, out_dir):
+    fig, ax = plt.subplots(figsize=(max(4, len(categories) * 0.9 + 1.5),
+                                    max(2.5, len(labels) * 0.6 + 1.0)))
+    _draw_category_heatmap(ax, heat, categories, labels)
+    fig.tight_layout()
+    _savefig(fig, out_dir, "category_heatmap")
+
+def _plot_per_tc_strip(bp_data, jitters, model_col, labels, color_map, out_dir):
+    fig, ax = plt.subplots(figsize=(max(4, len(labels) * 1.1 + 1), 3.5))
+    _draw_per_tc_strip(ax, bp_data, jitters, model_col, labels, color_map)
     fig.tight_layout()
     _savefig(fig, out_dir, "per_tc_strip")
 
-    # 6. Latency Box Plot
-    lat_data = [df[df["Model"] == m]["Total_Time_s"].values for m in model_col]
+def _plot_latency_box(lat_data, model_col, labels, color_map, out_dir):
     fig, ax  = plt.subplots(figsize=(max(4, len(labels) * 1.1 + 1), 3.5))
     bp2 = ax.boxplot(lat_data, positions=np.arange(len(model_col)), widths=0.4,
                      patch_artist=True, showfliers=True,
@@ -325,7 +538,8 @@ def generate_plots(df: pd.DataFrame, out_dir: str):
     fig.tight_layout()
     _savefig(fig, out_dir, "latency_box")
 
-    # 7. Summary Panel (The Big One)
+def _plot_summary_panel(lat, acc_pct, heat, categories, bp_data, jitters, model_col, labels,
+                        color_map, marker_map, out_dir):
     fig = plt.figure(figsize=(10, 6.5))
     gs  = GridSpec(2, 3, figure=fig, hspace=0.52, wspace=0.38)
 
@@ -335,98 +549,11 @@ def generate_plots(df: pd.DataFrame, out_dir: str):
     ax_heatmap = fig.add_subplot(gs[1, 0:2])
     ax_strip   = fig.add_subplot(gs[1, 2])
 
-    # (a) Scatter
-    for model, row in mg.iterrows():
-        col = color_map[model]
-        ax_scatter.errorbar(
-            row["avg_total_s"], row["avg_composite"] * 100,
-            xerr=row["std_total_s"],
-            fmt=marker_map[model], color=col, markersize=8, alpha=0.8,
-            capsize=2.5, capthick=0.8, elinewidth=0.8,
-            label=_short(model), zorder=3,
-        )
-    ax_scatter.set_xlabel("Avg Latency (s)")
-    ax_scatter.set_ylabel("Composite Acc. (%)")
-    ax_scatter.set_ylim(0, 105)
-    ax_scatter.set_xlim(left=0)
-    ax_scatter.yaxis.set_major_locator(MultipleLocator(20))
-    ax_scatter.legend(loc="lower right", fontsize=6, framealpha=0.9)
-
-    # (b) Latency breakdown
-    x_b = np.arange(len(labels))
-    bot = np.zeros(len(labels))
-    for stage_label, col_key, color in [
-        ("Router",     "avg_router_s", _STAGE_COLORS["Router"]),
-        ("Specialist", "avg_spec_s",   _STAGE_COLORS["Specialist"]),
-        ("Summarizer", "avg_sum_s",    _STAGE_COLORS["Summarizer"]),
-    ]:
-        vals = mg[col_key].values
-        ax_lat_brk.bar(x_b, vals, 0.5, bottom=bot, label=stage_label,
-                       color=color, edgecolor="white", linewidth=0.4, zorder=3)
-        bot += vals
-    ax_lat_brk.set_xticks(x_b)
-    ax_lat_brk.set_xticklabels(labels, rotation=22, ha="right", fontsize=7)
-    ax_lat_brk.set_ylabel("Latency (s)")
-    ax_lat_brk.legend(fontsize=6, loc="upper right")
-    ax_lat_brk.set_ylim(bottom=0)
-
-    # (c) Accuracy breakdown
-    x_c  = np.arange(len(labels))
-    w_c  = 0.22
-    offs = np.array([-w_c, 0, w_c])
-    for (lbl, key, hatch, color), off in zip(_METRIC_STYLES, offs):
-        ax_acc_brk.bar(x_c + off, mg[key].values * 100, w_c, label=lbl,
-                       color=color, alpha=0.85, hatch=hatch,
-                       edgecolor="white", linewidth=0.3, zorder=3)
-    ax_acc_brk.set_xticks(x_c)
-    ax_acc_brk.set_xticklabels(labels, rotation=22, ha="right", fontsize=7)
-    ax_acc_brk.set_ylabel("Accuracy (%)")
-    ax_acc_brk.set_ylim(0, 135)
-    ax_acc_brk.legend(fontsize=6, loc="upper right", bbox_to_anchor=(1.05, 1.0))
-    ax_acc_brk.axhline(100, color="#cccccc", ls="--", lw=0.5)
-    ax_acc_brk.yaxis.set_major_locator(MultipleLocator(25))
-
-    # (d) Heatmap
-    im2 = ax_heatmap.imshow(cat_pivot.values, aspect="auto",
-                             cmap="RdYlGn", vmin=0, vmax=100)
-    ax_heatmap.set_xticks(np.arange(len(categories)))
-    ax_heatmap.set_yticks(np.arange(len(labels)))
-    ax_heatmap.set_xticklabels(categories, rotation=28, ha="right", fontsize=7)
-    ax_heatmap.set_yticklabels(labels, fontsize=7)
-    ax_heatmap.tick_params(length=0)
-    ax_heatmap.spines[:].set_visible(False)
-    for i in range(len(labels)):
-        for j in range(len(categories)):
-            v = cat_pivot.values[i, j]
-            if not np.isnan(v):
-                tc_c = "white" if v < 40 or v > 80 else "black"
-                ax_heatmap.text(j, i, f"{v:.0f}", ha="center", va="center",
-                                fontsize=6.5, color=tc_c, fontweight="bold")
-    cbar2 = fig.colorbar(im2, ax=ax_heatmap, fraction=0.025, pad=0.02)
-    cbar2.set_label("Acc. (%)", fontsize=7)
-    cbar2.ax.tick_params(labelsize=6)
-
-    # (e) Strip
-    bp3 = ax_strip.boxplot(bp_data, positions=np.arange(len(model_col)), widths=0.3,
-                           patch_artist=True, showfliers=False,
-                           medianprops=dict(color="black", linewidth=1.2),
-                           whiskerprops=dict(linewidth=0.7),
-                           capprops=dict(linewidth=0.7),
-                           boxprops=dict(linewidth=0.7))
-    for patch, model in zip(bp3["boxes"], model_col):
-        patch.set_facecolor(color_map[model])
-        patch.set_alpha(0.25)
-    for pos, model in zip(np.arange(len(model_col)), model_col):
-        vals   = tc_avg[tc_avg["Model"] == model]["Composite_Acc"].values * 100
-        jitter = rng.uniform(-jitter_w, jitter_w, len(vals))
-        ax_strip.scatter(pos + jitter, vals, s=14, color=color_map[model],
-                         alpha=0.75, zorder=4, linewidths=0)
-    ax_strip.set_xticks(np.arange(len(labels)))
-    ax_strip.set_xticklabels(labels, rotation=22, ha="right", fontsize=7)
-    ax_strip.set_ylabel("Acc. (%) per TC")
-    ax_strip.set_ylim(-5, 108)
-    ax_strip.axhline(100, color="#cccccc", ls="--", lw=0.5)
-    ax_strip.yaxis.set_major_locator(MultipleLocator(25))
+    _draw_acc_vs_latency(ax_scatter, model_col, lat, acc_pct, color_map, marker_map, compact=True)  # (a)
+    _draw_latency_breakdown(ax_lat_brk, lat, labels, compact=True)                                  # (b)
+    _draw_accuracy_breakdown(ax_acc_brk, acc_pct, labels, compact=True)                             # (c)
+    _draw_category_heatmap(ax_heatmap, heat, categories, labels, compact=True)                      # (d)
+    _draw_per_tc_strip(ax_strip, bp_data, jitters, model_col, labels, color_map, compact=True)      # (e)
 
     for ax_p, plabel in zip([ax_scatter, ax_lat_brk, ax_acc_brk, ax_heatmap, ax_strip],
                              ["(a)", "(b)", "(c)", "(d)", "(e)"]):
@@ -437,6 +564,78 @@ def generate_plots(df: pd.DataFrame, out_dir: str):
     fig.tight_layout()
     _savefig(fig, out_dir, "summary_panel")
 
+def generate_plots(df: pd.DataFrame, out_dir: str, jobs: int = 0, force: bool = False,
+                   fast: bool = False):
+    compress_level = 1 if fast else 6
+    _init_render(compress_level)
+
+    # Prepare Aggregations
+    model_col = df["Model"].cat.categories.tolist()
+    color_map = {m: _PALETTE[i % len(_PALETTE)] for i, m in enumerate(model_col)}
+    marker_map = {m: ["o", "s", "^", "D", "v", "p", "P", "*", "X"][i % 9] for i, m in enumerate(model_col)}
+    labels    = [_short(m) for m in model_col]
+
+    mg, cat_pivot, tc_avg = _aggregate(df, model_col)
+
+    # Plain ndarrays, materialised once and shared by every figure.
+    lat        = {k: mg[k].to_numpy() for k in ("avg_router_s", "avg_spec_s", "avg_sum_s",
+                                                 "avg_total_s", "std_total_s")}
+    acc_pct    = {k: mg[k].to_numpy() * 100 for k in ("avg_router_acc", "avg_fn_acc",
+                                                       "avg_param_acc", "avg_composite")}
+    heat       = cat_pivot.to_numpy()
+    categories = cat_pivot.columns.tolist()
+
+    # Row positions per model from one hash pass, instead of a full-column
+    # mask per model.
+    tc_idx   = tc_avg.groupby("Model", observed=True, sort=False).indices
+    row_idx  = df.groupby("Model", observed=True, sort=False).indices
+    comp     = tc_avg["Composite_Acc"].to_numpy() * 100
+    total    = df["Total_Time_s"].to_numpy()
+    bp_data  = [comp[tc_idx[m]] for m in model_col]
+    lat_data = [total[row_idx[m]] for m in model_col]
+
+    # Jitter is drawn here, in figure order, so the output does not depend on
+    # which worker renders which figure.
+    rng = np.random.default_rng(42)
+    jitter_w = 0.12
+    strip_jitter = [rng.uniform(-jitter_w, jitter_w, len(v)) for v in bp_data]
+    panel_jitter = [rng.uniform(-jitter_w, jitter_w, len(v)) for v in bp_data]
+
+    tasks = [
+        ("acc_vs_latency",     _plot_acc_vs_latency,     (model_col, lat, acc_pct, color_map, marker_map)),
+        ("latency_breakdown",  _plot_latency_breakdown,  (lat, labels)),
+        ("accuracy_breakdown", _plot_accuracy_breakdown, (acc_pct, labels)),
+        ("category_heatmap",   _plot_category_heatmap,   (heat, categories, labels)),
+        ("per_tc_strip",       _plot_per_tc_strip,       (bp_data, strip_jitter, model_col, labels, color_map)),
+        ("latency_box",        _plot_latency_box,        (lat_data, model_col, labels, color_map)),
+        ("summary_panel",      _plot_summary_panel,      (lat, acc_pct, heat, categories, bp_data, panel_jitter,
+                                                          model_col, labels, color_map, marker_map)),
+    ]
+
+    # Figures whose inputs (and plotting code) are unchanged since the last run
+    # are left as they are.
+    pending = []
+    for name, fn, args in tasks:
+        sig = _figure_signature(name, args, compress_level)
+        if not force and _read_signature(out_dir, name) == sig:
+            print(f"  [unchanged] {os.path.join(out_dir, name)}.png")
+            continue
+        pending.append((name, sig, fn, args + (out_dir,)))
+
+    # Every figure is an independent, CPU-bound Agg render: one process each.
+    workers = min(len(pending), jobs or os.cpu_count() or 1)
+    if workers <= 1:
+        for name, sig, fn, args in pending:
+            fn(*args)
+            _write_signature(out_dir, name, sig)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render,
+                             initargs=(compress_level,)) as pool:
+        futures = [(name, sig, pool.submit(fn, *args)) for name, sig, fn, args in pending]
+        for name, sig, fut in futures:
+            fut.result()
+            _write_signature(out_dir, name, sig)
+
 # ──────────────────────────────────────────────────────────────────────────────
 # MAIN
 # ──────────────────────────────────────────────────────────────────────────────
@@ -445,6 +644,10 @@ def main():
     parser = argparse.ArgumentParser(description="Generate plots from benchmark Excel results.")
     parser.add_argument("--input", default="my_results.xlsx", help="Path to input Excel file")
     parser.add_argument("--output", default="figures/", help="Directory to save plots")
+    parser.add_argument("--jobs", type=int, default=0, help="Figures rendered in parallel (default: one process per CPU, 1 = serial)")
+    parser.add_argument("--force", action="store_true", help="Redraw every figure, even if its inputs are unchanged")
+    parser.add_argument("--fast", action="store_true", help="Fast, lightly compressed PNGs for iterating on figures")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-read the Excel file (ignore the .feather cache)")
     args = parser.parse_args()
 
     if not os.path.exists(args.input):
@@ -453,8 +656,8 @@ def main():
 
     os.makedirs(args.output, exist_ok=True)
 
-    df = load_and_clean_data(args.input)
-    generate_plots(df, args.output)
+    df = load_and_clean_data(args.input) if args.no_cache else load_data_cached(args.input)
+    generate_plots(df, args.output, jobs=args.jobs, force=args.force, fast=args.fast)
     print(f"\nDone. Plots saved to: {args.output}")
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+"""
+Compile src/utils/categories.json into backend/utils/categories_map.py.
+
+categories.json stays the single source of truth (the frontend imports it
+directly); the backend imports the generated module instead, so startup skips
+the file read + JSON parse + key normalisation, and the mapping is available
+even where ../src is not shipped (e.g. the backend Docker image).
+
+Re-run after editing categories.json:
+    python backend/scripts/compile_categories.py
+"""
+
+import json
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_PATH = os.path.join(BACKEND_DIR, "..", "src", "utils", "categories.json")
+OUTPUT_PATH = os.path.join(BACKEND_DIR, "utils", "categories_map.py")
+
+HEADER = '''"""
+Category mapping (raw sub-category -> major category).
+
+GENERATED by backend/scripts/compile_categories.py from
+src/utils/categories.json -- do not edit by hand. Keys are pre-normalised
+(lower + strip), the same way request categories are.
+"""
+
+'''
+
+
+def main():
+    with open(SOURCE_PATH, "r", encoding="utf-8") as f:
+        categories_data = json.load(f)
+
+    mapping = {k.lower().strip(): v for k, v in categories_data.get("CATEGORY_MAPPING", {}).items()}
+
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        f.write("CATEGORY_MAPPING = {\n")
+        for key, value in mapping.items():
+            f.write(f"    {key!r}: {value!r},\n")
+        f.write("}\n")
+
+    print(f"Wrote {len(mapping)} categories to {os.path.relpath(OUTPUT_PATH)}")
+
+
+if __name__ == "__main__":
+    main()
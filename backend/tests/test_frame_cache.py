@@ -0,0 +1,66 @@
+import pandas as pd
+
+from utils.frame_cache import FrameLRU
+from utils.llm_input_validation import get_metadata_lists
+
+
+def make_frame():
+    return pd.DataFrame({
+        'category': ['cafe', 'Gym'],
+        'major category': ['Food', 'Fitness'],
+        'Expense': [500, 8000],
+    })
+
+
+def test_hit_for_same_frame_and_key():
+    cache = FrameLRU(4, columns=('category',))
+    df = make_frame()
+    cache.put(df, 'value', key='k')
+    assert cache.get(df, key='k') == 'value'
+    assert cache.get(df, key='other') is None
+    assert cache.get(make_frame(), key='k') is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = FrameLRU(2)
+    frames = [make_frame() for _ in range(3)]
+    cache.put(frames[0], 0)
+    cache.put(frames[1], 1)
+    assert cache.get(frames[0]) == 0
+    cache.put(frames[2], 2)
+    assert cache.get(frames[0]) == 0
+    assert cache.get(frames[1]) is None
+    assert cache.get(frames[2]) == 2
+
+
+def test_row_count_change_invalidates():
+    cache = FrameLRU(4)
+    df = make_frame()
+    cache.put(df, 'value')
+    df.loc[len(df)] = ['taxi', 'Transportation', 1200]
+    assert cache.get(df) is None
+
+
+def test_reassigned_column_invalidates():
+    cache = FrameLRU(4, columns=('category',))
+    df = make_frame()
+    cache.put(df, 'value')
+    df['Expense'] = [1, 2]
+    assert cache.get(df) == 'value'
+    df['category'] = ['bakery', 'Gym']
+    assert cache.get(df) is None
+
+
+def test_metadata_lists_follow_category_edits():
+    df = make_frame()
+    assert 'cafe' in get_metadata_lists(df)[0]
+    assert get_metadata_lists(df) is get_metadata_lists(df)
+
+    df['category'] = ['bakery', 'Gym']
+    category_lookup, _ = get_metadata_lists(df)
+    assert 'bakery' in category_lookup and 'cafe' not in category_lookup
+
+    df.loc[len(df)] = ['taxi', 'Transportation', 1200]
+    category_lookup, major_lookup = get_metadata_lists(df)
+    assert 'taxi' in category_lookup
+    assert major_lookup['transportation'] == 'Transportation'
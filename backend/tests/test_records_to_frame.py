@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+# main pulls in the serving stack (fastapi, ollama, mlx-lm)
+main = pytest.importorskip("main")
+
+
+def test_oversized_int_falls_back_to_pandas():
+    rows = [{'Date': '2024-01-01', 'Expense': 10**20, 'category': 'Food'}]
+    df = main.records_to_frame(rows)
+    expected = pd.DataFrame(rows)
+    assert list(df.columns) == list(expected.columns)
+    assert df['Expense'].iloc[0] == 10**20
+
+
+def test_ragged_rows_fall_back_to_pandas():
+    rows = [
+        {'Date': '2024-01-01', 'Expense': 100, 'category': 'Food'},
+        {'Date': '2024-01-02', 'Expense': 200, 'category': 'Gym', 'remarks': 'monthly'},
+    ]
+    df = main.records_to_frame(rows)
+    assert len(df) == 2
+    assert set(df.columns) == {'Date', 'Expense', 'category', 'remarks'}
+    assert pd.isna(df['remarks'].iloc[0])
+    assert df['remarks'].iloc[1] == 'monthly'
+
+
+def test_uniform_rows_keep_numeric_columns():
+    rows = [
+        {'Date': '2024-01-01', 'Expense': 100, 'category': 'Food'},
+        {'Date': '2024-01-02', 'Expense': 250, 'category': 'Gym'},
+    ]
+    df = main.records_to_frame(rows)
+    assert df['Expense'].tolist() == [100, 250]
+    assert pd.api.types.is_integer_dtype(df['Expense'])
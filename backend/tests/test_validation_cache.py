@@ -0,0 +1,50 @@
+import pandas as pd
+
+from utils.analysis_tools import cached_validate_and_fix_params, validation_cache
+from utils.llm_input_validation import metadata_cache
+
+
+def make_frame():
+    return pd.DataFrame({
+        'category': ['cafe', 'Gym'],
+        'major category': ['Food', 'Fitness'],
+        'Expense': [500, 8000],
+    })
+
+
+def test_repeated_params_return_independent_copies():
+    df = make_frame()
+    first, _ = cached_validate_and_fix_params({'category': 'Cafe'}, df)
+    first['year'] = 2024
+    second, warning = cached_validate_and_fix_params({'category': 'Cafe'}, df)
+    assert second == {'category': 'cafe'}
+    assert warning == "Corrected 'Cafe' to category 'cafe'"
+
+
+def test_reassigned_category_column_is_revalidated():
+    df = make_frame()
+    assert cached_validate_and_fix_params({'category': 'cafe'}, df)[0] == {'category': 'cafe'}
+
+    df['category'] = ['bakery', 'Gym']
+    params, warning = cached_validate_and_fix_params({'category': 'cafe'}, df)
+    assert params == {'remarks': 'cafe'}
+    assert 'Searching in remarks' in warning
+
+
+def test_appended_rows_are_revalidated():
+    df = make_frame()
+    assert 'remarks' in cached_validate_and_fix_params({'category': 'taxi'}, df)[0]
+
+    df.loc[len(df)] = ['taxi', 'Transportation', 1200]
+    assert cached_validate_and_fix_params({'category': 'taxi'}, df)[0] == {'category': 'taxi'}
+
+
+def test_in_place_edit_needs_explicit_clear():
+    # Element edits keep the column's backing array, so the caches cannot see them
+    df = make_frame()
+    assert cached_validate_and_fix_params({'category': 'bakery'}, df)[0] == {'remarks': 'bakery'}
+
+    df.loc[0, 'category'] = 'bakery'
+    validation_cache.clear()
+    metadata_cache.clear()
+    assert cached_validate_and_fix_params({'category': 'bakery'}, df)[0] == {'category': 'bakery'}
@@ -5,7 +5,8 @@ import numpy as np
 from plotly.subplots import make_subplots
 from scipy import stats
 import functools
-from utils.llm_input_validation import validate_and_fix_params
+from utils.frame_cache import FrameLRU
+from utils.llm_input_validation import METADATA_COLUMNS, validate_and_fix_params
 import logging
 
 
@@ -39,6 +40,9 @@ CATEGORY_COLORS = {
     'Electronics and Furniture': '#6d28d9', # Violet-700
 }
 
+# Traces are built from kwargs fixed in this module, so they are constructed with
+# _validate=False: plotly skips its per-property schema validation (~10x faster per trace).
+
 # --- LOCALIZATION ---
 TRANSLATIONS = {
     'en': {
@@ -147,29 +151,118 @@ def get_shared_layout(title_text, lang='en'):
         autosize=True
     )
 
+# Derived columns the tool filters compare against (see ensure_tool_columns)
+DATE_PART_COLUMNS = ('_year', '_month', '_ymd')
+CATEGORY_KEY_COLUMNS = {'category': '_category_key', 'major category': '_major_key'}
+
+# Diverse color palette for subcategory slices (avoiding similar blues/purples)
+SUBCATEGORY_COLORS = (
+    '#818cf8',  # Indigo-400
+    '#f472b6',  # Pink-400
+    '#fb923c',  # Orange-400
+    '#34d399',  # Emerald-400
+    '#60a5fa',  # Blue-400
+    '#a78bfa',  # Violet-400
+    '#fbbf24',  # Amber-400
+    '#2dd4bf',  # Teal-400
+    '#c084fc',  # Purple-400
+    '#f87171',  # Red-400
+    '#4ade80',  # Green-400
+    '#38bdf8',  # Sky-400
+)
+
 def generate_subcategory_colors(labels, base_color=None):
     """
     Generate visually distinct colors for subcategories.
     Uses a color palette that varies in hue, saturation, and lightness.
     """
-    # Diverse color palette (avoiding similar blues/purples)
-    distinct_colors = [
-        '#818cf8',  # Indigo-400
-        '#f472b6',  # Pink-400
-        '#fb923c',  # Orange-400
-        '#34d399',  # Emerald-400
-        '#60a5fa',  # Blue-400
-        '#a78bfa',  # Violet-400
-        '#fbbf24',  # Amber-400
-        '#2dd4bf',  # Teal-400
-        '#c084fc',  # Purple-400
-        '#f87171',  # Red-400
-        '#4ade80',  # Green-400
-        '#38bdf8',  # Sky-400
-    ]
-    
-    # Return colors cycling through the palette
-    return [distinct_colors[i % len(distinct_colors)] for i in range(len(labels))]
+    # Cycle through the palette by repeating it and slicing, no per-label indexing
+    n = len(labels)
+    return list((SUBCATEGORY_COLORS * (n // len(SUBCATEGORY_COLORS) + 1))[:n])
+
+def rolling_mean(values, window):
+    """
+    Trailing moving average with min_periods=1 semantics (the first window-1 points average
+    what is available), computed from one cumulative sum instead of a pandas Rolling object.
+    """
+    values = np.asarray(values, dtype=float)
+    csum = np.cumsum(values)
+    csum[window:] = csum[window:] - csum[:-window]
+    return csum / np.minimum(np.arange(1, len(values) + 1), window)
+
+def match_remarks(data, remarks, mask):
+    """
+    Narrows the boolean row `mask` to rows whose remarks contain `remarks` (case-insensitive,
+    e.g. "Starbucks" matches "Starbucks Coffee"). The string search only runs on the rows
+    the mask still keeps, and not at all once it is empty.
+
+    `remarks` is a plain substring, not a regex: both sides are lowercased and compared
+    with a literal search, so terms like "C++" or "(gift)" match as written.
+    """
+    hit = pd.Series(False, index=data.index)
+    if mask.any():
+        hit[mask] = data.loc[mask, 'remarks'].str.lower().str.contains(remarks.lower(), regex=False, na=False)
+    return hit
+
+def ensure_date_columns(df):
+    """
+    Returns df with a datetime64 'Date' column plus the calendar parts the time filters
+    compare against: '_year' (int16), '_month' (int8) and '_ymd' (Date at midnight).
+    Missing dates get year/month 0, which no filter matches.
+
+    build_dataframe() adds these once at ingestion (via ensure_tool_columns), so this is
+    normally the same object (no copy, no re-parse); otherwise a shallow copy with the
+    columns added is returned and the caller's frame is untouched.
+    """
+    if 'Date' not in df.columns:
+        return df
+    if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        df = df.assign(Date=pd.to_datetime(df['Date']))
+    elif all(c in df.columns for c in DATE_PART_COLUMNS):
+        return df
+    dates = df['Date']
+    return df.assign(
+        _year=dates.dt.year.fillna(0).astype('int16'),
+        _month=dates.dt.month.fillna(0).astype('int8'),
+        _ymd=dates.dt.normalize(),
+    )
+
+def ensure_category_keys(df):
+    """
+    Returns df with lowercase categorical copies of 'category' and 'major category'
+    ('_category_key', '_major_key'), so case-insensitive filters compare category codes
+    instead of lowercasing every row per call. Display columns keep their original case.
+    """
+    missing = {key: df[col].str.lower().astype('category')
+               for col, key in CATEGORY_KEY_COLUMNS.items()
+               if col in df.columns and key not in df.columns}
+    return df.assign(**missing) if missing else df
+
+def ensure_tool_columns(df):
+    """Returns df with every derived column the tools filter on; see the two helpers above."""
+    return ensure_category_keys(ensure_date_columns(df))
+
+# validate_and_fix_params() results per (frame, params). This sits on top of the per-frame
+# category lookups cached by get_metadata_lists(): this layer skips the difflib matching
+# for a repeated (frame, params) pair, while the inner one still saves the category scan
+# when the same frame is validated with different params.
+VALIDATION_CACHE_SIZE = 128
+validation_cache = FrameLRU(VALIDATION_CACHE_SIZE, columns=METADATA_COLUMNS)
+
+def cached_validate_and_fix_params(params, df):
+    """validate_and_fix_params() memoized per (df, params); unhashable params are not cached."""
+    try:
+        key = tuple(sorted(params.items()))
+        hash(key)
+    except TypeError:
+        return validate_and_fix_params(params, df)
+
+    entry = validation_cache.get(df, key)
+    if entry is None:
+        entry = validate_and_fix_params(params, df)
+        validation_cache.put(df, entry, key)
+    cleaned_params, warning = entry
+    return dict(cleaned_params), warning
 
 def auto_validate(func):
     """
@@ -179,7 +272,7 @@ def auto_validate(func):
     @functools.wraps(func)
     def wrapper(df, *args, **kwargs):
         # 1. Run the validation logic
-        cleaned_params, warning = validate_and_fix_params(kwargs, df)
+        cleaned_params, warning = cached_validate_and_fix_params(kwargs, df)
         
         # 2. Call the original function with the CLEANED parameters
         # We pass *args just in case, but usually tools use kwargs
@@ -212,56 +305,60 @@ def plot_time_series(df, category=None, major_category=None, remarks=None, year=
     Category filters (use ONE):
     - category: specific category (e.g., 'futsal game') OR broad category (e.g., 'Food')
     """
-    data = df.copy()
-    if 'Date' in data.columns:
-        data['Date'] = pd.to_datetime(data['Date'])
+    data = ensure_tool_columns(df)
     
     # Determine intended date range
     range_start = None
     range_end = None
     now = pd.Timestamp.now()
     
-    # Time filtering
+    # Time filtering (row masks are combined and applied once below)
+    mask = pd.Series(True, index=data.index)
     if year and month:
         start_date = pd.Timestamp(year=int(year), month=int(month), day=1)
         end_date = start_date + pd.offsets.MonthEnd(0)
-        data = data[(data['Date'].dt.year == int(year)) & (data['Date'].dt.month == int(month))]
+        mask = (data['_year'] == int(year)) & (data['_month'] == int(month))
         range_start, range_end = start_date, end_date
     elif year:
         start_date = pd.Timestamp(year=int(year), month=1, day=1)
         end_date = pd.Timestamp(year=int(year), month=12, day=31)
-        data = data[data['Date'].dt.year == int(year)]
+        mask = data['_year'] == int(year)
         range_start, range_end = start_date, end_date
     elif start_year and end_year:
         start_date = pd.Timestamp(year=int(start_year), month=1, day=1)
         end_date = pd.Timestamp(year=int(end_year), month=12, day=31)
-        data = data[(data['Date'].dt.year >= int(start_year)) & (data['Date'].dt.year <= int(end_year))]
+        mask = (data['_year'] >= int(start_year)) & (data['_year'] <= int(end_year))
         range_start, range_end = start_date, end_date
     elif months:
         cutoff = now - pd.DateOffset(months=int(months))
-        data = data[data['Date'] >= cutoff]
+        mask = data['Date'] >= cutoff
         range_start, range_end = cutoff, now
     
     # Category filtering
     if category:
-        data = data[data['category'].str.lower() == category.lower()]
+        mask &= data['_category_key'] == category.lower()
         label = category
     elif major_category:
-        data = data[data['major category'].str.lower() == major_category.lower()]
+        mask &= data['_major_key'] == major_category.lower()
         label = major_category
     elif remarks:
         # enable partial matching (e.g. "Starbucks" matches "Starbucks Coffee")
-        data = data[data['remarks'].str.contains(remarks, case=False, na=False)]
+        mask = match_remarks(data, remarks, mask)
         label = f"'{remarks}'"
     else:
         label = t('total', lang)
     
+    if not mask.all():
+        data = data[mask]
+    
     if data.empty:
         if lang == 'ja':
             return None, f"{label}のデータが指定された期間で見つかりませんでした。"
         return None, f"No spending data found for {label} in the specified period."
     
-    data = data.sort_values('Date')
+    # Expense logs usually arrive in date order; the monotonic check is a single pass
+    if not data['Date'].is_monotonic_increasing:
+        data = data.sort_values('Date', kind='stable')
     
     # IMPROVED: Decide visualization strategy based on data characteristics
     eff_start = range_start if range_start else data['Date'].min()
@@ -275,10 +372,12 @@ def plot_time_series(df, category=None, major_category=None, remarks=None, year=
     max_transaction = data['Expense'].max()
     
     fig = go.Figure()
+    traces = []  # added in one call below
     
     # Strategy 1: Few transactions over long period (< 100 transactions) -> Bar chart
     if num_transactions < 100:
-        fig.add_trace(go.Bar(
+        traces.append(go.Bar(
+            _validate=False,
             x=data['Date'],
             y=data['Expense'],
             name='Transaction',
@@ -309,9 +408,10 @@ def plot_time_series(df, category=None, major_category=None, remarks=None, year=
     # Strategy 2: Many transactions -> Weekly aggregation with line + area
     elif date_range_days > 90:  # More than 3 months
         # Aggregate by week
-        data['Week'] = data['Date'].dt.to_period('W').apply(lambda r: r.start_time)
-        weekly = data.groupby('Week')['Expense'].agg(['sum', 'count']).reset_index()
-        weekly['Week'] = pd.to_datetime(weekly['Week'])
+        # Week start (Monday 00:00) by date arithmetic, same as to_period('W').start_time
+        # (kept as a separate key: `data` may be the caller's frame when no sort was needed)
+        week = (data['_ymd'] - pd.to_timedelta(data['Date'].dt.dayofweek, unit='D')).rename('Week')
+        weekly = data['Expense'].groupby(week).agg(['sum', 'count']).reset_index()
         
         if pd.notnull(eff_start) and pd.notnull(eff_end):
             idx_start = pd.Period(eff_start, freq='W').start_time
@@ -322,7 +422,8 @@ def plot_time_series(df, category=None, major_category=None, remarks=None, year=
 
         
         # Main line with area fill
-        fig.add_trace(go.Scatter(
+        traces.append(go.Scatter(
+            _validate=False,
             x=weekly['Week'],
             y=weekly['sum'],
             mode='lines',
@@ -336,8 +437,9 @@ def plot_time_series(df, category=None, major_category=None, remarks=None, year=
         
         # 4-week moving average for trend
         if len(weekly) >= 4:
-            weekly['MA4'] = weekly['sum'].rolling(window=4, min_periods=1).mean()
-            fig.add_trace(go.Scatter(
+            weekly['MA4'] = rolling_mean(weekly['sum'], 4)
+            traces.append(go.Scatter(
+                _validate=False,
                 x=weekly['Week'],
                 y=weekly['MA4'],
                 mode='lines',
@@ -348,10 +450,10 @@ def plot_time_series(df, category=None, major_category=None, remarks=None, year=
         
     # Strategy 3: Medium-term data (1-3 months) -> Daily with smoothing
     else:
-        # Aggregate by day (in case multiple transactions per day)
-        daily = data.groupby(data['Date'].dt.date)['Expense'].agg(['sum', 'count']).reset_index()
+        # Aggregate by day (in case multiple transactions per day); '_ymd' is the
+        # datetime64 day, so this groups on int64 keys rather than datetime.date objects
+        daily = data.groupby('_ymd')['Expense'].agg(['sum', 'count']).reset_index()
         daily.columns = ['Date', 'Expense', 'count']
-        daily['Date'] = pd.to_datetime(daily['Date'])
         
         if pd.notnull(eff_start) and pd.notnull(eff_end):
             all_days = pd.date_range(start=eff_start.normalize(), end=eff_end.normalize(), freq='D')
@@ -360,7 +462,8 @@ def plot_time_series(df, category=None, major_category=None, remarks=None, year=
 
         
         # Line with markers for actual data points
-        fig.add_trace(go.Scatter(
+        traces.append(go.Scatter(
+            _validate=False,
             x=daily['Date'],
             y=daily['Expense'],
             mode='lines+markers',
@@ -375,8 +478,9 @@ def plot_time_series(df, category=None, major_category=None, remarks=None, year=
         
         # 7-day moving average
         if len(daily) >= 7:
-            daily['MA7'] = daily['Expense'].rolling(window=7, min_periods=1).mean()
-            fig.add_trace(go.Scatter(
+            daily['MA7'] = rolling_mean(daily['Expense'], 7)
+            traces.append(go.Scatter(
+                _validate=False,
                 x=daily['Date'],
                 y=daily['MA7'],
                 mode='lines',
@@ -385,6 +489,8 @@ def plot_time_series(df, category=None, major_category=None, remarks=None, year=
                 hovertemplate='<b>%{x|%Y-%m-%d}</b><br>Avg: ¥%{y:,.0f}<extra></extra>'
             ))
     
+    fig.add_traces(traces)
+    
     fig.update_layout(
         **get_shared_layout(title or f"{label} {t('spending_over_time', lang)}", lang),
         xaxis_title=t('date', lang),
@@ -418,15 +524,15 @@ def plot_distribution(df, year=None, month=None, major_category=None, category=N
     - year: entire year
     - (none): all time
     """
-    data = df.copy()
-    data['Date'] = pd.to_datetime(data['Date'])
+    data = ensure_tool_columns(df)
     
-    # Time filtering
+    # Time filtering (row masks are combined and applied once below)
+    mask = pd.Series(True, index=data.index)
     if year and month:
-        data = data[(data['Date'].dt.year == int(year)) & (data['Date'].dt.month == int(month))]
+        mask = (data['_year'] == int(year)) & (data['_month'] == int(month))
         time_label = f"{year}-{month:02d}"
     elif year:
-        data = data[data['Date'].dt.year == int(year)]
+        mask = data['_year'] == int(year)
         time_label = str(year)
     else:
         time_label = "全期間" if lang == 'ja' else "All Time"
@@ -434,7 +540,7 @@ def plot_distribution(df, year=None, month=None, major_category=None, category=N
     # Category filtering and determine grouping logic
     if remarks:
         # Filter by remarks and show category distribution
-        data = data[data['remarks'].str.contains(remarks, case=False, na=False)]
+        mask = match_remarks(data, remarks, mask)
         group_by = 'category'
         if lang == 'ja':
             default_title = f"'{remarks}' のカテゴリー内訳 - {time_label}"
@@ -444,10 +550,10 @@ def plot_distribution(df, year=None, month=None, major_category=None, category=N
             filter_label = f"remarks containing '{remarks}'"
     elif category:
         # Filter by specific category and show breakdown by remarks or subcategory
-        data = data[data['category'].str.lower() == category.lower()]
+        mask &= data['_category_key'] == category.lower()
         # For specific categories, show individual transaction remarks if available
         # Otherwise fall back to just showing the category itself
-        if data['remarks'].notna().any():
+        if data.loc[mask, 'remarks'].notna().any():
             group_by = 'remarks'
             if lang == 'ja':
                 default_title = f"{category} の取引詳細 - {time_label}"
@@ -462,7 +568,7 @@ def plot_distribution(df, year=None, month=None, major_category=None, category=N
         filter_label = f"カテゴリー '{category}'" if lang == 'ja' else f"category '{category}'"
     elif major_category:
         # Filter by major category and show sub-categories
-        data = data[data['major category'].str.lower() == major_category.lower()]
+        mask &= data['_major_key'] == major_category.lower()
         group_by = 'category'
         if lang == 'ja':
             default_title = f"{major_category} の内訳 - {time_label}"
@@ -480,57 +586,50 @@ def plot_distribution(df, year=None, month=None, major_category=None, category=N
             default_title = f"Spending Distribution - {time_label}"
             filter_label = "all expenses"
     
+    if not mask.all():
+        data = data[mask]
+    
     if data.empty:
         if lang == 'ja':
             return None, f"{time_label}の{filter_label}に関するデータが見つかりませんでした。"
         return None, f"No data found for {filter_label} in {time_label}."
     
-    # Group and sort
-    grouped = data.groupby(group_by)['Expense'].sum().reset_index()
-    grouped = grouped.sort_values('Expense', ascending=False)
+    # Group and sort; the pie only needs parallel label/value arrays
+    grouped = data.groupby(group_by)['Expense'].sum().sort_values(ascending=False)
+    labels = grouped.index.to_numpy()
+    values = grouped.to_numpy()
     
     # IMPROVED: Combine small categories into "Others"
-    total = grouped['Expense'].sum()
+    total = values.sum()
     threshold = total * 0.03  # Categories less than 3% go into "Others"
     
-    if group_by == 'remarks' and len(grouped) > 10:
+    if group_by == 'remarks' and len(values) > 10:
         # For remarks, limit to top 10
-        top_items = grouped.head(10)
-        others_sum = grouped.tail(len(grouped) - 10)['Expense'].sum()
+        others_sum = values[10:].sum()
+        labels, values = labels[:10], values[:10]
         if others_sum > 0:
-            others_row = pd.DataFrame({group_by: [t('others', lang)], 'Expense': [others_sum]})
-            grouped = pd.concat([top_items, others_row], ignore_index=True)
-        else:
-            grouped = top_items
-    elif len(grouped) > 12:
+            labels = np.append(labels, t('others', lang))
+            values = np.append(values, others_sum)
+    elif len(values) > 12:
         # For categories, group small ones into "Others"
-        main_items = grouped[grouped['Expense'] >= threshold]
-        small_items = grouped[grouped['Expense'] < threshold]
-        if len(small_items) > 0:
-            others_sum = small_items['Expense'].sum()
-            others_row = pd.DataFrame({group_by: [t('others', lang)], 'Expense': [others_sum]})
-            grouped = pd.concat([main_items, others_row], ignore_index=True)
-    
-    # Calculate percentages
-    grouped['Percentage'] = (grouped['Expense'] / total * 100).round(1)
-    
-    # IMPROVED: Custom text showing both label and amount
-    custom_text = [f"{row[group_by]}<br>¥{row['Expense']:,.0f}" 
-                   for _, row in grouped.iterrows()]
+        small = values < threshold
+        if small.any():
+            labels = np.append(labels[~small], t('others', lang))
+            values = np.append(values[~small], values[small].sum())
     
     # Determine colors: use major category colors for major categories, 
     # generate distinct colors for subcategories/remarks
     if group_by == 'major category':
         # Use defined major category colors
-        slice_colors = [CATEGORY_COLORS.get(label, THEME['primary']) for label in grouped[group_by]]
+        slice_colors = [CATEGORY_COLORS.get(label, THEME['primary']) for label in labels]
     else:
         # Generate distinct colors for subcategories or remarks
-        slice_colors = generate_subcategory_colors(grouped[group_by].tolist())
+        slice_colors = generate_subcategory_colors(labels)
     
     fig = go.Figure(data=[go.Pie(
-        labels=grouped[group_by],
-        values=grouped['Expense'],
-        text=custom_text,
+        _validate=False,
+        labels=labels,
+        values=values,
         textposition='inside',
         textinfo='percent',  # Show only percentage inside
         insidetextorientation='radial',
@@ -557,11 +656,11 @@ def plot_distribution(df, year=None, month=None, major_category=None, category=N
     fig.update_layout(**layout, showlegend=True)
     
     # Add a slight pull to the largest slice if it's significant
-    if not grouped.empty and grouped.iloc[0]['Percentage'] > 30:
-        pulls = [0.05 if i == 0 else 0 for i in range(len(grouped))]
+    if values.size and total and round(values[0] / total * 100, 1) > 30:
+        pulls = [0.05 if i == 0 else 0 for i in range(len(values))]
         fig.update_traces(pull=pulls)
     
-    msg = f"{t('distribution', lang)} for {filter_label}: ¥{total:,.0f} (n={len(data)} across {len(grouped)} items)"
+    msg = f"{t('distribution', lang)} for {filter_label}: ¥{total:,.0f} (n={len(data)} across {len(values)} items)"
     
     return fig, msg
 
@@ -587,93 +686,95 @@ def plot_comparison_bars(df, category=None, major_category=None, remarks=None,
     
     NOTE: Regardless of parameter order, the earlier period is always shown first
     """
-    data = df.copy()
-    data['Date'] = pd.to_datetime(data['Date'])
+    data = ensure_tool_columns(df)
     
     # Determine comparison type and ensure chronological order
+    # (each period is a row mask; the rows are only sliced once filtering is done)
     if d1 and d2:
         # Specific date comparison
         date1 = pd.Timestamp(year=int(y1), month=int(m1), day=int(d1))
         date2 = pd.Timestamp(year=int(y2), month=int(m2), day=int(d2))
-        data1 = data[data['Date'].dt.date == date1.date()]
-        data2 = data[data['Date'].dt.date == date2.date()]
+        mask1 = data['_ymd'] == date1
+        mask2 = data['_ymd'] == date2
         period1 = date1.strftime('%Y-%m-%d')
         period2 = date2.strftime('%Y-%m-%d')
         
         # Swap if date2 is earlier than date1
         if date2 < date1:
-            data1, data2 = data2, data1
+            mask1, mask2 = mask2, mask1
             period1, period2 = period2, period1
             
     elif m1 and m2:
         # Month comparison
         date1 = pd.Timestamp(year=int(y1), month=int(m1), day=1)
         date2 = pd.Timestamp(year=int(y2), month=int(m2), day=1)
-        data1 = data[(data['Date'].dt.year == int(y1)) & (data['Date'].dt.month == int(m1))]
-        data2 = data[(data['Date'].dt.year == int(y2)) & (data['Date'].dt.month == int(m2))]
+        mask1 = (data['_year'] == int(y1)) & (data['_month'] == int(m1))
+        mask2 = (data['_year'] == int(y2)) & (data['_month'] == int(m2))
         period1 = f"{y1}-{m1:02d}"
         period2 = f"{y2}-{m2:02d}"
         
         # Swap if date2 is earlier than date1
         if date2 < date1:
-            data1, data2 = data2, data1
+            mask1, mask2 = mask2, mask1
             period1, period2 = period2, period1
             
     else:
         # Year comparison
-        data1 = data[data['Date'].dt.year == int(y1)]
-        data2 = data[data['Date'].dt.year == int(y2)]
+        mask1 = data['_year'] == int(y1)
+        mask2 = data['_year'] == int(y2)
         period1 = str(y1)
         period2 = str(y2)
         
         # Swap if y2 is earlier than y1
         if int(y2) < int(y1):
-            data1, data2 = data2, data1
+            mask1, mask2 = mask2, mask1
             period1, period2 = period2, period1
 
     
-    # Category filtering
+    # Category filtering: one mask shared by both periods
     if category:
-        data1 = data1[data1['category'].str.lower() == category.lower()]
-        data2 = data2[data2['category'].str.lower() == category.lower()]
+        keep = data['_category_key'] == category.lower()
         group_by = 'category'
         label = category
     elif major_category:
-        data1 = data1[data1['major category'].str.lower() == major_category.lower()]
-        data2 = data2[data2['major category'].str.lower() == major_category.lower()]
+        keep = data['_major_key'] == major_category.lower()
         group_by = 'category'
         label = major_category
     elif remarks:
-        data1 = data1[data1['remarks'].str.contains(remarks, case=False, na=False)]
-        data2 = data2[data2['remarks'].str.contains(remarks, case=False, na=False)]
+        keep = match_remarks(data, remarks, mask1 | mask2)
         group_by = 'remarks'
         label = f"'{remarks}'"
     else:
+        keep = None
         group_by = 'major category'
         label = 'All Categories'
     
+    if keep is not None:
+        mask1 &= keep
+        mask2 &= keep
+    data1 = data[mask1]
+    data2 = data[mask2]
+    
     if data1.empty or data2.empty:
         return None, f"{t('insufficient_data', lang)} {period1} and {period2}."
     
-    # Aggregate data
-    if show_avg:
-        stats1 = data1.groupby(group_by)['Expense'].agg(['sum', 'mean', 'count'])
-        stats2 = data2.groupby(group_by)['Expense'].agg(['sum', 'mean', 'count'])
-        
-        sum1, avg1, count1 = stats1['sum'], stats1['mean'], stats1['count']
-        sum2, avg2, count2 = stats2['sum'], stats2['mean'], stats2['count']
-    else:
-        stats1 = data1.groupby(group_by)['Expense'].agg(['sum', 'count'])
-        stats2 = data2.groupby(group_by)['Expense'].agg(['sum', 'count'])
-        sum1, count1 = stats1['sum'], stats1['count']
-        sum2, count2 = stats2['sum'], stats2['count']
+    # Aggregate data: one groupby per period for all statistics
+    aggs = ['sum', 'mean', 'count'] if show_avg else ['sum', 'count']
+    stats1 = data1.groupby(group_by)['Expense'].agg(aggs)
+    stats2 = data2.groupby(group_by)['Expense'].agg(aggs)
     
-    # Combine and fill missing categories
-    all_cats = sorted(set(sum1.index) | set(sum2.index))
+    # Combine and fill missing categories: align both periods on all_cats once,
+    # then hand plotly plain arrays instead of looking up each category per trace
+    all_cats = stats1.index.union(stats2.index, sort=True)
+    stats1 = stats1.reindex(all_cats, fill_value=0)
+    stats2 = stats2.reindex(all_cats, fill_value=0)
+    sum1, count1 = stats1['sum'].to_numpy(), stats1['count'].to_numpy()
+    sum2, count2 = stats2['sum'].to_numpy(), stats2['count'].to_numpy()
     
     if show_avg:
-        max_total = max(sum1.max() if not sum1.empty else 0, sum2.max() if not sum2.empty else 0)
-        max_avg = max(avg1.max() if not avg1.empty else 0, avg2.max() if not avg2.empty else 0)
+        avg1, avg2 = stats1['mean'].to_numpy(), stats2['mean'].to_numpy()
+        max_total = max(sum1.max() if sum1.size else 0, sum2.max() if sum2.size else 0)
+        max_avg = max(avg1.max() if avg1.size else 0, avg2.max() if avg2.size else 0)
         
         fig = make_subplots(
             rows=2, cols=1, 
@@ -682,61 +783,70 @@ def plot_comparison_bars(df, category=None, major_category=None, remarks=None,
             subplot_titles=(f"{t('total', lang)} (¥)", f"{t('average', lang)} (¥)")
         )
         
+        # Build all bars first and add them in one call (one figure validation pass)
+        bars = []
+        
         # Row 1: Totals
-        fig.add_trace(go.Bar(
+        bars.append(go.Bar(
+            _validate=False,
             name=f"{period1} Total",
             x=all_cats,
-            y=[sum1.get(c, 0) for c in all_cats],
-            text=[f'¥{sum1.get(c, 0):,.0f}' for c in all_cats],
+            y=sum1,
+            texttemplate='¥%{y:,.0f}',
             textposition='outside',
             marker_color=THEME['primary'],
             legendgroup='group1',
             cliponaxis=False,
-            customdata=[count1.get(c, 0) for c in all_cats],
+            customdata=count1,
             hovertemplate='<b>%{x}</b><br>'+period1+f' {t("total", lang)}: ¥%{{y:,.0f}}<br>{t("count", lang)}: %{{customdata}}<extra></extra>'
-        ), row=1, col=1)
+        ))
         
-        fig.add_trace(go.Bar(
+        bars.append(go.Bar(
+            _validate=False,
             name=f"{period2} Total",
             x=all_cats,
-            y=[sum2.get(c, 0) for c in all_cats],
-            text=[f'¥{sum2.get(c, 0):,.0f}' for c in all_cats],
+            y=sum2,
+            texttemplate='¥%{y:,.0f}',
             textposition='outside',
             marker_color=THEME['secondary'],
             legendgroup='group2',
             cliponaxis=False,
-            customdata=[count2.get(c, 0) for c in all_cats],
+            customdata=count2,
             hovertemplate='<b>%{x}</b><br>'+period2+f' {t("total", lang)}: ¥%{{y:,.0f}}<br>{t("count", lang)}: %{{customdata}}<extra></extra>'
-        ), row=1, col=1)
+        ))
         
         # Row 2: Averages
-        fig.add_trace(go.Bar(
+        bars.append(go.Bar(
+            _validate=False,
             name=f"{period1} Avg",
             x=all_cats,
-            y=[avg1.get(c, 0) for c in all_cats],
-            text=[f'¥{avg1.get(c, 0):,.0f}' for c in all_cats],
+            y=avg1,
+            texttemplate='¥%{y:,.0f}',
             textposition='outside',
             marker_color=THEME['primary'],
             legendgroup='group1',
             showlegend=False,
             cliponaxis=False,
-            customdata=[count1.get(c, 0) for c in all_cats],
+            customdata=count1,
             hovertemplate='<b>%{x}</b><br>'+period1+f' {t("average", lang)}: ¥%{{y:,.0f}}<br>{t("count", lang)}: %{{customdata}}<extra></extra>'
-        ), row=2, col=1)
+        ))
         
-        fig.add_trace(go.Bar(
+        bars.append(go.Bar(
+            _validate=False,
             name=f"{period2} Avg",
             x=all_cats,
-            y=[avg2.get(c, 0) for c in all_cats],
-            text=[f'¥{avg2.get(c, 0):,.0f}' for c in all_cats],
+            y=avg2,
+            texttemplate='¥%{y:,.0f}',
             textposition='outside',
             marker_color=THEME['secondary'],
             legendgroup='group2',
             showlegend=False,
             cliponaxis=False,
-            customdata=[count2.get(c, 0) for c in all_cats],
+            customdata=count2,
             hovertemplate='<b>%{x}</b><br>'+period2+f' {t("average", lang)}: ¥%{{y:,.0f}}<br>{t("count", lang)}: %{{customdata}}<extra></extra>'
-        ), row=2, col=1)
+        ))
+        
+        fig.add_traces(bars, rows=[1, 1, 2, 2], cols=1)
         
         fig.update_yaxes(range=[0, max_total * 1.35], tickprefix='¥', row=1, col=1)
         fig.update_yaxes(range=[0, max_avg * 1.35], tickprefix='¥', row=2, col=1)
@@ -745,34 +855,37 @@ def plot_comparison_bars(df, category=None, major_category=None, remarks=None,
         
         fig.update_layout(height=650)
     else:
-        max_val = max(sum1.max() if not sum1.empty else 0, sum2.max() if not sum2.empty else 0)
-        fig = go.Figure()
+        max_val = max(sum1.max() if sum1.size else 0, sum2.max() if sum2.size else 0)
+        bars = []
         
-        fig.add_trace(go.Bar(
+        bars.append(go.Bar(
+            _validate=False,
             name=period1,
             x=all_cats,
-            y=[sum1.get(c, 0) for c in all_cats],
-            text=[f'¥{sum1.get(c, 0):,.0f}' for c in all_cats],
+            y=sum1,
+            texttemplate='¥%{y:,.0f}',
             textposition='outside',
             textfont=dict(size=10),
             marker_color=THEME['primary'],
             cliponaxis=False,
-            customdata=[count1.get(c, 0) for c in all_cats],
+            customdata=count1,
             hovertemplate='<b>%{x}</b><br>'+period1+f': ¥%{{y:,.0f}}<br>{t("count", lang)}: %{{customdata}}<extra></extra>'
         ))
         
-        fig.add_trace(go.Bar(
+        bars.append(go.Bar(
+            _validate=False,
             name=period2,
             x=all_cats,
-            y=[sum2.get(c, 0) for c in all_cats],
-            text=[f'¥{sum2.get(c, 0):,.0f}' for c in all_cats],
+            y=sum2,
+            texttemplate='¥%{y:,.0f}',
             textposition='outside',
             textfont=dict(size=10),
             marker_color=THEME['secondary'],
             cliponaxis=False,
-            customdata=[count2.get(c, 0) for c in all_cats],
+            customdata=count2,
             hovertemplate='<b>%{x}</b><br>'+period2+f': ¥%{{y:,.0f}}<br>{t("count", lang)}: %{{customdata}}<extra></extra>'
         ))
+        fig = go.Figure(data=bars)
         fig.update_yaxes(range=[0, max_val * 1.25], tickprefix='¥')
     
     fig.update_layout(
@@ -830,39 +943,42 @@ def calculate_total(df, category=None, major_category=None, year=None, month=Non
     - category: specific category OR broad category
     - remarks: search in transaction remarks
     """
-    data = df.copy()
-    data['Date'] = pd.to_datetime(data['Date'])
+    data = ensure_tool_columns(df)
     
-    # Time filtering
+    # Time filtering (row masks are combined and applied once below)
+    mask = pd.Series(True, index=data.index)
     if year and month and day:
         specific_date = pd.Timestamp(year=int(year), month=int(month), day=int(day))
-        data = data[data['Date'].dt.date == specific_date.date()]
+        mask = data['_ymd'] == specific_date
         time_label = specific_date.strftime('%Y-%m-%d')
     elif year and month:
-        data = data[(data['Date'].dt.year == int(year)) & (data['Date'].dt.month == int(month))]
+        mask = (data['_year'] == int(year)) & (data['_month'] == int(month))
         time_label = f"{year}-{month:02d}"
     elif year:
-        data = data[data['Date'].dt.year == int(year)]
+        mask = data['_year'] == int(year)
         time_label = str(year)
     elif start_year and end_year:
-        data = data[(data['Date'].dt.year >= int(start_year)) & (data['Date'].dt.year <= int(end_year))]
+        mask = (data['_year'] >= int(start_year)) & (data['_year'] <= int(end_year))
         time_label = f"{start_year}-{end_year}"
     else:
         time_label = "all time"
     
     # Category filtering
     if category:
-        data = data[data['category'].str.lower() == category.lower()]
+        mask &= data['_category_key'] == category.lower()
         label = category
     elif major_category:
-        data = data[data['major category'].str.lower() == major_category.lower()]
+        mask &= data['_major_key'] == major_category.lower()
         label = major_category
     elif remarks:
-        data = data[data['remarks'].str.contains(remarks, case=False, na=False)]
+        mask = match_remarks(data, remarks, mask)
         label = f"'{remarks}'"
     else:
         label = t('total', lang)
     
+    if not mask.all():
+        data = data[mask]
+    
     if data.empty:
         if lang == 'ja':
             return None, f"{time_label}の{label}に関する取引が見つかりませんでした。"
@@ -891,106 +1007,121 @@ def calculate_statistics(df, category=None, major_category=None, remarks=None,
     
     For specific date comparison: y1=2024, m1=7, d1=21, y2=2025, m2=7, d2=21, compare=True
     """
-    data = df.copy()
-    data['Date'] = pd.to_datetime(data['Date'])
+    data = ensure_tool_columns(df)
     
     if compare and y1 and y2:
-        # Comparison mode
+        # Comparison mode (one row mask per period; only the Expense column is sliced)
         if d1 and d2:
             # Specific date comparison
             date1 = pd.Timestamp(year=int(y1), month=int(m1), day=int(d1))
             date2 = pd.Timestamp(year=int(y2), month=int(m2), day=int(d2))
-            data1 = data[data['Date'].dt.date == date1.date()]
-            data2 = data[data['Date'].dt.date == date2.date()]
+            mask1 = data['_ymd'] == date1
+            mask2 = data['_ymd'] == date2
             period1 = date1.strftime('%Y-%m-%d')
             period2 = date2.strftime('%Y-%m-%d')
         elif m1 and m2:
-            data1 = data[(data['Date'].dt.year == int(y1)) & (data['Date'].dt.month == int(m1))]
-            data2 = data[(data['Date'].dt.year == int(y2)) & (data['Date'].dt.month == int(m2))]
+            mask1 = (data['_year'] == int(y1)) & (data['_month'] == int(m1))
+            mask2 = (data['_year'] == int(y2)) & (data['_month'] == int(m2))
             period1 = f"{y1}-{m1:02d}"
             period2 = f"{y2}-{m2:02d}"
         else:
-            data1 = data[data['Date'].dt.year == int(y1)]
-            data2 = data[data['Date'].dt.year == int(y2)]
+            mask1 = data['_year'] == int(y1)
+            mask2 = data['_year'] == int(y2)
             period1 = str(y1)
             period2 = str(y2)
         
-        # Apply category filter
+        # Apply category filter: one mask shared by both periods
         if category:
-            data1 = data1[data1['category'].str.lower() == category.lower()]
-            data2 = data2[data2['category'].str.lower() == category.lower()]
+            keep = data['_category_key'] == category.lower()
             label = category
         elif major_category:
-            data1 = data1[data1['major category'].str.lower() == major_category.lower()]
-            data2 = data2[data2['major category'].str.lower() == major_category.lower()]
+            keep = data['_major_key'] == major_category.lower()
             label = major_category
         elif remarks:
-            data1 = data1[data1['remarks'].str.contains(remarks, case=False, na=False)]
-            data2 = data2[data2['remarks'].str.contains(remarks, case=False, na=False)]
+            keep = match_remarks(data, remarks, mask1 | mask2)
             label = f"'{remarks}'"
         else:
+            keep = None
             label = "Total"
         
-        if len(data1) < 2 or len(data2) < 2:
+        if keep is not None:
+            mask1 &= keep
+            mask2 &= keep
+        
+        # Plain float arrays: the nan-aware NumPy reductions below skip missing amounts
+        # like the pandas methods did, without per-call Series dispatch
+        s1 = data.loc[mask1, 'Expense'].to_numpy(dtype=float)
+        s2 = data.loc[mask2, 'Expense'].to_numpy(dtype=float)
+        n1, n2 = len(s1), len(s2)
+        
+        if n1 < 2 or n2 < 2:
             if lang == 'ja':
                 return None, f"{label}の統計的比較のためのデータが不足しています。"
             return None, f"Insufficient data for statistical comparison of {label}."
         
-        s1 = data1['Expense']
-        s2 = data2['Expense']
+        mean1, mean2 = np.nanmean(s1), np.nanmean(s2)
+        var1, var2 = np.nanvar(s1, ddof=1), np.nanvar(s2, ddof=1)
         
-        # T-test
-        t_stat, p_value = stats.ttest_ind(s1, s2, equal_var=False, nan_policy='omit')
+        # T-test (Welch) from the moments above instead of another pass over the samples;
+        # like nan_policy='omit', missing amounts are left out of the sample sizes
+        k1, k2 = np.count_nonzero(~np.isnan(s1)), np.count_nonzero(~np.isnan(s2))
+        t_stat, p_value = stats.ttest_ind_from_stats(mean1, np.sqrt(var1), k1, mean2, np.sqrt(var2), k2,
+                                                     equal_var=False)
         
         # Effect size (Cohen's d)
-        pooled_std = np.sqrt(((len(s1)-1)*s1.std()**2 + (len(s2)-1)*s2.std()**2) / (len(s1)+len(s2)-2))
-        cohens_d = (s1.mean() - s2.mean()) / pooled_std if pooled_std > 0 else 0
+        pooled_std = np.sqrt(((n1-1)*var1 + (n2-1)*var2) / (n1+n2-2))
+        cohens_d = (mean1 - mean2) / pooled_std if pooled_std > 0 else 0
         
         sig = "統計的に有意" if p_value < 0.05 else "統計的に有意ではない" if lang == 'ja' else "statistically significant" if p_value < 0.05 else "not statistically significant"
         effect = "大きい" if abs(cohens_d) > 0.8 else "中程度" if abs(cohens_d) > 0.5 else "小さい" if lang == 'ja' else "large" if abs(cohens_d) > 0.8 else "medium" if abs(cohens_d) > 0.5 else "small"
         
         if lang == 'ja':
-            msg = f"{label} - {period1}: {t('average', lang)} ¥{s1.mean():,.0f} (n={len(s1)}), "
-            msg += f"{period2}: {t('average', lang)} ¥{s2.mean():,.0f} (n={len(s2)}) | "
+            msg = f"{label} - {period1}: {t('average', lang)} ¥{mean1:,.0f} (n={n1}), "
+            msg += f"{period2}: {t('average', lang)} ¥{mean2:,.0f} (n={n2}) | "
             msg += f"差異は{sig}です (p={p_value:.4f}), 効果量: {effect} (d={cohens_d:.3f})"
         else:
-            msg = f"{label} - {period1}: mean ¥{s1.mean():,.0f} (n={len(s1)}), "
-            msg += f"{period2}: mean ¥{s2.mean():,.0f} (n={len(s2)}) | "
+            msg = f"{label} - {period1}: mean ¥{mean1:,.0f} (n={n1}), "
+            msg += f"{period2}: mean ¥{mean2:,.0f} (n={n2}) | "
             msg += f"Difference is {sig} (p={p_value:.4f}), effect size: {effect} (d={cohens_d:.3f})"
         
         return None, msg
     
     else:
-        # Single period statistics
+        # Single period statistics (row masks are combined and applied once below)
+        mask = pd.Series(True, index=data.index)
         if y1 and m1:
-            data = data[(data['Date'].dt.year == int(y1)) & (data['Date'].dt.month == int(m1))]
+            mask = (data['_year'] == int(y1)) & (data['_month'] == int(m1))
             time_label = f"{y1}-{m1:02d}"
         elif y1:
-            data = data[data['Date'].dt.year == int(y1)]
+            mask = data['_year'] == int(y1)
             time_label = str(y1)
         else:
             time_label = "全期間" if lang == 'ja' else "all time"
         
         if category:
-            data = data[data['category'].str.lower() == category.lower()]
+            mask &= data['_category_key'] == category.lower()
             label = category
         elif major_category:
-            data = data[data['major category'].str.lower() == major_category.lower()]
+            mask &= data['_major_key'] == major_category.lower()
             label = major_category
         elif remarks:
-            data = data[data['remarks'].str.contains(remarks, case=False, na=False)]
+            mask = match_remarks(data, remarks, mask)
             label = f"'{remarks}'"
         else:
             label = "Total"
         
+        if not mask.all():
+            data = data[mask]
+        
         if data.empty:
             if lang == 'ja':
                 return None, f"{time_label}の{label}に関する取引が見つかりませんでした。"
             return None, f"No transactions found for {label} in {time_label}."
         
-        mean_val = data['Expense'].mean()
-        median_val = data['Expense'].median()
-        std_val = data['Expense'].std()
+        expense = data['Expense'].to_numpy(dtype=float)
+        mean_val = np.nanmean(expense)
+        median_val = np.nanmedian(expense)
+        std_val = np.nanstd(expense, ddof=1) if len(expense) > 1 else np.nan
         
         if lang == 'ja':
             return None, f"{time_label}の{label}: {t('average', lang)} ¥{mean_val:,.0f}, 中央値 ¥{median_val:,.0f}, 標準偏差 ¥{std_val:,.0f} (n={len(data)})"
@@ -1007,51 +1138,65 @@ def get_top_expenses(df, n=10, category=None, major_category=None, remarks=None,
     - n: number of top expenses to return (default 10)
     - min_amount: only show expenses above this amount
     """
-    data = df.copy()
-    data['Date'] = pd.to_datetime(data['Date'])
+    data = ensure_tool_columns(df)
     
-    # Time filtering
+    # Time filtering (row masks are combined and applied once below)
+    mask = pd.Series(True, index=data.index)
     if year and month:
-        data = data[(data['Date'].dt.year == int(year)) & (data['Date'].dt.month == int(month))]
+        mask = (data['_year'] == int(year)) & (data['_month'] == int(month))
         time_label = f"{year}-{month:02d}"
     elif year:
-        data = data[data['Date'].dt.year == int(year)]
+        mask = data['_year'] == int(year)
         time_label = str(year)
     else:
         time_label = "all time"
     
+    # Amount filtering (before the remarks search, which only scans rows still in the mask)
+    if min_amount:
+        mask &= data['Expense'] >= float(min_amount)
+    
     # Category filtering
     if category:
-        data = data[data['category'].str.lower() == category.lower()]
+        mask &= data['_category_key'] == category.lower()
         label = category
     elif major_category:
-        data = data[data['major category'].str.lower() == major_category.lower()]
+        mask &= data['_major_key'] == major_category.lower()
         label = major_category
     elif remarks:
-        data = data[data['remarks'].str.contains(remarks, case=False, na=False)]
+        mask = match_remarks(data, remarks, mask)
         label = f"'{remarks}'"
     else:
         label = "全支出" if lang == 'ja' else "all expenses"
     
-    # Amount filtering
-    if min_amount:
-        data = data[data['Expense'] >= float(min_amount)]
+    if not mask.all():
+        data = data[mask]
     
     if data.empty:
         if lang == 'ja':
             return None, f"{time_label}の{label}に関する支出は見つかりませんでした。"
         return None, f"No expenses found for {label} in {time_label}."
     
-    # Get top N
-    top_data = data.nlargest(n, 'Expense')[['Date', 'Expense', 'category', 'remarks']]
+    # Get top N: partition around the n-th largest amount, then sort just those rows.
+    # The stable sort over candidates in row order keeps nlargest's keep='first' ties;
+    # missing amounts (or n outside 1..len-1) go through nlargest itself.
+    expense = data['Expense'].to_numpy(dtype=float)
+    if 0 < n < len(expense) and not np.isnan(expense).any():
+        kth = np.partition(expense, -n)[-n]
+        candidates = np.flatnonzero(expense >= kth)
+        top_idx = candidates[np.argsort(-expense[candidates], kind='stable')[:n]]
+        top_data = data.iloc[top_idx][['Date', 'Expense', 'category', 'remarks']]
+    else:
+        top_data = data.nlargest(n, 'Expense')[['Date', 'Expense', 'category', 'remarks']]
     
     if lang == 'ja':
         msg = f"{time_label}の{label}における上位{min(n, len(top_data))}件の支出:\n"
     else:
         msg = f"Top {min(n, len(top_data))} expenses for {label} in {time_label}:\n"
-    for idx, row in top_data.iterrows():
-        date_str = row['Date'].strftime('%Y-%m-%d')
-        remarks_str = f" - {row['rema rks']}" if pd.notna(row['remarks']) else ""
-        msg += f"• {date_str}: ¥{row['Expense']:,.0f} ({row['category']}){remarks_str}\n"
+    # Dates are formatted in one vectorized call; the columns are zipped rather than iterrows()
+    dates = top_data['Date'].dt.strftime('%Y-%m-%d')
+    msg += "\n".join(
+        f"• {date_str}: ¥{expense:,.0f} ({cat})" + (f" - {rem}" if pd.notna(rem) else "")
+        for date_str, expense, cat, rem in zip(dates, top_data['Expense'], top_data['category'], top_data['remarks'])
+    )
     
     return None, msg.strip()
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+Category mapping (raw sub-category -> major category).
+
+GENERATED by backend/scripts/compile_categories.py from
+src/utils/categories.json -- do not edit by hand. Keys are pre-normalised
+(lower + strip), the same way request categories are.
+"""
+
+CATEGORY_MAPPING = {
+    'grocery': 'Food',
+    'snacks': 'Food',
+    'cafe': 'Food',
+    'café': 'Food',
+    'coffee': 'Food',
+    'bento': 'Food',
+    'beverage': 'Food',
+    'combini meal': 'Food',
+    'dining': 'Food',
+    'eating with friend': 'Food',
+    'housing': 'Housing and Utilities',
+    'internet bill': 'Housing and Utilities',
+    'electricity bill': 'Housing and Utilities',
+    'gas bill': 'Housing and Utilities',
+    'water & sewage bill': 'Housing and Utilities',
+    'phone bill': 'Housing and Utilities',
+    'clothing': 'Household and Clothing',
+    'household': 'Household and Clothing',
+    'furniture': 'Electronics and Furniture',
+    'electronics': 'Electronics and Furniture',
+    'supplements': 'Fitness',
+    'shoes': 'Fitness',
+    'sports event': 'Fitness',
+    'sports watch': 'Fitness',
+    'sports clothing': 'Fitness',
+    'sports rental': 'Fitness',
+    'gym': 'Fitness',
+    'sports equipment': 'Fitness',
+    'basketball game': 'Fitness',
+    'footbal game': 'Fitness',
+    'futsal game': 'Fitness',
+    'commute': 'Transportation',
+    'ride share': 'Transportation',
+    'tokyo metro': 'Transportation',
+    'flight tickets': 'Transportation',
+    'cable car': 'Transportation',
+    'bus': 'Transportation',
+    'shinkansen': 'Transportation',
+    'car rental': 'Transportation',
+    'taxi': 'Transportation',
+    'stay': 'Transportation',
+    'souvenirs': 'Souvenirs/Gifts/Treats',
+    'treat': 'Souvenirs/Gifts/Treats',
+    'gift': 'Souvenirs/Gifts/Treats',
+    'entertainment': 'Entertainment',
+    'nomikai': 'Entertainment',
+    'activities': 'Entertainment',
+    'arcades & karaoke': 'Entertainment',
+    'events & venues': 'Entertainment',
+    'medicines': 'Miscellaneous',
+    'personal care': 'Miscellaneous',
+    'misc': 'Miscellaneous',
+    'help': 'Miscellaneous',
+    'charity': 'Miscellaneous',
+    'donation': 'Miscellaneous',
+    'entrance fees': 'Miscellaneous',
+    'park entrance fees': 'Miscellaneous',
+    'healthcare': 'Miscellaneous',
+    'tuition': 'Education',
+    'books': 'Education',
+    'exam fees': 'Education',
+    'notebooks': 'Education',
+    'textbook': 'Education',
+}
@@ -0,0 +1,51 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+
+class FrameLRU:
+    """
+    Thread-safe LRU of values computed from a DataFrame, keyed by (id(df), key).
+
+    Entries hold only a weak reference to their frame and are checked against it on
+    every hit, so a recycled id() never serves another frame's value. A hit also
+    requires the same row count and the same backing arrays for `columns`, so
+    appending/dropping rows or reassigning a watched column (df['category'] = ...)
+    invalidates the entry. In-place element edits (df.loc[i, 'category'] = ...) are
+    not detected: frames are treated as read-only once built, so call clear() after
+    editing one in place.
+    """
+
+    def __init__(self, maxsize, columns=()):
+        self.maxsize = maxsize
+        self.columns = tuple(columns)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _arrays(self, df):
+        return tuple(df[col].array if col in df.columns else None for col in self.columns)
+
+    def get(self, df, key=()):
+        """Cached value for (df, key), or None on a miss."""
+        arrays = self._arrays(df)
+        cache_key = (id(df), key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None or entry[0]() is not df or entry[1] != len(df) \
+                    or any(a is not b for a, b in zip(entry[2], arrays)):
+                return None
+            self._entries.move_to_end(cache_key)
+            return entry[3]
+
+    def put(self, df, value, key=()):
+        """Stores value for (df, key), evicting the least recently used entry when full."""
+        cache_key = (id(df), key)
+        with self._lock:
+            self._entries[cache_key] = (weakref.ref(df), len(df), self._arrays(df), value)
+            self._entries.move_to_end(cache_key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -1,9 +1,27 @@
 import pandas as pd
 import difflib
 from typing import Dict, Any, Tuple, Optional
+from utils.frame_cache import FrameLRU
+
+# Columns the category lookups are built from
+METADATA_COLUMNS = ('category', 'major category')
+METADATA_CACHE_SIZE = 8
+metadata_cache = FrameLRU(METADATA_CACHE_SIZE, columns=METADATA_COLUMNS)
 
 def get_metadata_lists(df):
-    """Extract category and major_category lists from the dataframe"""
+    """
+    Extract category and major_category lists from the dataframe.
+    Memoized per frame: every tool call of a request validates against the same df.
+    The returned lookup dicts are shared and must not be modified.
+    """
+    lookups = metadata_cache.get(df)
+    if lookups is None:
+        lookups = build_metadata_lists(df)
+        metadata_cache.put(df, lookups)
+    return lookups
+
+def build_metadata_lists(df):
+    """Case-insensitive category and major_category lookups (lowercase -> original name)"""
     if 'category' not in df.columns:
         return {}, {}
         
@@ -69,7 +87,11 @@ def validate_and_fix_params(params: Dict[str, Any], df: pd.DataFrame) -> Tuple[D
     # 3. If neither, assume it's a Remark/Keyword
     
     match_major, score_major = find_best_match(input_cat, major_category_lookup)
-    match_cat, score_cat = find_best_match(input_cat, category_lookup)
+    # An exact broad-group hit wins below regardless of the specific score, so skip that search
+    if score_major == 1.0:
+        match_cat, score_cat = None, 0
+    else:
+        match_cat, score_cat = find_best_match(input_cat, category_lookup)
     
     # Decide which match is better
     if score_major >= 0.8 and score_major >= score_cat:
@@ -1,20 +1,42 @@
 import os
-import glob
+import copy
+import json
+import shutil
 import logging
+import threading
 from mlx_lm import load, generate
 
 logger = logging.getLogger(__name__)
 
+# On-disk cache for 4-bit conversions made by MLXModel.quantize_4bit()
+QUANTIZED_CACHE_DIR = os.path.expanduser("~/.cache/expensesense/mlx-4bit")
+
+
+def available_memory_bytes():
+    """Returns available system RAM in bytes, or None if psutil is not installed."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.virtual_memory().available
+
 class MLXModel:
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(MLXModel, cls).__new__(cls)
-            cls._instance.model = None
-            cls._instance.tokenizer = None
-            cls._instance.current_model_path = None
-        return cls._instance
+    """Holds the loaded MLX model and tokenizer; use the shared module-level `mlx_model`."""
+
+    def __init__(self):
+        self.model = None
+        self.tokenizer = None
+        self.current_model_path = None
+        # Serializes load_model's check-then-load so concurrent requests never load twice
+        self._load_lock = threading.Lock()
+        # When set, samplers are wrapped in mx.compile (see get_sampler)
+        self.compile_sampler = False
+        self._samplers = {}
+        # Per-model tokenization caches for fixed system prompts (see encode_prompt)
+        self._system_prefixes = {}
+        self._prefix_ids = {}
+        # Whether the loaded tokenizer's chat template takes enable_thinking (None = not yet known)
+        self._enable_thinking = None
 
     def resolve_path(self, model_identifier: str):
         """Resolves a model identifier to an absolute path, checking LM Studio first."""
@@ -31,29 +53,93 @@ class MLXModel:
         # If not found in LM Studio, assume it's a HF repo ID and let mlx_lm handle it
         return model_identifier
 
+    def quantize_4bit(self, model_identifier: str, q_group_size: int = 64):
+        """Returns a 4-bit MLX copy of the model, converting it on first use.
+
+        Identifiers that are already 4-bit are returned unchanged. Conversions are cached
+        under QUANTIZED_CACHE_DIR so later runs load the 4-bit weights directly.
+        """
+        if "4bit" in model_identifier.lower():
+            return model_identifier
+
+        model_path = self.resolve_path(model_identifier)
+        config_path = os.path.join(model_path, "config.json")
+        if os.path.exists(config_path):
+            with open(config_path, "r", encoding="utf-8") as f:
+                bits = json.load(f).get("quantization", {}).get("bits")
+            if bits is not None and bits <= 4:
+                return model_identifier
+
+        out_path = os.path.join(QUANTIZED_CACHE_DIR, model_identifier.strip("/").replace("/", "--") + "-4bit")
+        if os.path.exists(os.path.join(out_path, "config.json")):
+            return out_path
+        shutil.rmtree(out_path, ignore_errors=True)  # partial conversion from an interrupted run
+        os.makedirs(QUANTIZED_CACHE_DIR, exist_ok=True)
+
+        from mlx_lm import convert
+        logger.info(f"Converting {model_identifier} to 4-bit MLX at {out_path}")
+        try:
+            convert(model_path, mlx_path=out_path, quantize=True, q_bits=4, q_group_size=q_group_size)
+        except ValueError:
+            # mlx-lm refuses to re-quantize (e.g. 8-bit) weights; dequantize first
+            shutil.rmtree(out_path, ignore_errors=True)
+            tmp_path = out_path + ".dequantized"
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            try:
+                convert(model_path, mlx_path=tmp_path, dequantize=True)
+                convert(tmp_path, mlx_path=out_path, quantize=True, q_bits=4, q_group_size=q_group_size)
+            finally:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        return out_path
+
     def load_model(self, model_identifier: str):
         """Loads the MLX model and tokenizer if not already loaded."""
         model_path = self.resolve_path(model_identifier)
         
-        if self.current_model_path == model_path and self.model is not None:
-            return
+        with self._load_lock:
+            if self.current_model_path == model_path and self.model is not None:
+                return
 
-        logger.info(f"Loading MLX model from: {model_path} (Identified as: {model_identifier})")
-        try:
-            self.model, self.tokenizer = load(model_path)
-            self.current_model_path = model_path
-            logger.info("MLX model loaded successfully.")
-        except Exception as e:
-            logger.error(f"Failed to load MLX model: {e}")
-            raise e
+            logger.info(f"Loading MLX model from: {model_path} (Identified as: {model_identifier})")
+            try:
+                self.model, self.tokenizer = load(model_path)
+                self.current_model_path = model_path
+                self._system_prefixes = {}
+                self._prefix_ids = {}
+                self._enable_thinking = None
+                logger.info("MLX model loaded successfully.")
+            except Exception as e:
+                logger.error(f"Failed to load MLX model: {e}")
+                raise e
+
+    def get_sampler(self, temperature: float):
+        """Returns a cached sampler for `temperature`, compiled with mx.compile if enabled.
 
-    def generate(self, model_identifier: str, prompt: str, max_tokens: int = 500, temperature: float = 0.0):
-        """Generates text using the MLX model."""
+        Raises ImportError on mlx-lm versions without make_sampler.
+        """
+        key = (temperature, self.compile_sampler)
+        if key not in self._samplers:
+            from mlx_lm.sample_utils import make_sampler
+            sampler = make_sampler(temp=temperature)
+            if self.compile_sampler:
+                import mlx.core as mx
+                # The RNG state must be threaded through, or a compiled sampler with
+                # temperature > 0 replays the same random draw on every call.
+                sampler = mx.compile(sampler, inputs=mx.random.state, outputs=mx.random.state)
+            self._samplers[key] = sampler
+        return self._samplers[key]
+
+    def generate(self, model_identifier: str, prompt, max_tokens: int = 500, temperature: float = 0.0, prompt_cache=None):
+        """Generates text using the MLX model.
+
+        `prompt` may be a string or a list of token ids; `prompt_cache` is a prefilled
+        KV cache that the prompt continues from (consumed by this call).
+        """
         self.load_model(model_identifier)
+        extra = {"prompt_cache": prompt_cache} if prompt_cache is not None else {}
         
         try:
-            from mlx_lm.sample_utils import make_sampler
-            sampler = make_sampler(temp=temperature)
+            sampler = self.get_sampler(temperature)
             
             # mlx-lm generate function
             response = generate(
@@ -62,7 +148,8 @@ class MLXModel:
                 prompt=prompt, 
                 max_tokens=max_tokens,
                 sampler=sampler,
-                verbose=False
+                verbose=False,
+                **extra
             )
             return response
         except ImportError:
@@ -74,37 +161,165 @@ class MLXModel:
                 prompt=prompt, 
                 max_tokens=max_tokens,
                 temp=temperature,
-                verbose=False
+                verbose=False,
+                **extra
             )
         except Exception as e:
             logger.error(f"MLX generation error: {e}")
             return f"Error: {str(e)}"
 
-    def chat(self, model_identifier: str, messages: list, max_tokens: int = 500, temperature: float = 0.0):
-        """Formats messages and generates code/text."""
-        try:
-            self.load_model(model_identifier)
-            if hasattr(self.tokenizer, "apply_chat_template"):
+    def format_chat(self, messages: list, add_generation_prompt: bool = True):
+        """Renders a message list into a prompt string with the loaded tokenizer."""
+        if hasattr(self.tokenizer, "apply_chat_template"):
+            if self._enable_thinking is not False:
                 try:
                     # Try with enable_thinking=False for models that support it (e.g. Qwen3)
                     prompt = self.tokenizer.apply_chat_template(
-                        messages, tokenize=False, add_generation_prompt=True, enable_thinking=False
+                        messages, tokenize=False, add_generation_prompt=add_generation_prompt, enable_thinking=False
                     ) #enable thinking is disabled for qwen3
+                    self._enable_thinking = True
+                    return prompt
                 except TypeError:
-                    # Fallback for tokenizers that don't support enable_thinking
-                    prompt = self.tokenizer.apply_chat_template(
-                        messages, tokenize=False, add_generation_prompt=True
-                    )
-            else:
-                prompt = "\n".join([f"{m['role'].upper()}: {m['content']}" for m in messages]) + "\nASSISTANT: "
-            
-            return self.generate(model_identifier, prompt, max_tokens, temperature)
+                    pass
+            # Fallback for tokenizers that don't support enable_thinking
+            prompt = self.tokenizer.apply_chat_template(
+                messages, tokenize=False, add_generation_prompt=add_generation_prompt
+            )
+            # Only a tokenizer that never accepted the keyword is marked, so later calls skip the failing render
+            if self._enable_thinking is None:
+                self._enable_thinking = False
+            return prompt
+        prompt = "\n".join([f"{m['role'].upper()}: {m['content']}" for m in messages])
+        return prompt + "\nASSISTANT: " if add_generation_prompt else prompt
+
+    def encode(self, prompt: str):
+        """Tokenizes a rendered prompt, adding BOS only if the template did not already."""
+        bos = getattr(self.tokenizer, "bos_token", None)
+        return self.tokenizer.encode(prompt, add_special_tokens=bos is None or not prompt.startswith(bos))
+
+    def system_prefix(self, messages: list):
+        """Rendered text of the leading system message, or None if there is none."""
+        if not messages or messages[0].get("role") != "system":
+            return None
+        content = messages[0]["content"]
+        if content not in self._system_prefixes:
+            self._system_prefixes[content] = self.format_chat(messages[:1], add_generation_prompt=False)
+        return self._system_prefixes[content]
+
+    def encode_prompt(self, prompt: str, prefix: str = None):
+        """Tokenizes `prompt`, reusing cached token ids for its leading `prefix` text.
+
+        The first time a prefix is seen the split is checked against a full encode; if the
+        tokenizer merges tokens across the boundary that prefix is never split again.
+        Returns (token_ids, n_prefix_tokens), with n_prefix_tokens == 0 if nothing was reused.
+        """
+        if not prefix or not prompt.startswith(prefix):
+            return self.encode(prompt), 0
+
+        tail = prompt[len(prefix):]
+        prefix_ids = self._prefix_ids.get(prefix)
+        if prefix_ids is None:
+            prefix_ids = self.encode(prefix)
+            full_ids = self.encode(prompt)
+            n = len(prefix_ids)
+            splittable = (full_ids[:n] == prefix_ids
+                          and full_ids[n:] == self.tokenizer.encode(tail, add_special_tokens=False))
+            self._prefix_ids[prefix] = prefix_ids if splittable else False
+            return full_ids, (n if splittable else 0)
+        if prefix_ids is False:
+            return self.encode(prompt), 0
+        return prefix_ids + self.tokenizer.encode(tail, add_special_tokens=False), len(prefix_ids)
+
+    def pretokenize(self, model_identifier: str, messages_list: list):
+        """Fills the prefix token cache for each conversation's system prompt ahead of time."""
+        self.load_model(model_identifier)
+        for messages in messages_list:
+            self.encode_prompt(self.format_chat(messages), self.system_prefix(messages))
+
+    def make_prefix_cache(self, model_identifier: str, messages: list):
+        """Prefills a KV cache for a fixed leading message list (e.g. the system prompt).
+
+        Returns a (prefix_text, prefix_token_ids, cache) tuple to pass as
+        chat(..., prefix_cache=...), or None if this mlx-lm version has no prompt cache support.
+        """
+        self.load_model(model_identifier)
+        try:
+            import mlx.core as mx
+            from mlx_lm.models.cache import make_prompt_cache
+        except ImportError:
+            logger.info("make_prompt_cache not found, prefix caching disabled.")
+            return None
+
+        prefix_text = self.format_chat(messages, add_generation_prompt=False)
+        prefix_ids = self.encode(prefix_text)
+        cache = make_prompt_cache(self.model)
+        self.model(mx.array(prefix_ids)[None], cache=cache)
+        mx.eval([c.state for c in cache])
+        return prefix_text, prefix_ids, cache
+
+    def chat(self, model_identifier: str, messages: list, max_tokens: int = 500, temperature: float = 0.0, prefix_cache=None):
+        """Formats messages and generates code/text.
+
+        The system prompt's token ids are cached, so only the rest of the conversation is
+        tokenized per call. With a `prefix_cache` from make_prefix_cache(), only the tokens
+        after the cached prefix are prefilled; the cache itself is copied, never mutated.
+        """
+        try:
+            self.load_model(model_identifier)
+            prompt = self.format_chat(messages)
+            if prefix_cache is not None:
+                prefix_text, prefix_ids, cache = prefix_cache
+                prompt_ids, n = self.encode_prompt(prompt, prefix_text)
+                if n == len(prefix_ids) and len(prompt_ids) > n:
+                    return self.generate(model_identifier, prompt_ids[n:], max_tokens, temperature,
+                                         prompt_cache=copy.deepcopy(cache))
+                logger.info("Prompt does not start with the cached prefix, running full prefill.")
+                return self.generate(model_identifier, prompt_ids, max_tokens, temperature)
+            prompt_ids, _ = self.encode_prompt(prompt, self.system_prefix(messages))
+            return self.generate(model_identifier, prompt_ids, max_tokens, temperature)
         except Exception as e:
             logger.error(f"MLX chat error: {e}")
             return f"Error: {str(e)}"
 
+    def chat_batch(self, model_identifier: str, messages_list: list, max_tokens: int = 500, temperature: float = 0.0):
+        """Generates one reply per conversation in a single batched forward pass.
+
+        Falls back to sequential chat() calls on mlx-lm versions without batch_generate.
+        """
+        try:
+            self.load_model(model_identifier)
+            prompts = [self.format_chat(messages) for messages in messages_list]
+            prefixes = [self.system_prefix(messages) for messages in messages_list]
+
+            try:
+                from mlx_lm import batch_generate
+                sampler = self.get_sampler(temperature)
+            except ImportError:
+                logger.info("batch_generate not found, falling back to sequential generation.")
+                return [self.generate(model_identifier, self.encode_prompt(p, pre)[0], max_tokens, temperature)
+                        for p, pre in zip(prompts, prefixes)]
+
+            # batch_generate left-pads the token rows itself and stops each row at its own EOS
+            prompt_ids = [self.encode_prompt(p, pre)[0] for p, pre in zip(prompts, prefixes)]
+            response = batch_generate(
+                self.model,
+                self.tokenizer,
+                prompt_ids,
+                max_tokens=max_tokens,
+                sampler=sampler,
+                verbose=False
+            )
+            return list(response.texts)
+        except Exception as e:
+            logger.error(f"MLX batch chat error: {e}")
+            return [f"Error: {str(e)}"] * len(messages_list)
+
     def list_available_models(self):
-        """Lists available MLX models in HF and LM Studio caches, filtering out TTS models."""
+        """Lists available MLX models in HF and LM Studio caches, filtering out TTS models.
+
+        Directories are walked with os.scandir, whose entries carry the name and type, so
+        each folder is listed once instead of listdir plus a stat per child.
+        """
         search_paths = [
             os.path.expanduser("~/.cache/huggingface/hub"),
             os.path.expanduser("~/.lmstudio/models")
@@ -118,34 +333,39 @@ class MLXModel:
                 continue
                 
             if "huggingface" in base_path:
-                # Standard HF Cache
-                paths = glob.glob(os.path.join(base_path, "models--*mlx*"))
-                for path in paths:
-                    folder_name = os.path.basename(path).lower()
-                    if any(k in folder_name for k in exclude_keywords):
-                        continue
-                    parts = os.path.basename(path).split("--")
-                    if len(parts) >= 3:
-                        repo = f"{parts[1]}/{parts[2]}"
-                        models.append(repo)
+                # Standard HF Cache (models--<org>--<name> entries with 'mlx' in the name)
+                with os.scandir(base_path) as it:
+                    for entry in it:
+                        name = entry.name
+                        if not name.startswith("models--") or "mlx" not in name[len("models--"):]:
+                            continue
+                        if any(k in name.lower() for k in exclude_keywords):
+                            continue
+                        parts = name.split("--")
+                        if len(parts) >= 3:
+                            repo = f"{parts[1]}/{parts[2]}"
+                            models.append(repo)
             else:
                 # LM Studio Cache (structure: publisher/model_name)
-                for publisher in os.listdir(base_path):
-                    if publisher.startswith('.'): continue
-                    pub_path = os.path.join(base_path, publisher)
-                    if not os.path.isdir(pub_path): continue
+                with os.scandir(base_path) as it:
+                    publishers = [e for e in it if not e.name.startswith('.') and e.is_dir()]
+                for pub_entry in publishers:
+                    publisher = pub_entry.name
+                    with os.scandir(pub_entry.path) as it:
+                        folders = [e for e in it if not e.name.startswith('.') and e.is_dir()]
                     
-                    for model_folder in os.listdir(pub_path):
-                        if model_folder.startswith('.'): continue
-                        full_path = os.path.join(pub_path, model_folder)
-                        
-                        if not os.path.isdir(full_path): continue
+                    for folder_entry in folders:
+                        model_folder = folder_entry.name
+                        full_path = folder_entry.path
+                        with os.scandir(full_path) as it:
+                            children = list(it)
+                        names = {e.name for e in children}
                         
                         # Look for MLX models (either folder or publisher has 'mlx' and contains config.json)
                         # We also skip GGUF models explicitly
                         is_mlx = "mlx" in model_folder.lower() or "mlx" in publisher.lower()
-                        has_config = os.path.exists(os.path.join(full_path, "config.json"))
-                        is_gguf = any(f.endswith(".gguf") for f in os.listdir(full_path))
+                        has_config = "config.json" in names
+                        is_gguf = any(n.endswith(".gguf") for n in names)
                         
                         if is_mlx and has_config and not is_gguf:
                             if any(k in model_folder.lower() for k in exclude_keywords):
@@ -155,11 +375,11 @@ class MLXModel:
                         
                         # Handle deeper nesting if it's another directory level
                         # some providers use publisher/category/model
-                        elif os.path.isdir(full_path):
-                            for sub_folder in os.listdir(full_path):
+                        else:
+                            for sub_entry in children:
+                                sub_folder = sub_entry.name
                                 if sub_folder.startswith('.'): continue
-                                sub_path = os.path.join(full_path, sub_folder)
-                                if os.path.isdir(sub_path) and os.path.exists(os.path.join(sub_path, "config.json")):
+                                if sub_entry.is_dir() and os.path.exists(os.path.join(sub_entry.path, "config.json")):
                                     if "mlx" in sub_folder.lower() or "mlx" in publisher.lower():
                                         if not any(k in sub_folder.lower() for k in exclude_keywords):
                                             models.append(f"{publisher}/{model_folder}/{sub_folder}")
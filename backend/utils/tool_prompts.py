@@ -1,25 +1,21 @@
 # Tool-specific prompts for Agent 2
 
+# Static part of every specialist prompt. The per-request fields (metadata, today's
+# date) live in CONTEXT_TEMPLATE at the very end, so the text before them is identical
+# across requests for a tool and a model server can reuse its cached prefill.
 BASE_INSTRUCTIONS = """
 You are a function call generator. Output EXACTLY ONE line of Python code to call `{tool_name}`.
-
-## Context
-```
-{metadata}
-
-Currency: JPY
-Today: {current_date}
-```
+The available categories and today's date are listed under "## Context" at the end.
 
 ## Date Rules (read carefully)
-- `months=N` means the last N months counted BACK from TODAY ({current_date}). Use this for "past/last N months".
+- `months=N` means the last N months counted BACK from TODAY (see Context). Use this for "past/last N months".
 - `year=YYYY` filters an entire calendar year. Use for "in 2024", "during 2023", etc.
 - `year=YYYY, month=M` filters a specific month. Use for "in March 2024", "last December", etc.
 - `start_year=YYYY, end_year=YYYY` filters a year range. Use for "from 2023 to 2025".
 - NEVER pass `month` without also passing `year`.
 - NEVER pass `day` without also passing `year` AND `month`.
 - Pick ONLY ONE time filter per call — do not mix (e.g. don't use `months` together with `year`).
-- For vague recency like "recently" or "this year", infer from today's date ({current_date}).
+- For vague recency like "recently" or "this year", infer from today's date (see Context).
 
 ## Function Definition
 {function_definition}
@@ -29,24 +25,31 @@ Today: {current_date}
 
 ## Rules
 1. Output ONLY the function call. Format: `fig, result = {tool_name}(df, ..., lang='{lang}')`
-2. Use EXACT category names from the metadata above.
-3. If user's category isn't an exact match, pick the closest category from the list shared earlier (e.g. "futsal" → "futsal game").
+2. Use EXACT category names from the Context metadata.
+3. If user's category isn't an exact match, pick the closest category from the Context list (e.g. "futsal" → "futsal game").
 4. If a word like "Starbucks" is NOT in category metadata, still pass it as `category` — the backend searches remarks automatically.
 5. NO markdown, NO explanation, NO comments.
 6. **MANDATORY**: ALWAYS include `lang='{lang}'` in the function call.
 """
 
+# Per-request tail of the specialist prompt, filled as CONTEXT_TEMPLATE % (metadata, current_date)
+CONTEXT_TEMPLATE = """
+## Context
+```
+%s
+
+Currency: JPY
+Today: %s
+```
+"""
+
 TOOL_PROMPTS = {
     "plot_time_series": {
         "function_definition": """
 ### plot_time_series(df, category=None, year=None, start_year=None, end_year=None, months=None, lang='en')
 Use when: user asks about trends, spending over time, or date ranges.
 
-- `months=N`: last N months from today
-- `year=YYYY`: full calendar year
-- `start_year=YYYY, end_year=YYYY`: year range
-- `year=YYYY, month=M`: single month (note: not a standalone param here, pass both)
-- `lang`: 'en' or 'ja'
+- Also accepts `month=M` together with `year=YYYY` for a single month.
 """,
         "examples": """
 Today is 2025-06-15.
@@ -67,10 +70,7 @@ fig, result = plot_time_series(df, category='gym', year=2024)
 ### plot_distribution(df, category=None, year=None, month=None, lang='en')
 Use when: user asks for breakdown, distribution, or pie chart.
 
-- `year=YYYY, month=M`: specific month
-- `year=YYYY`: full year
 - No time filter: all time
-- `lang`: 'en' or 'ja'
 """,
         "examples": """
 Q: "Show me a breakdown of my food expenses in 2024"
@@ -89,7 +89,6 @@ Use when: comparing two specific periods.
 - Two years: `y1=2024, y2=2025`
 - Two months: `y1=2024, m1=12, y2=2025, m2=12`
 - Two dates: `y1=2024, m1=7, d1=21, y2=2025, m2=7, d2=21`
-- `lang`: 'en' or 'ja'
 """,
         "examples": """
 Q: "Compare food spending in 2024 vs 2025"
@@ -106,10 +105,6 @@ fig, result = plot_comparison_bars(df, category='dining', y1=2024, m1=1, y2=2025
 Use when: asking for total sums.
 
 - `year, month, day`: specific date
-- `year, month`: specific month
-- `year`: full year
-- `start_year, end_year`: year range
-- `lang`: 'en' or 'ja'
 """,
         "examples": """
 Q: "How much did I spend on groceries in Dec 2024?"
@@ -127,7 +122,6 @@ Use when: asking for averages, mean, median, or comparing statistically.
 
 - Single period: `y1=YYYY` (and optionally `m1=M`)
 - Comparison: `y1=YYYY, y2=YYYY, compare=True`
-- `lang`: 'en' or 'ja'
 """,
         "examples": """
 Q: "Average dining expense in 2024?"
@@ -145,7 +139,6 @@ Use when: asking for biggest or largest expenses.
 
 - `n`: how many to return (default 10)
 - `min_amount`: only include expenses above this value
-- `lang`: 'en' or 'ja'
 """,
         "examples": """
 Q: "What were my biggest expenses in Dec 2024?"
@@ -157,17 +150,73 @@ fig, result = get_top_expenses(df, n=5, category='Food', year=2025)
     }
 }
 
-def get_tool_prompt(tool_name):
-    """Retrieves the formatted prompt for a specific tool."""
-    if tool_name not in TOOL_PROMPTS:
-        return None
+# Above this many characters of category metadata, only the first example of each tool
+# is kept so a long user category list does not crowd the prompt.
+METADATA_TRIM_THRESHOLD = 4000
 
+def first_example(examples):
+    """Examples block cut after its first Q/A pair (a leading note such as "Today is ..." is kept)."""
+    blocks = examples.strip("\n").split("\n\n")
+    for i, block in enumerate(blocks):
+        if block.startswith("Q:"):
+            return "\n" + "\n\n".join(blocks[:i + 1]) + "\n"
+    return examples
+
+def compile_tool_prompt(tool_name, lang="{lang}", short_examples=False):
+    """Static part of a tool's prompt; lang is left as a {lang} field unless given."""
     tool_data = TOOL_PROMPTS[tool_name]
+    examples = tool_data["examples"]
+    if short_examples:
+        examples = first_example(examples)
     return BASE_INSTRUCTIONS.format(
         tool_name=tool_name,
-        metadata="{metadata}",
-        current_date="{current_date}",
-        lang="{lang}",
+        lang=lang,
         function_definition=tool_data["function_definition"],
-        examples=tool_data["examples"]
-    )
\ No newline at end of file
+        examples=examples
+    )
+
+# Everything except the context tail is fixed per tool (and per language), so it is
+# formatted once here instead of re-parsing BASE_INSTRUCTIONS on every request.
+TOOL_PROMPT_LANGS = ("en", "ja")
+TOOL_PROMPT_TEMPLATES = {name: compile_tool_prompt(name) + CONTEXT_TEMPLATE % ("{metadata}", "{current_date}")
+                         for name in TOOL_PROMPTS}
+STATIC_TOOL_PROMPTS = {(name, lang): compile_tool_prompt(name, lang)
+                       for name in TOOL_PROMPTS for lang in TOOL_PROMPT_LANGS}
+SHORT_TOOL_PROMPTS = {(name, lang): compile_tool_prompt(name, lang, short_examples=True)
+                      for name in TOOL_PROMPTS for lang in TOOL_PROMPT_LANGS}
+
+def get_tool_prompt(tool_name):
+    """Retrieves the prompt template for a specific tool ({metadata}, {current_date} and {lang} unfilled)."""
+    return TOOL_PROMPT_TEMPLATES.get(tool_name)
+
+def static_tool_prompt(tool_name, lang, short_examples=False):
+    """Precompiled static part of a tool's prompt, or None for an unknown tool."""
+    static = (SHORT_TOOL_PROMPTS if short_examples else STATIC_TOOL_PROMPTS).get((tool_name, lang))
+    if static is None and tool_name in TOOL_PROMPTS:
+        static = compile_tool_prompt(tool_name, lang, short_examples=short_examples)
+    return static
+
+def render_tool_prompt(tool_name, metadata, current_date, lang="en"):
+    """
+    Returns the complete specialist system prompt for a tool, or None for an unknown tool.
+    Only the short context tail is formatted per call. With a very long category list
+    the examples are trimmed to one per tool.
+    """
+    static = static_tool_prompt(tool_name, lang, len(metadata) > METADATA_TRIM_THRESHOLD)
+    if static is None:
+        return None
+    return static + CONTEXT_TEMPLATE % (metadata, current_date)
+
+def render_tool_prompts(tool_names, metadata, current_date, lang="en"):
+    """
+    render_tool_prompt() for several tools sharing one context (e.g. prefilling every
+    specialist prompt up front); the context tail is formatted once. Unknown tools are skipped.
+    """
+    short = len(metadata) > METADATA_TRIM_THRESHOLD
+    tail = CONTEXT_TEMPLATE % (metadata, current_date)
+    prompts = {}
+    for tool_name in tool_names:
+        static = static_tool_prompt(tool_name, lang, short)
+        if static is not None:
+            prompts[tool_name] = static + tail
+    return prompts